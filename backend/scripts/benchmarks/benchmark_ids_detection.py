@@ -0,0 +1,134 @@
+"""
+Benchmark: rule-based IDS detection cost per request
+Times rule_based_detection (all patterns in one compiled regex, one pass over the
+request fields) against the previous approach (json.dumps of the whole request, then
+one substring scan per pattern) on a typical browser request, the same request with a
+larger JSON body, a malicious one (where every match is collected) and one with
+non-ASCII headers that get longer when lowercased. Reports mean and p99 microseconds
+per request; the mean is checked against the per-request budget (p99 mostly measures
+scheduler noise on a shared machine). Each case's reported threat and match location
+are checked first.
+
+Run from the repository root:
+    python backend/scripts/benchmarks/benchmark_ids_detection.py --requests 20000
+"""
+import sys
+import os
+import json
+import time
+import argparse
+
+# Repository root on the path so backend.src.* imports resolve
+repo_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+from backend.src.utils.ids_detector import THREAT_PATTERNS, rule_based_detection
+
+BUDGET_US = 50.0
+
+HEADERS = {
+    "host": "localhost:8000",
+    "user-agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+                  "(KHTML, like Gecko) Chrome/120.0 Safari/537.36",
+    "accept": "application/json, text/plain, */*",
+    "accept-language": "en-US,en;q=0.9",
+    "accept-encoding": "gzip, deflate, br",
+    "content-type": "application/json",
+    "content-length": "182",
+    "origin": "http://localhost:5173",
+    "referer": "http://localhost:5173/chat",
+    "connection": "keep-alive",
+    "sec-fetch-mode": "cors",
+    "cookie": "session=3f2a9c0d4b1e8f7a6c5d4e3f2a1b0c9d",
+}
+
+
+def sample_requests():
+    typical = {
+        "method": "POST",
+        "path": "/chat/",
+        "headers": HEADERS,
+        "query_params": {"user_id": "12", "message": "show me remote python jobs for people with low vision"},
+    }
+    with_body = dict(typical, body={
+        "title": "Senior Data Analyst",
+        "description": "Analyse hiring data and build accessible dashboards. " * 20,
+        "requirements": ["SQL", "Python", "Power BI", "Statistics"],
+        "disabilities": [1, 3, 4],
+    })
+    malicious = dict(typical, query_params={"user_id": "12", "message": "x' UNION SELECT password FROM users; --"})
+    # 'İ' lowercases to two characters, so offsets after it shift
+    non_ascii = dict(typical, headers=dict(HEADERS, a="İİİİİ"), query_params={"z": "zz <script>"})
+    return {"typical": typical, "json body (1.2 KB)": with_body, "malicious": malicious, "non-ascii headers": non_ascii}
+
+
+# case -> (threat_type, field, position) of the reported match
+EXPECTED = {
+    "typical": None,
+    "json body (1.2 KB)": None,
+    "malicious": ("sql_injection", "query_params.message", 3),
+    "non-ascii headers": ("xss", "query_params.z", 3),
+}
+
+
+def check_detection(name, request_data):
+    """The reported threat and where it was found, as in EXPECTED"""
+    result = rule_based_detection(request_data, "127.0.0.1")
+    found = None
+    if result["is_threat"]:
+        first = min(result["matches"], key=lambda match: match["rank"])
+        found = (result["threat_type"], first["field"], first["position"])
+    assert found == EXPECTED[name], f"{name}: expected {EXPECTED[name]}, got {found}"
+
+
+def legacy_detection(request_data):
+    """Previous implementation, for comparison"""
+    request_str = json.dumps(request_data).lower()
+    for threat_type, patterns in THREAT_PATTERNS.items():
+        for pattern in patterns:
+            if pattern.lower() in request_str:
+                return threat_type
+    return None
+
+
+def time_per_request(detect, request_data, count: int):
+    """Mean and p99 in microseconds"""
+    samples = []
+    for _ in range(count):
+        started = time.perf_counter()
+        detect(request_data)
+        samples.append(time.perf_counter() - started)
+    samples.sort()
+    return sum(samples) / count * 1e6, samples[int(count * 0.99)] * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=20000)
+    args = parser.parse_args()
+
+    print("=" * 74)
+    print(f"Rule-based IDS detection ({args.requests} requests per case, budget {BUDGET_US:.0f} us)")
+    print("=" * 74)
+    print(f"{'case':<22}{'legacy mean':>13}{'compiled mean':>15}{'compiled p99':>14}{'matches':>10}")
+
+    cases = sample_requests()
+    for name, request_data in cases.items():
+        check_detection(name, request_data)
+
+    over_budget = False
+    for name, request_data in cases.items():
+        legacy_mean, _ = time_per_request(legacy_detection, request_data, args.requests)
+        mean, p99 = time_per_request(lambda data: rule_based_detection(data, "127.0.0.1"), request_data, args.requests)
+        matches = len(rule_based_detection(request_data, "127.0.0.1")["matches"])
+        over_budget = over_budget or mean > BUDGET_US
+        print(f"{name:<22}{legacy_mean:>11.1f}us{mean:>13.1f}us{p99:>12.1f}us{matches:>10}")
+
+    print()
+    print("⚠️  Mean detection cost over budget" if over_budget
+      else f"✅ All cases within {BUDGET_US:.0f} us per request (mean)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,186 @@
+"""
+Benchmark: rate limit storage backends across worker processes
+For each RATE_LIMIT_STORAGE (memory, sqlite, redis) reports:
+- microseconds per check_rate_limit-style call from one process
+- requests allowed when --workers processes share --keys keys with a limit of 10
+  each: a shared storage allows keys x 10 in total, per-process memory workers x that
+
+Redis is a small in-process stand-in speaking the Redis protocol (the commands
+RedisStorage sends, one global lock as in single-threaded Redis) unless --redis-url
+points at a real server.
+
+Run from the repository root:
+    python backend/scripts/benchmarks/benchmark_rate_limit_storage.py --workers 4
+"""
+import sys
+import os
+import time
+import argparse
+import tempfile
+import threading
+import socketserver
+import multiprocessing
+
+# Repository root on the path so backend.src.* imports resolve
+repo_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+from backend.src.utils.rate_limit import RateLimiter, SlidingWindowCounter, get_rate_limiter
+from backend.src.utils.rate_limit_storage import RedisConnection, RedisStorage, SQLiteStorage
+
+LIMIT = 10
+WINDOW_SECONDS = 3600
+
+
+class StandInRedisHandler(socketserver.StreamRequestHandler):
+    """One client connection: RESP arrays in, RESP replies out"""
+    disable_nagle_algorithm = True
+
+    def handle(self):
+        transaction = None
+        while True:
+            command = self.read_command()
+            if command is None:
+                return
+            name = command[0].upper()
+            if name == b"MULTI":
+                transaction = []
+                self.wfile.write(b"+OK\r\n")
+            elif name == b"EXEC":
+                with self.server.lock:
+                    replies = [self.server.run(queued) for queued in transaction or []]
+                transaction = None
+                self.wfile.write(b"*%d\r\n" % len(replies) + b"".join(replies))
+            elif transaction is not None:
+                transaction.append(command)
+                self.wfile.write(b"+QUEUED\r\n")
+            else:
+                with self.server.lock:
+                    self.wfile.write(self.server.run(command))
+
+    def read_command(self):
+        line = self.rfile.readline()
+        if not line:
+            return None
+        args = []
+        for _ in range(int(line[1:])):
+            length = int(self.rfile.readline()[1:])
+            args.append(self.rfile.read(length + 2)[:-2])
+        return args
+
+
+class StandInRedis(socketserver.ThreadingTCPServer):
+    daemon_threads = True
+    allow_reuse_address = True
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StandInRedisHandler)
+        self.lock = threading.Lock()
+        self.data = {}  # key -> [value, expires_at or None]
+
+    def live(self, key):
+        entry = self.data.get(key)
+        if entry is not None and entry[1] is not None and entry[1] <= time.time():
+            del self.data[key]
+            return None
+        return entry
+
+    def run(self, command) -> bytes:
+        name, args = command[0].upper(), command[1:]
+        if name in (b"PING", b"AUTH", b"SELECT"):
+            return b"+OK\r\n"
+        if name == b"SET":
+            options = [arg.upper() for arg in args[2:]]
+            if b"NX" in options and self.live(args[0]) is not None:
+                return b"$-1\r\n"
+            expires_at = None
+            if b"PX" in options:
+                expires_at = time.time() + int(args[2 + options.index(b"PX") + 1]) / 1000
+            self.data[args[0]] = [int(args[1]), expires_at]
+            return b"+OK\r\n"
+        if name == b"INCRBY":
+            entry = self.live(args[0]) or self.data.setdefault(args[0], [0, None])
+            entry[0] += int(args[1])
+            return b":%d\r\n" % entry[0]
+        if name == b"GET":
+            entry = self.live(args[0])
+            if entry is None:
+                return b"$-1\r\n"
+            value = str(entry[0]).encode()
+            return b"$%d\r\n%s\r\n" % (len(value), value)
+        return b"-ERR unknown command\r\n"
+
+
+def build(storage_name: str, sqlite_path: str, redis_url: str):
+    if storage_name == "sqlite":
+        return get_rate_limiter("sliding_window", 100000, SQLiteStorage(sqlite_path))
+    if storage_name == "redis":
+        return get_rate_limiter("sliding_window", 100000, RedisStorage(redis_url))
+    # Per process, whatever RATE_LIMIT_STORAGE says
+    return RateLimiter(SlidingWindowCounter(), 100000)
+
+
+def worker(storage_name, sqlite_path, redis_url, keys, calls, prefix, allowed):
+    limiter = build(storage_name, sqlite_path, redis_url)
+    count = 0
+    for i in range(calls):
+        if limiter.allow(f"{prefix}_{i % keys}", LIMIT, WINDOW_SECONDS):
+            count += 1
+    allowed.put(count)
+
+
+def per_call(storage_name, sqlite_path, redis_url, calls: int) -> float:
+    limiter = build(storage_name, sqlite_path, redis_url)
+    started = time.perf_counter()
+    for i in range(calls):
+        limiter.allow(f"search_{i % 1000}", 1000, WINDOW_SECONDS)
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+def across_workers(storage_name, sqlite_path, redis_url, workers: int, keys: int) -> int:
+    allowed = multiprocessing.Queue()
+    prefix = f"chat_{storage_name}_{time.time_ns()}"
+    processes = [
+        multiprocessing.Process(target=worker, args=(storage_name, sqlite_path, redis_url, keys, keys * LIMIT * 2,
+                                                     prefix, allowed))
+        for _ in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    total = sum(allowed.get() for _ in processes)
+    for process in processes:
+        process.join()
+    return total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--keys", type=int, default=200)
+    parser.add_argument("--calls", type=int, default=20000)
+    parser.add_argument("--redis-url", default="")
+    args = parser.parse_args()
+
+    redis_url = args.redis_url
+    if not redis_url:
+        server = StandInRedis()
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+        redis_url = f"redis://127.0.0.1:{server.server_address[1]}/0"
+    RedisConnection(redis_url, 1.0).close()
+
+    with tempfile.TemporaryDirectory() as directory:
+        sqlite_path = os.path.join(directory, "rate_limits.sqlite3")
+        print("=" * 72)
+        print(f"Rate limit storage: {args.workers} worker processes, {args.keys} keys, limit {LIMIT}")
+        print(f"redis: {'stand-in' if not args.redis_url else args.redis_url}")
+        print("=" * 72)
+        print(f"{'storage':<10}{'us/call':>10}{'allowed':>12}{'expected':>12}")
+        for storage_name in ("memory", "sqlite", "redis"):
+            micros = per_call(storage_name, sqlite_path, redis_url, args.calls)
+            allowed = across_workers(storage_name, sqlite_path, redis_url, args.workers, args.keys)
+            print(f"{storage_name:<10}{micros:>10.1f}{allowed:>12}{args.keys * LIMIT:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""
+Benchmark: rate limiter cost and memory at many distinct keys
+Compares the previous check_rate_limit (a list of datetimes per key, rebuilt on every
+call and never evicted) with the sliding window counter and token bucket limiters:
+- microseconds per call over --keys distinct keys, --hits calls each, round robin
+- memory held by those keys afterwards (a second, tracemalloc-traced run)
+- microseconds per call on one busy key that stays at its limit
+- threads hammering shared keys: allowed requests must equal keys x limit
+- keys still tracked with max_keys at half of --keys (LRU eviction)
+
+Run from the repository root:
+    python backend/scripts/benchmarks/benchmark_rate_limiter.py --keys 100000
+"""
+import sys
+import os
+import gc
+import time
+import argparse
+import threading
+import tracemalloc
+from collections import defaultdict
+from datetime import datetime, timedelta
+
+# Repository root on the path so backend.src.* imports resolve
+repo_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+from backend.src.utils.rate_limit import RATE_LIMIT_ALGORITHMS, get_rate_limiter
+
+LIMIT = 10
+WINDOW_SECONDS = 60
+
+
+class LegacyRateLimiter:
+    """Previous implementation, for comparison"""
+
+    def __init__(self):
+        self.rate_limit_store = defaultdict(list)
+
+    def __len__(self):
+        return len(self.rate_limit_store)
+
+    def allow(self, identifier, max_requests, window_seconds):
+        now = datetime.now()
+        window_start = now - timedelta(seconds=window_seconds)
+        self.rate_limit_store[identifier] = [
+            req_time for req_time in self.rate_limit_store[identifier]
+            if req_time > window_start
+        ]
+        if len(self.rate_limit_store[identifier]) >= max_requests:
+            return False
+        self.rate_limit_store[identifier].append(now)
+        return True
+
+
+def build(name: str, max_keys: int):
+    return LegacyRateLimiter() if name == "legacy" else get_rate_limiter(name, max_keys)
+
+
+def distinct_keys(name: str, keys: int, hits: int, trace_memory: bool = False) -> float:
+    """us per call for hits calls on each of keys keys, or MB held afterwards with trace_memory"""
+    identifiers = [f"search_10.{i // 65536}.{i // 256 % 256}.{i % 256}" for i in range(keys)]
+    gc.collect()
+    if trace_memory:
+        tracemalloc.start()
+    limiter = build(name, keys)
+    started = time.perf_counter()
+    for _ in range(hits):
+        for identifier in identifiers:
+            limiter.allow(identifier, LIMIT, WINDOW_SECONDS)
+    elapsed = time.perf_counter() - started
+    if not trace_memory:
+        return elapsed / (keys * hits) * 1e6
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return held / 1e6
+
+
+def busy_key(name: str, calls: int) -> float:
+    """us per call on one key hit far past its limit"""
+    limiter = build(name, 1000)
+    started = time.perf_counter()
+    for _ in range(calls):
+        limiter.allow("chat_127.0.0.1", 1000, WINDOW_SECONDS)
+    return (time.perf_counter() - started) / calls * 1e6
+
+
+def threaded(name: str, threads: int, keys: int, calls: int) -> int:
+    """Allowed requests when threads share keys (window long enough not to refill)"""
+    limiter = build(name, keys)
+    allowed = [0] * threads
+
+    def worker(slot):
+        for i in range(calls):
+            if limiter.allow(f"apply_{(i + slot) % keys}", LIMIT, 3600):
+                allowed[slot] += 1
+
+    workers = [threading.Thread(target=worker, args=(slot,)) for slot in range(threads)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    return sum(allowed)
+
+
+def tracked_keys(name: str, keys: int) -> int:
+    limiter = build(name, keys // 2)
+    for i in range(keys):
+        limiter.allow(f"register_{i}", LIMIT, WINDOW_SECONDS)
+    return len(limiter)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keys", type=int, default=100000)
+    parser.add_argument("--hits", type=int, default=LIMIT)
+    parser.add_argument("--threads", type=int, default=8)
+    args = parser.parse_args()
+
+    names = ["legacy"] + list(RATE_LIMIT_ALGORITHMS)
+    thread_keys = 1000
+    thread_calls = thread_keys * LIMIT * 2 // args.threads
+
+    print("=" * 92)
+    print(f"Rate limiter: {args.keys} keys x {args.hits} calls, limit {LIMIT}/{WINDOW_SECONDS}s")
+    print("=" * 92)
+    print(f"{'limiter':<16}{'us/call':>10}{'busy key us':>13}{'memory MB':>12}"
+          f"{'threaded allowed':>18}{'keys kept':>12}")
+    for name in names:
+        per_call = distinct_keys(name, args.keys, args.hits)
+        memory = distinct_keys(name, args.keys, args.hits, trace_memory=True)
+        busy = busy_key(name, 20000)
+        allowed = threaded(name, args.threads, thread_keys, thread_calls)
+        kept = tracked_keys(name, args.keys)
+        print(f"{name:<16}{per_call:>10.2f}{busy:>13.2f}{memory:>12.1f}"
+              f"{allowed:>11} / {thread_keys * LIMIT:<5}{kept:>12}")
+
+    print()
+    print(f"threaded: {args.threads} threads, {thread_keys} shared keys; keys kept: max_keys = {args.keys // 2}")
+
+
+if __name__ == "__main__":
+    main()
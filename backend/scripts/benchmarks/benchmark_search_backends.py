@@ -0,0 +1,148 @@
+"""
+Benchmark: compare the job search backends (python vs mysql_fulltext)
+Seeds a synthetic job catalogue (100k jobs by default) and times the same queries on each backend.
+
+Run from the repository root:
+    python backend/scripts/migrations/migrate_fulltext_indexes.py
+    python backend/scripts/benchmarks/benchmark_search_backends.py --seed 100000
+"""
+import sys
+import os
+import time
+import random
+import argparse
+import statistics
+
+# Repository root on the path so backend.src.* imports resolve
+repo_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+from sqlalchemy import insert, func
+
+from backend.src.db.database import SessionLocal
+from backend.src.db import models
+from backend.src.utils.search_index import job_index
+from backend.src.utils.search_intelligence import intelligent_job_search
+
+
+BENCHMARK_COMPANY = "Search Benchmark Co"
+
+TITLES = [
+    "Python Developer", "Frontend Engineer", "Data Analyst", "Customer Support Specialist",
+    "Content Writer", "UX Designer", "Project Manager", "Administrative Assistant",
+    "Data Entry Clerk", "QA Tester", "Technical Writer", "Accessibility Consultant",
+]
+WORDS = (
+    "build maintain web applications django flask react node typescript excel reports "
+    "customers help desk writing blog copy remote team agile screen reader accessible "
+    "flexible schedule training mentoring documentation testing automation cloud support "
+    "communication analytics dashboards design prototypes research inclusive workplace"
+).split()
+REQUIREMENTS = [
+    "Python", "JavaScript", "React", "SQL", "Excel", "Communication", "Customer Service",
+    "Content Writing", "Figma", "Project Management", "Data Entry", "Django",
+]
+QUERIES = [
+    "python developer", "remote customer support", "content writer", "data analyst excel",
+    "accessible design", "react typescript", "project manager agile", "writter", "help desk",
+]
+
+
+def seed_jobs(db, count: int, batch_size: int = 5000):
+    """Insert synthetic jobs (and requirements) until the benchmark company has count jobs"""
+    company = db.query(models.Company).filter(models.Company.name == BENCHMARK_COMPANY).first()
+    if not company:
+        company = models.Company(name=BENCHMARK_COMPANY, description="Synthetic jobs for search benchmarks")
+        db.add(company)
+        db.commit()
+
+    existing = db.query(func.count(models.Job.id)).filter(models.Job.company_id == company.id).scalar()
+    missing = count - existing
+    if missing <= 0:
+        print(f"Benchmark catalogue already has {existing} jobs")
+        return
+
+    print(f"Seeding {missing} jobs...")
+    rnd = random.Random(42)
+    disability_ids = [d_id for (d_id,) in db.query(models.Disability.id).all()]
+    last_id = db.query(func.max(models.Job.id)).scalar() or 0
+    for start in range(0, missing, batch_size):
+        size = min(batch_size, missing - start)
+        jobs = [
+            {
+                "title": rnd.choice(TITLES),
+                "description": " ".join(rnd.choice(WORDS) for _ in range(rnd.randint(40, 120))),
+                "employment_type": rnd.choice(["full-time", "part-time", "contract", "internship"]),
+                "remote_type": rnd.choice(["remote", "on-site", "hybrid"]),
+                "company_id": company.id,
+            }
+            for _ in range(size)
+        ]
+        db.execute(insert(models.Job), jobs)
+        new_ids = [job_id for (job_id,) in db.query(models.Job.id)
+                   .filter(models.Job.id > last_id).order_by(models.Job.id).all()]
+        last_id = new_ids[-1]
+        db.execute(insert(models.JobRequirement), [
+            {"job_id": job_id, "requirement": requirement}
+            for job_id in new_ids
+            for requirement in rnd.sample(REQUIREMENTS, 3)
+        ])
+        if disability_ids:
+            db.execute(insert(models.job_disability_support), [
+                {"job_id": job_id, "disability_id": disability_id}
+                for job_id in new_ids
+                for disability_id in rnd.sample(disability_ids, min(2, len(disability_ids)))
+            ])
+        db.commit()
+        print(f"  {start + size}/{missing}")
+
+
+def time_backend(db, backend: str, repeat: int):
+    timings = []
+    hits = 0
+    for _ in range(repeat):
+        for query in QUERIES:
+            started = time.perf_counter()
+            results = intelligent_job_search(db, query=query, limit=20, backend=backend)
+            timings.append((time.perf_counter() - started) * 1000)
+            hits += len(results)
+    timings.sort()
+    return {
+        "mean": statistics.mean(timings),
+        "p50": timings[len(timings) // 2],
+        "p95": timings[int(len(timings) * 0.95) - 1],
+        "results": hits / (repeat * len(QUERIES)),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--seed", type=int, default=0, help="ensure this many synthetic jobs exist (e.g. 100000)")
+    parser.add_argument("--repeat", type=int, default=5, help="passes over the query set per backend")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.seed:
+            seed_jobs(db, args.seed)
+
+        total = db.query(func.count(models.Job.id)).scalar()
+        print("=" * 60)
+        print(f"Search backend benchmark ({total} jobs, {len(QUERIES)} queries x {args.repeat})")
+        print("=" * 60)
+
+        started = time.perf_counter()
+        job_index.build(db)
+        print(f"Job index build: {time.perf_counter() - started:.1f}s")
+
+        print(f"{'backend':<16}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'avg hits':>10}")
+        for backend in ("python", "mysql_fulltext"):
+            stats = time_backend(db, backend, args.repeat)
+            print(f"{backend:<16}{stats['mean']:>10.1f}{stats['p50']:>10.1f}{stats['p95']:>10.1f}{stats['results']:>10.1f}")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
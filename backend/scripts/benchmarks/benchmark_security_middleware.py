@@ -0,0 +1,191 @@
+"""
+Benchmark: security middleware latency
+Calls a small Starlette app directly over ASGI (no server, no network) with no
+middleware, with the previous BaseHTTPMiddleware-based SecurityMiddleware and with
+the current ASGI one, and reports mean and p99 latency per request for:
+a GET with query parameters, a JSON POST, a 2 MB multipart upload sent in 64 KB
+chunks, and a streaming response (time to first chunk and to the last one).
+Only clean requests are sent, so no security log is written.
+
+Run from the repository root:
+    python backend/scripts/benchmarks/benchmark_security_middleware.py --requests 2000
+"""
+import sys
+import os
+import json
+import time
+import asyncio
+import argparse
+
+# Repository root on the path so backend.src.* imports resolve
+repo_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+from starlette.applications import Starlette
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response, StreamingResponse
+from starlette.routing import Route
+
+from backend.src.middleware.security_middleware import SecurityMiddleware
+from backend.src.utils.ids_detector import analyze_request
+
+UPLOAD_BYTES = 2 * 1024 * 1024
+UPLOAD_CHUNK = 64 * 1024
+STREAM_CHUNKS = 20
+STREAM_DELAY = 0.002
+
+
+class LegacySecurityMiddleware(BaseHTTPMiddleware):
+    """Previous implementation (clean-request path), for comparison"""
+
+    async def dispatch(self, request: Request, call_next):
+        if request.url.path in ['/health', '/docs', '/openapi.json', '/']:
+            return await call_next(request)
+        try:
+            threat_result = analyze_request(request)
+            if threat_result.get('is_threat'):
+                return Response(status_code=403)
+        except Exception as e:
+            print(f"Security detection error: {e}")
+        return await call_next(request)
+
+
+async def search(request: Request):
+    return JSONResponse({"results": [{"id": i, "title": "Data Analyst"} for i in range(10)]})
+
+
+async def apply(request: Request):
+    data = await request.json()
+    return JSONResponse({"job_id": data["job_id"], "status": "pending"})
+
+
+async def upload(request: Request):
+    size = 0
+    async for chunk in request.stream():
+        size += len(chunk)
+    return JSONResponse({"bytes": size})
+
+
+async def stream(request: Request):
+    async def chunks():
+        for i in range(STREAM_CHUNKS):
+            await asyncio.sleep(STREAM_DELAY)
+            yield f"data: token {i}\n\n"
+    return StreamingResponse(chunks(), media_type="text/event-stream")
+
+
+def build_app(middleware):
+    app = Starlette(routes=[
+        Route("/jobs/search", search),
+        Route("/applications/", apply, methods=["POST"]),
+        Route("/users/cv", upload, methods=["POST"]),
+        Route("/chat/stream", stream),
+    ])
+    if middleware is not None:
+        app.add_middleware(middleware)
+    return app
+
+
+def http_scope(method: str, path: str, query: str = "", content_type: str = ""):
+    headers = [
+        (b"host", b"localhost:8000"),
+        (b"user-agent", b"Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 Chrome/120.0"),
+        (b"accept", b"application/json"),
+    ]
+    if content_type:
+        headers.append((b"content-type", content_type.encode()))
+    return {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1",
+        "method": method, "scheme": "http", "path": path, "raw_path": path.encode(),
+        "query_string": query.encode(), "root_path": "", "headers": headers,
+        "client": ("127.0.0.1", 50000), "server": ("localhost", 8000),
+    }
+
+
+async def call(app, scope, body_chunks):
+    """Run one request; (seconds to first body chunk, seconds to the end)"""
+    messages = [{"type": "http.request", "body": chunk, "more_body": i < len(body_chunks) - 1}
+                for i, chunk in enumerate(body_chunks or [b""])]
+    done = asyncio.Event()
+    first_chunk = None
+    started = time.perf_counter()
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        await done.wait()
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        nonlocal first_chunk
+        if message["type"] == "http.response.body":
+            if first_chunk is None and message.get("body"):
+                first_chunk = time.perf_counter() - started
+            if not message.get("more_body", False):
+                done.set()
+
+    await app(scope, receive, send)
+    return first_chunk or 0.0, time.perf_counter() - started
+
+
+def sample_cases():
+    body = json.dumps({"job_id": 42, "cover_letter": "I would like to apply for this position. " * 20}).encode()
+    upload_head = (b"--boundary\r\nContent-Disposition: form-data; name=\"file\"; filename=\"cv.pdf\"\r\n"
+                   b"Content-Type: application/pdf\r\n\r\n")
+    upload_body = upload_head + os.urandom(UPLOAD_BYTES - len(upload_head))
+    return {
+        "GET search": (http_scope("GET", "/jobs/search", "q=remote+python&limit=10"), []),
+        "POST json (0.8 KB)": (http_scope("POST", "/applications/", content_type="application/json"), [body]),
+        "POST upload (2 MB)": (
+            http_scope("POST", "/users/cv", content_type="multipart/form-data; boundary=boundary"),
+            [upload_body[i:i + UPLOAD_CHUNK] for i in range(0, len(upload_body), UPLOAD_CHUNK)],
+        ),
+        "GET stream": (http_scope("GET", "/chat/stream"), []),
+    }
+
+
+async def measure(app, scope, body_chunks, count: int):
+    """Mean and p99 latency (ms), and mean time to first chunk (ms)"""
+    samples, first_chunks = [], []
+    for _ in range(count):
+        first_chunk, total = await call(app, scope, body_chunks)
+        samples.append(total)
+        first_chunks.append(first_chunk)
+    samples.sort()
+    return sum(samples) / count * 1e3, samples[int(count * 0.99)] * 1e3, sum(first_chunks) / count * 1e3
+
+
+async def run(requests: int):
+    apps = {
+        "none": build_app(None),
+        "BaseHTTPMiddleware": build_app(LegacySecurityMiddleware),
+        "ASGI": build_app(SecurityMiddleware),
+    }
+    print("=" * 86)
+    print(f"Security middleware latency ({requests} requests per case, ms)")
+    print("=" * 86)
+    print(f"{'case':<22}{'middleware':<20}{'mean':>10}{'p99':>10}{'first chunk':>13}{'overhead':>11}")
+    for name, (scope, body_chunks) in sample_cases().items():
+        # Streaming requests sleep between chunks; fewer of them are enough
+        count = max(requests // 20, 20) if name == "GET stream" else requests
+        baseline = None
+        for label, app in apps.items():
+            await measure(app, scope, body_chunks, min(count, 50))  # warm up
+            mean, p99, first_chunk = await measure(app, scope, body_chunks, count)
+            baseline = mean if baseline is None else baseline
+            overhead = f"{mean - baseline:+.3f}" if label != "none" else ""
+            print(f"{name:<22}{label:<20}{mean:>10.3f}{p99:>10.3f}{first_chunk:>13.3f}{overhead:>11}")
+        print()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=2000)
+    args = parser.parse_args()
+    asyncio.run(run(args.requests))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark: embedding storage formats
+Encodes random unit vectors (1536 dimensions by default, the size of
+text-embedding-3-small) as JSON text and with each binary codec format, then reports
+bytes per vector, decode time per vector and the cosine error against the original.
+
+Run from the repository root:
+    python backend/scripts/benchmarks/benchmark_vector_formats.py --count 2000 --dimensions 1536
+"""
+import sys
+import os
+import time
+import argparse
+
+# Repository root on the path so backend.src.* imports resolve
+repo_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+import numpy as np
+
+from backend.src.rag.embedder import embedding_to_json, embedding_from_json
+from backend.src.rag.vector_codec import encode_vector, decode_vector, vector_view
+
+
+def time_decode(decode, blobs) -> float:
+    """Best of three passes, in microseconds per vector"""
+    best = float("inf")
+    for _ in range(3):
+        started = time.perf_counter()
+        for blob in blobs:
+            decode(blob)
+        best = min(best, time.perf_counter() - started)
+    return best / len(blobs) * 1e6
+
+
+def cosine_error(originals: np.ndarray, decoded) -> float:
+    decoded = np.vstack([np.asarray(vector, dtype=np.float32) for vector in decoded])
+    decoded /= np.linalg.norm(decoded, axis=1, keepdims=True)
+    return float(np.max(1.0 - np.sum(originals * decoded, axis=1)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, default=2000)
+    parser.add_argument("--dimensions", type=int, default=1536)
+    args = parser.parse_args()
+
+    rnd = np.random.default_rng(42)
+    vectors = rnd.standard_normal((args.count, args.dimensions)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    lists = vectors.tolist()
+
+    print("=" * 70)
+    print(f"Vector storage formats ({args.count} vectors x {args.dimensions} dimensions)")
+    print("=" * 70)
+    print(f"{'format':<18}{'bytes/vector':>14}{'decode us':>12}{'max cos err':>14}")
+
+    blobs = [embedding_to_json(vector) for vector in lists]
+    size = sum(len(blob) for blob in blobs) / args.count
+    micros = time_decode(embedding_from_json, blobs)
+    error = cosine_error(vectors, [embedding_from_json(blob) for blob in blobs])
+    print(f"{'json':<18}{size:>14.0f}{micros:>12.1f}{error:>14.2e}")
+
+    for fmt in ("float32", "float16", "int8"):
+        blobs = [encode_vector(vector, fmt) for vector in vectors]
+        size = sum(len(blob) for blob in blobs) / args.count
+        error = cosine_error(vectors, [decode_vector(blob) for blob in blobs])
+        micros = time_decode(decode_vector, blobs)
+        print(f"{fmt:<18}{size:>14.0f}{micros:>12.1f}{error:>14.2e}")
+        view_micros = time_decode(vector_view, blobs)
+        print(f"{fmt + ' (view)':<18}{'':>14}{view_micros:>12.1f}{'':>14}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,121 @@
+"""
+Load test: sync vs async database routes
+Serves the same job listing page two ways on a local uvicorn server:
+- /sync/jobs   def route + get_db (blocking PyMySQL, one threadpool thread per request)
+- /async/jobs  the real async route logic + get_async_db (aiomysql, awaited on the event loop)
+and fires the same concurrent load at both.
+
+--db-latency-ms adds a SELECT SLEEP() per request to mimic a remote / busy database,
+which is where the threadpool runs out and the async route keeps scaling.
+
+Run from the repository root (needs MySQL, aiomysql and httpx):
+    python backend/scripts/benchmarks/load_test_async_routes.py --concurrency 10 50 200 --db-latency-ms 20
+"""
+import sys
+import os
+import time
+import asyncio
+import argparse
+import threading
+import statistics
+
+# Repository root on the path so backend.src.* imports resolve
+repo_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+import httpx
+import uvicorn
+from fastapi import FastAPI, Depends
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from backend.src.db.database import get_db, get_async_db
+from backend.src.routes.jobs import async_job_page, load_job_page
+
+
+def build_app(db_latency: float) -> FastAPI:
+    app = FastAPI()
+
+    @app.get("/sync/jobs")
+    def sync_jobs(limit: int = 20, db: Session = Depends(get_db)):
+        if db_latency:
+            db.execute(text("SELECT SLEEP(:s)"), {"s": db_latency})
+        return load_job_page(db, limit)
+
+    @app.get("/async/jobs")
+    async def async_jobs(limit: int = 20, db: AsyncSession = Depends(get_async_db)):
+        if db_latency:
+            await db.execute(text("SELECT SLEEP(:s)"), {"s": db_latency})
+        return await async_job_page(db, limit)
+
+    return app
+
+
+def start_server(app: FastAPI, port: int) -> uvicorn.Server:
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.05)
+    return server
+
+
+async def run_load(url: str, total: int, concurrency: int):
+    latencies = []
+    errors = 0
+    semaphore = asyncio.Semaphore(concurrency)
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+
+    async with httpx.AsyncClient(limits=limits, timeout=60.0) as client:
+        async def one():
+            nonlocal errors
+            async with semaphore:
+                started = time.perf_counter()
+                try:
+                    response = await client.get(url)
+                    if response.status_code != 200:
+                        errors += 1
+                except httpx.HTTPError:
+                    errors += 1
+                latencies.append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        await asyncio.gather(*(one() for _ in range(total)))
+        elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "rps": total / elapsed,
+        "p50": statistics.median(latencies),
+        "p95": latencies[int(len(latencies) * 0.95) - 1],
+        "errors": errors,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--requests", type=int, default=1000, help="requests per route and concurrency level")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--db-latency-ms", type=float, default=0.0, help="extra SELECT SLEEP per request")
+    parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    start_server(build_app(args.db_latency_ms / 1000), args.port)
+    base = f"http://127.0.0.1:{args.port}"
+
+    print("=" * 70)
+    print(f"Load test: {args.requests} requests per run, db latency {args.db_latency_ms:.0f} ms")
+    print("=" * 70)
+    print(f"{'route':<14}{'concurrency':>12}{'req/s':>10}{'p50 ms':>10}{'p95 ms':>10}{'errors':>8}")
+    for concurrency in args.concurrency:
+        for route in ("sync", "async"):
+            url = f"{base}/{route}/jobs"
+            asyncio.run(run_load(url, min(concurrency, args.requests), concurrency))  # warm-up
+            stats = asyncio.run(run_load(url, args.requests, concurrency))
+            print(f"{route:<14}{concurrency:>12}{stats['rps']:>10.0f}{stats['p50']:>10.1f}"
+                  f"{stats['p95']:>10.1f}{stats['errors']:>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Script to (re)build the chat retrieval index
+Embeds every job into the vector index (VECTOR_INDEX) in batches. Unchanged job texts
+come from the embedding cache, so re-running it only pays for new or edited jobs.
+Job write routes keep the index current afterwards.
+
+Usage: python backend/scripts/index_job_vectors.py [--batch-size 500]
+"""
+import sys
+import os
+import time
+import argparse
+
+# Add project root to Python path
+project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if project_root not in sys.path:
+    sys.path.insert(0, project_root)
+
+from backend.src.db.database import SessionLocal
+from backend.src.db import models
+from backend.src.rag.job_vectors import index_jobs, vector_retrieval_enabled
+from backend.src.rag.embedding_cache import embedding_cache
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--batch-size", type=int, default=500)
+    args = parser.parse_args()
+
+    print("=" * 50)
+    print("Index jobs for chat retrieval")
+    print("=" * 50)
+
+    if not vector_retrieval_enabled():
+        print("ERROR: Vector retrieval is unavailable.")
+        print("Set CHAT_RETRIEVAL=vector (or SEARCH_HYBRID_VECTOR=true) and OPENAI_API_KEY")
+        print("(or EMBEDDING_PROVIDER=stub);")
+        print("VECTOR_INDEX=chroma also needs chromadb installed.")
+        return
+
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        total = db.query(models.Job).count()
+        done = 0
+        last_id = 0
+        while True:
+            job_ids = [job_id for (job_id,) in db.query(models.Job.id)
+                       .filter(models.Job.id > last_id).order_by(models.Job.id)
+                       .limit(args.batch_size).all()]
+            if not job_ids:
+                break
+            index_jobs(db, job_ids)
+            last_id = job_ids[-1]
+            done += len(job_ids)
+            print(f"  {done}/{total}")
+        print(f"✅ Indexed {done} jobs in {time.perf_counter() - started:.1f}s "
+              f"({embedding_cache.hits} cached embeddings, {embedding_cache.misses} embedded)")
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Migration: Re-encode stored embeddings with the binary vector codec
+Rewrites every row of the embedding cache (EMBED_CACHE_PATH) in the target format:
+- legacy JSON lists (embedding_to_json)
+- headerless float32 rows from older caches
+- codec blobs in another format (e.g. float32 -> float16)
+Rows already in the target format are left alone.
+
+Run: python backend/scripts/migrations/migrate_embedding_vectors.py [--format float16]
+"""
+import sys
+import os
+import argparse
+import sqlite3
+
+# Repository root on the path so backend.src.* imports resolve
+repo_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+if repo_root not in sys.path:
+    sys.path.insert(0, repo_root)
+
+from backend.src.config import settings
+from backend.src.rag.vector_codec import FORMATS, encode_vector, decode_vector, is_encoded, vector_format
+from backend.src.rag.embedding_cache import decode_cached
+
+
+def to_vector(stored):
+    if isinstance(stored, str):
+        return decode_vector(stored)  # JSON text
+    stored = bytes(stored)
+    if stored[:1] == b"[":
+        return decode_vector(stored.decode("utf-8"))
+    return decode_cached(stored)
+
+
+def migrate(path: str, target: str, batch_size: int = 1000):
+    print("=" * 60)
+    print(f"Migration: Re-encode embeddings as {target}")
+    print("=" * 60)
+
+    if not os.path.exists(path):
+        print(f"ℹ️  No embedding cache at {path}, nothing to migrate")
+        return
+
+    conn = sqlite3.connect(path)
+    try:
+        total = conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+        converted = skipped = 0
+        bytes_before = bytes_after = 0
+        last_key = ""
+        while True:
+            rows = conn.execute(
+                "SELECT key, vector FROM embeddings WHERE key > ? ORDER BY key LIMIT ?",
+                (last_key, batch_size),
+            ).fetchall()
+            if not rows:
+                break
+            last_key = rows[-1][0]
+            updates = []
+            for key, stored in rows:
+                size = len(stored)
+                bytes_before += size
+                if not isinstance(stored, str) and is_encoded(stored) and vector_format(stored) == target:
+                    skipped += 1
+                    bytes_after += size
+                    continue
+                vector = to_vector(stored)
+                blob = encode_vector(vector, target)
+                updates.append((blob, vector.size, key))
+                bytes_after += len(blob)
+            with conn:
+                conn.executemany("UPDATE embeddings SET vector = ?, dimensions = ? WHERE key = ?", updates)
+            converted += len(updates)
+            print(f"  {converted + skipped}/{total}")
+
+        print(f"✅ Re-encoded {converted} vectors ({skipped} already {target})")
+        print(f"   Size: {bytes_before / 1e6:.1f} MB -> {bytes_after / 1e6:.1f} MB")
+        conn.execute("VACUUM")
+    finally:
+        conn.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--format", choices=sorted(FORMATS), default=settings.EMBED_VECTOR_FORMAT)
+    parser.add_argument("--path", default=settings.EMBED_CACHE_PATH)
+    args = parser.parse_args()
+    migrate(args.path, args.format)
+
+
+if __name__ == "__main__":
+    main()
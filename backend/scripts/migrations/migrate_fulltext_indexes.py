@@ -0,0 +1,67 @@
+"""
+Migration: Add FULLTEXT indexes used by the mysql_fulltext search backend
+- jobs(title, description)
+- job_requirements(requirement)
+Run: python backend/scripts/migrations/migrate_fulltext_indexes.py
+"""
+import sys
+import os
+
+# Ensure backend path on PYTHONPATH for flexible imports
+backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+
+from sqlalchemy import text
+
+# Flexible import: works when running inside backend/ or repo root
+try:
+    from src.db.database import engine
+    from src.config import settings
+except ImportError:  # pragma: no cover
+    from backend.src.db.database import engine
+    from backend.src.config import settings
+
+
+FULLTEXT_INDEXES = [
+    ("jobs", "ft_jobs_title_description", "title, description"),
+    ("job_requirements", "ft_job_requirements_requirement", "requirement"),
+]
+
+
+def migrate():
+    print("=" * 60)
+    print("Migration: Add FULLTEXT search indexes")
+    print("=" * 60)
+
+    try:
+        with engine.connect() as conn:
+            for table, index_name, columns in FULLTEXT_INDEXES:
+                result = conn.execute(text("""
+                    SELECT COUNT(*)
+                    FROM information_schema.STATISTICS
+                    WHERE TABLE_SCHEMA = :db_name
+                    AND TABLE_NAME = :table_name
+                    AND INDEX_NAME = :index_name
+                """), {"db_name": settings.DB_NAME, "table_name": table, "index_name": index_name})
+
+                if result.fetchone()[0] > 0:
+                    print(f"✅ Index '{index_name}' already exists on {table}")
+                    continue
+
+                print(f"Adding FULLTEXT index '{index_name}' on {table}({columns})...")
+                conn.execute(text(f"ALTER TABLE {table} ADD FULLTEXT INDEX {index_name} ({columns})"))
+                conn.commit()
+                print(f"✅ Added '{index_name}'")
+
+        print("=" * 60)
+        print("Migration completed successfully!")
+        print("Set SEARCH_BACKEND=mysql_fulltext in .env to use full-text search.")
+
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    migrate()
@@ -0,0 +1,70 @@
+"""
+Migration: Add composite indexes for keyset (cursor) pagination
+- jobs(created_at, id)
+- users(created_at, id)
+- job_applications(status, applied_at, id)
+- security_logs(created_at, id)
+Run: python backend/scripts/migrations/migrate_pagination_indexes.py
+"""
+import sys
+import os
+
+# Ensure backend path on PYTHONPATH for flexible imports
+backend_dir = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+if backend_dir not in sys.path:
+    sys.path.insert(0, backend_dir)
+
+from sqlalchemy import text
+
+# Flexible import: works when running inside backend/ or repo root
+try:
+    from src.db.database import engine
+    from src.config import settings
+except ImportError:  # pragma: no cover
+    from backend.src.db.database import engine
+    from backend.src.config import settings
+
+
+PAGINATION_INDEXES = [
+    ("jobs", "ix_jobs_created_at_id", "created_at, id"),
+    ("users", "ix_users_created_at_id", "created_at, id"),
+    ("job_applications", "ix_job_applications_status_applied_at_id", "status, applied_at, id"),
+    ("security_logs", "ix_security_logs_created_at_id", "created_at, id"),
+]
+
+
+def migrate():
+    print("=" * 60)
+    print("Migration: Add keyset pagination indexes")
+    print("=" * 60)
+
+    try:
+        with engine.connect() as conn:
+            for table, index_name, columns in PAGINATION_INDEXES:
+                result = conn.execute(text("""
+                    SELECT COUNT(*)
+                    FROM information_schema.STATISTICS
+                    WHERE TABLE_SCHEMA = :db_name
+                    AND TABLE_NAME = :table_name
+                    AND INDEX_NAME = :index_name
+                """), {"db_name": settings.DB_NAME, "table_name": table, "index_name": index_name})
+
+                if result.fetchone()[0] > 0:
+                    print(f"✅ Index '{index_name}' already exists on {table}")
+                    continue
+
+                print(f"Adding index '{index_name}' on {table}({columns})...")
+                conn.execute(text(f"ALTER TABLE {table} ADD INDEX {index_name} ({columns})"))
+                conn.commit()
+                print(f"✅ Added '{index_name}'")
+
+        print("=" * 60)
+        print("Migration completed successfully!")
+
+    except Exception as e:
+        print(f"❌ Migration failed: {e}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    migrate()
@@ -15,10 +15,114 @@ class Settings:
 
     CHROMA_COLLECTION: str = os.getenv("CHROMA_COLLECTION", "jobs_collection")
     CHROMA_DIR: str = os.getenv("CHROMA_DIR", ".chroma")
+    CHROMA_WRITE_BATCH_SIZE: int = int(os.getenv("CHROMA_WRITE_BATCH_SIZE", "1000"))
+
+    # Job vector index for chat retrieval (rag/vector_index.py): "numpy" or "chroma"
+    VECTOR_INDEX: str = os.getenv("VECTOR_INDEX", "numpy")
+    VECTOR_INDEX_DIR: str = os.getenv("VECTOR_INDEX_DIR", ".vectors")
 
     GROQ_API_KEY: str = os.getenv("GROQ_API_KEY", "")
     GROQ_MODEL: str = os.getenv("GROQ_MODEL", "openai/gpt-oss-120b")
 
+    # Shared provider clients (rag/clients.py); "stub" runs offline without API keys
+    LLM_PROVIDER: str = os.getenv("LLM_PROVIDER", "groq")
+    EMBEDDING_PROVIDER: str = os.getenv("EMBEDDING_PROVIDER", "openai")
+    LLM_TIMEOUT_SECONDS: float = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+    LLM_CONNECT_TIMEOUT_SECONDS: float = float(os.getenv("LLM_CONNECT_TIMEOUT_SECONDS", "5"))
+    LLM_MAX_RETRIES: int = int(os.getenv("LLM_MAX_RETRIES", "2"))
+    LLM_MAX_CONNECTIONS: int = int(os.getenv("LLM_MAX_CONNECTIONS", "20"))
+    LLM_KEEPALIVE_SECONDS: float = float(os.getenv("LLM_KEEPALIVE_SECONDS", "30"))
+    LLM_MAX_CONCURRENCY: int = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+    STUB_EMBED_DIMENSIONS: int = int(os.getenv("STUB_EMBED_DIMENSIONS", "256"))
+
+    # Batch embeddings (rag/embedder.py) and their on-disk cache (rag/embedding_cache.py)
+    EMBED_BATCH_MAX_TEXTS: int = int(os.getenv("EMBED_BATCH_MAX_TEXTS", "256"))
+    EMBED_BATCH_MAX_TOKENS: int = int(os.getenv("EMBED_BATCH_MAX_TOKENS", "200000"))
+    EMBED_CACHE_PATH: str = os.getenv("EMBED_CACHE_PATH", ".embeddings/cache.sqlite3")
+    # Chat context selection: "vector" (hybrid search: keyword candidates fused with the
+    # nearest jobs from the vector index picked by VECTOR_INDEX; keyword candidates alone
+    # when the index is unavailable, and scanning when SEARCH_HYBRID is off) or "scan"
+    # (first 50 jobs, keyword filter; no retrieval)
+    CHAT_RETRIEVAL: str = os.getenv("CHAT_RETRIEVAL", "vector")
+    CHAT_RETRIEVAL_TOP_K: int = int(os.getenv("CHAT_RETRIEVAL_TOP_K", "20"))
+    # Stored vector format (rag/vector_codec.py): "float32", "float16" or "int8"
+    EMBED_VECTOR_FORMAT: str = os.getenv("EMBED_VECTOR_FORMAT", "float32")
+    # Chat prompt assembly (rag/prompt_builder.py): jobs are packed best first into the
+    # token budget (system prompt included); CHAT_TOKENIZER is a tiktoken encoding
+    CHAT_PROMPT_MAX_TOKENS: int = int(os.getenv("CHAT_PROMPT_MAX_TOKENS", "3000"))
+    CHAT_CONTEXT_MAX_JOBS: int = int(os.getenv("CHAT_CONTEXT_MAX_JOBS", "5"))
+    CHAT_TOKENIZER: str = os.getenv("CHAT_TOKENIZER", "o200k_base")
+    # Chat response cache (rag/response_cache.py); 0 entries disables it, 0 similarity
+    # keeps exact (normalised) message matches only
+    RESPONSE_CACHE_MAX_ENTRIES: int = int(os.getenv("RESPONSE_CACHE_MAX_ENTRIES", "2000"))
+    RESPONSE_CACHE_TTL_SECONDS: float = float(os.getenv("RESPONSE_CACHE_TTL_SECONDS", "900"))
+    RESPONSE_CACHE_SIMILARITY: float = float(os.getenv("RESPONSE_CACHE_SIMILARITY", "0.95"))
+
+    # Job search backend: "python" (in-memory index / Python scorer) or "mysql_fulltext"
+    SEARCH_BACKEND: str = os.getenv("SEARCH_BACKEND", "python")
+    # Age at which the in-memory job index is rebuilt in the background, so jobs written
+    # by other uvicorn workers show up in search (0: never; fine with a single worker)
+    SEARCH_INDEX_TTL_SECONDS: float = float(os.getenv("SEARCH_INDEX_TTL_SECONDS", "300"))
+    # MySQL FULLTEXT mode: "natural" (natural language) or "boolean"
+    SEARCH_FULLTEXT_MODE: str = os.getenv("SEARCH_FULLTEXT_MODE", "natural")
+
+    # Materialized job document cache (utils/job_documents.py)
+    JOB_CACHE_MAX_ENTRIES: int = int(os.getenv("JOB_CACHE_MAX_ENTRIES", "10000"))
+    JOB_CACHE_TTL_SECONDS: float = float(os.getenv("JOB_CACHE_TTL_SECONDS", "300"))
+
+    # Keyset pagination (utils/pagination.py): page size cap and cached total count lifetime
+    PAGINATION_MAX_LIMIT: int = int(os.getenv("PAGINATION_MAX_LIMIT", "500"))
+    PAGINATION_COUNT_TTL_SECONDS: float = float(os.getenv("PAGINATION_COUNT_TTL_SECONDS", "30"))
+
+    # Hybrid search (utils/hybrid_search.py): lexical + vector candidates fused with
+    # reciprocal rank fusion; the vector side is dropped if it misses the latency budget
+    SEARCH_HYBRID: bool = os.getenv("SEARCH_HYBRID", "true").lower() == "true"
+    # Vector side of /jobs/search_jobs: one embedding call per uncached query, so opt-in
+    # (chat retrieval follows CHAT_RETRIEVAL alone)
+    SEARCH_HYBRID_VECTOR: bool = os.getenv("SEARCH_HYBRID_VECTOR", "false").lower() == "true"
+    # Vector hits below this cosine similarity are dropped before fusion
+    HYBRID_VECTOR_MIN_SCORE: float = float(os.getenv("HYBRID_VECTOR_MIN_SCORE", "0.2"))
+    HYBRID_LATENCY_BUDGET_MS: float = float(os.getenv("HYBRID_LATENCY_BUDGET_MS", "400"))
+    HYBRID_CANDIDATE_MULTIPLIER: int = int(os.getenv("HYBRID_CANDIDATE_MULTIPLIER", "5"))
+    HYBRID_LEXICAL_WEIGHT: float = float(os.getenv("HYBRID_LEXICAL_WEIGHT", "1.0"))
+    HYBRID_VECTOR_WEIGHT: float = float(os.getenv("HYBRID_VECTOR_WEIGHT", "1.0"))
+    HYBRID_RRF_K: int = int(os.getenv("HYBRID_RRF_K", "60"))
+
+    # Security middleware (middleware/security_middleware.py): how much of a text request
+    # body is scanned (0 scans headers, path and query only), the scanned size above
+    # which detection runs on a worker thread instead of the event loop, and whether a
+    # threat found only in the body is blocked (by default it is logged, not blocked:
+    # chat messages and job descriptions hit the rule patterns in plain text)
+    SECURITY_SCAN_MAX_BODY_BYTES: int = int(os.getenv("SECURITY_SCAN_MAX_BODY_BYTES", "65536"))
+    SECURITY_SCAN_THREAD_BYTES: int = int(os.getenv("SECURITY_SCAN_THREAD_BYTES", "16384"))
+    SECURITY_BLOCK_ON_BODY: bool = os.getenv("SECURITY_BLOCK_ON_BODY", "false").lower() == "true"
+
+    # Security event writer (utils/security_events.py): batch size and flush interval of
+    # security_logs inserts, queue bound, and the queue fill above which 1 event in
+    # SECURITY_LOG_SAMPLE_EVERY is kept
+    SECURITY_LOG_BATCH_SIZE: int = int(os.getenv("SECURITY_LOG_BATCH_SIZE", "100"))
+    SECURITY_LOG_FLUSH_MS: float = float(os.getenv("SECURITY_LOG_FLUSH_MS", "250"))
+    SECURITY_LOG_QUEUE_MAX: int = int(os.getenv("SECURITY_LOG_QUEUE_MAX", "10000"))
+    SECURITY_LOG_SAMPLE_ABOVE: float = float(os.getenv("SECURITY_LOG_SAMPLE_ABOVE", "0.5"))
+    SECURITY_LOG_SAMPLE_EVERY: int = int(os.getenv("SECURITY_LOG_SAMPLE_EVERY", "10"))
+
+    # Rate limiting (utils/rate_limit.py): "sliding_window" or "token_bucket", and the
+    # most keys (client IPs per endpoint) kept before the least recently used are dropped
+    RATE_LIMIT_ALGORITHM: str = os.getenv("RATE_LIMIT_ALGORITHM", "sliding_window")
+    RATE_LIMIT_MAX_KEYS: int = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+    # Where limits are counted: "memory" (per worker process), "sqlite" (a file shared by
+    # the workers on this host) or "redis" (shared by every host)
+    RATE_LIMIT_STORAGE: str = os.getenv("RATE_LIMIT_STORAGE", "memory")
+    RATE_LIMIT_SQLITE_PATH: str = os.getenv("RATE_LIMIT_SQLITE_PATH", ".ratelimit/rate_limits.sqlite3")
+    RATE_LIMIT_REDIS_URL: str = os.getenv("RATE_LIMIT_REDIS_URL", "redis://localhost:6379/0")
+
+    # Job search ranking engine: "bm25f" or "field_match"
+    SEARCH_RANKER: str = os.getenv("SEARCH_RANKER", "bm25f")
+
+    # Optional JSON file of extra skill synonyms, hot-reloaded when it changes
+    SYNONYMS_FILE: str = os.getenv("SYNONYMS_FILE", "")
+    SYNONYMS_RELOAD_SECONDS: float = float(os.getenv("SYNONYMS_RELOAD_SECONDS", "5"))
+
 
 settings = Settings()
 
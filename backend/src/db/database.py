@@ -1,5 +1,6 @@
 from sqlalchemy import create_engine, text
 from sqlalchemy.orm import sessionmaker, declarative_base
+from sqlalchemy.ext.asyncio import create_async_engine, async_sessionmaker
 from sqlalchemy.exc import OperationalError, DatabaseError
 from fastapi import HTTPException
 
@@ -15,6 +16,12 @@ DATABASE_URL = (
     f"@{settings.DB_HOST}/{settings.DB_NAME}"
 )
 
+# Same database through the aiomysql driver, for async routes (get_async_db)
+ASYNC_DATABASE_URL = (
+    f"mysql+aiomysql://{settings.DB_USER}:{settings.DB_PASS}"
+    f"@{settings.DB_HOST}/{settings.DB_NAME}"
+)
+
 # Create engine with connection pooling
 engine = create_engine(
     DATABASE_URL,
@@ -53,6 +60,52 @@ except Exception as e:
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# Async engine (connects lazily). Needs the aiomysql driver and greenlet;
+# without them the async routes answer 503 and everything else keeps working.
+try:
+    async_engine = create_async_engine(
+        ASYNC_DATABASE_URL,
+        pool_pre_ping=True,
+        pool_recycle=3600,
+        pool_size=10,
+        max_overflow=20,
+        connect_args={
+            "connect_timeout": 10,
+            "charset": "utf8mb4"
+        }
+    )
+    AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+except ImportError as e:
+    async_engine = None
+    AsyncSessionLocal = None
+    print(f"⚠️  Async database driver unavailable ({e}). Install aiomysql to enable async routes.")
+
+
+def _database_http_error(e: OperationalError) -> HTTPException:
+    """Map a connection-level database error to a helpful 503"""
+    error_msg = str(e)
+    print(f"Database connection error: {error_msg}")
+    if "Access denied" in error_msg:
+        return HTTPException(
+            status_code=503,
+            detail="Database authentication failed. Please check DB_USER and DB_PASS in .env file"
+        )
+    elif "Unknown database" in error_msg or "doesn't exist" in error_msg:
+        return HTTPException(
+            status_code=503,
+            detail=f"Database '{settings.DB_NAME}' not found. Please create it first."
+        )
+    elif "Can't connect" in error_msg or "Connection refused" in error_msg:
+        return HTTPException(
+            status_code=503,
+            detail=f"Cannot connect to database at {settings.DB_HOST}. Make sure MySQL/MariaDB is running."
+        )
+    else:
+        return HTTPException(
+            status_code=503,
+            detail=f"Database error: {error_msg}"
+        )
+
 
 def get_db():
     """Get database session with error handling"""
@@ -61,29 +114,12 @@ def get_db():
         yield db
     except OperationalError as e:
         db.rollback()
-        error_msg = str(e)
-        print(f"Database connection error: {error_msg}")
         # Provide helpful error message
-        if "Access denied" in error_msg:
-            raise HTTPException(
-                status_code=503,
-                detail="Database authentication failed. Please check DB_USER and DB_PASS in .env file"
-            )
-        elif "Unknown database" in error_msg or "doesn't exist" in error_msg:
-            raise HTTPException(
-                status_code=503,
-                detail=f"Database '{settings.DB_NAME}' not found. Please create it first."
-            )
-        elif "Can't connect" in error_msg or "Connection refused" in error_msg:
-            raise HTTPException(
-                status_code=503,
-                detail=f"Cannot connect to database at {settings.DB_HOST}. Make sure MySQL/MariaDB is running."
-            )
-        else:
-            raise HTTPException(
-                status_code=503,
-                detail=f"Database error: {error_msg}"
-            )
+        raise _database_http_error(e)
+    except HTTPException:
+        # A route's own 4xx/5xx reaches the client as raised (it used to become a 500)
+        db.rollback()
+        raise
     except Exception as e:
         db.rollback()
         print(f"Database error: {e}")
@@ -94,3 +130,47 @@ def get_db():
     finally:
         db.close()
 
+
+async def get_async_db():
+    """
+    Async database session for async def routes.
+
+    Queries are awaited, so a slow database doesn't hold up the event loop. Existing
+    sync helpers run unchanged through ``await db.run_sync(fn)``, which calls
+    fn(sync_session) with its I/O still going through the async driver.
+    """
+    if AsyncSessionLocal is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Async database driver is not installed (pip install aiomysql)"
+        )
+    async with AsyncSessionLocal() as db:
+        try:
+            yield db
+        except OperationalError as e:
+            await db.rollback()
+            raise _database_http_error(e)
+        except HTTPException:
+            # As in get_db: a route's own HTTPException is passed through
+            await db.rollback()
+            raise
+        except Exception as e:
+            await db.rollback()
+            print(f"Database error: {e}")
+            raise HTTPException(
+                status_code=500,
+                detail=f"An error occurred while accessing the database: {str(e)}"
+            )
+
+
+def get_async_sessionmaker() -> async_sessionmaker:
+    """
+    Async session factory, for routes that run independent queries concurrently:
+    a session runs one query at a time, so each concurrent stage opens its own
+    """
+    if AsyncSessionLocal is None:
+        raise HTTPException(
+            status_code=503,
+            detail="Async database driver is not installed (pip install aiomysql)"
+        )
+    return AsyncSessionLocal
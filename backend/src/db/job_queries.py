@@ -0,0 +1,37 @@
+"""
+Read-model queries for job listings
+List endpoints load jobs through these helpers so a page costs a constant number of
+round trips (jobs + company + location in one SELECT, requirements and disabilities
+in one SELECT each) however many jobs it holds
+"""
+from typing import Dict, Iterable
+
+from sqlalchemy.orm import Session, Query, joinedload, selectinload
+
+from backend.src.db import models
+
+
+def job_listing_options() -> tuple:
+    """Loader options for everything a job listing renders, limited to the columns it shows"""
+    return (
+        joinedload(models.Job.company).load_only(models.Company.id, models.Company.name),
+        joinedload(models.Job.location).load_only(
+            models.Location.id, models.Location.city, models.Location.country
+        ),
+        selectinload(models.Job.requirements),
+        selectinload(models.Job.disabilities).load_only(models.Disability.id, models.Disability.name),
+    )
+
+
+def job_listing_query(db: Session) -> Query:
+    """db.query(models.Job) with the listing relationships eager-loaded"""
+    return db.query(models.Job).options(*job_listing_options())
+
+
+def load_jobs_by_ids(db: Session, job_ids: Iterable[int]) -> Dict[int, models.Job]:
+    """Load a set of jobs (e.g. the top search results) in one eager-loaded query"""
+    job_ids = list(job_ids)
+    if not job_ids:
+        return {}
+    jobs = job_listing_query(db).filter(models.Job.id.in_(job_ids)).all()
+    return {job.id: job for job in jobs}
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Table
+from sqlalchemy import Column, Integer, String, Text, DateTime, Boolean, ForeignKey, Table, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from backend.src.db.database import Base
@@ -52,6 +52,11 @@ class User(Base):
     
     disabilities = relationship("Disability", secondary=user_disabilities, back_populates="users")
     skills = relationship("Skill", secondary=user_skills, back_populates="users")
+    
+    # Keyset pagination order (see migrate_pagination_indexes.py)
+    __table_args__ = (
+        Index('ix_users_created_at_id', 'created_at', 'id'),
+    )
 
 
 class Disability(Base):
@@ -125,6 +130,13 @@ class Job(Base):
     @property
     def posted_at(self):
         return self.created_at
+    
+    __table_args__ = (
+        # Used by the mysql_fulltext search backend (see migrate_fulltext_indexes.py)
+        Index('ft_jobs_title_description', 'title', 'description', mysql_prefix='FULLTEXT'),
+        # Keyset pagination order (see migrate_pagination_indexes.py)
+        Index('ix_jobs_created_at_id', 'created_at', 'id'),
+    )
 
 
 class JobRequirement(Base):
@@ -135,6 +147,10 @@ class JobRequirement(Base):
     requirement = Column(String(500), nullable=False)
     
     job = relationship("Job", back_populates="requirements")
+    
+    __table_args__ = (
+        Index('ft_job_requirements_requirement', 'requirement', mysql_prefix='FULLTEXT'),
+    )
 
 
 class JobApplication(Base):
@@ -158,6 +174,11 @@ class JobApplication(Base):
     user = relationship("User", foreign_keys=[user_id])
     reviewer = relationship("User", foreign_keys=[reviewer_id])
     
+    # Pending queue keyset pagination order (see migrate_pagination_indexes.py)
+    __table_args__ = (
+        Index('ix_job_applications_status_applied_at_id', 'status', 'applied_at', 'id'),
+    )
+    
     @property
     def cv_extracted_info_dict(self):
         """Parse cv_extracted_info JSON string to dict"""
@@ -226,3 +247,8 @@ class SecurityLog(Base):
     created_at = Column(DateTime, default=datetime.utcnow)
     
     user = relationship("User")
+    
+    # Keyset pagination order (see migrate_pagination_indexes.py)
+    __table_args__ = (
+        Index('ix_security_logs_created_at_id', 'created_at', 'id'),
+    )
@@ -1,8 +1,15 @@
 from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.middleware.cors import CORSMiddleware
-from backend.src.db.database import engine, Base
+from backend.src.db.database import engine, Base, SessionLocal
 from backend.src.routes import jobs, users, chat, applications, disabilities, tools, security, companies
+from backend.src.utils.search_index import job_index
+from backend.src.utils.metrics import metrics
+from backend.src.utils.security_events import security_events
+from backend.src.rag.clients import provider_clients
+from backend.src.rag.vector_index import vector_index
+from backend.src.rag.job_vectors import vector_retrieval_enabled
 from sqlalchemy.exc import OperationalError
 import os
 
@@ -22,6 +29,8 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    # Keyset pagination headers on list endpoints that return bare arrays
+    expose_headers=["X-Next-Cursor", "X-Total-Count"],
 )
 
 # Add Security Middleware (optional - uncomment to enable automatic threat detection)
@@ -38,11 +47,54 @@ app.include_router(tools.router)
 app.include_router(security.router)
 app.include_router(companies.router)
 
+
+@app.on_event("startup")
+def build_job_search_index():
+    """Build the in-memory job search index (search falls back to SQL if this fails)"""
+    db = SessionLocal()
+    try:
+        job_index.build(db)
+    except Exception as e:
+        print(f"\n⚠️  Warning: Could not build job search index: {e}")
+        print("   Job search will use the database directly.\n")
+    finally:
+        db.close()
+
+
+@app.on_event("startup")
+def open_vector_index():
+    """Open the job vector index (chat retrieval, hybrid search) once for the whole process"""
+    if vector_retrieval_enabled():
+        try:
+            vector_index.open()
+        except Exception as e:
+            print(f"\n⚠️  Warning: Could not open the {vector_index.name} vector index: {e}\n")
+
+
+@app.on_event("shutdown")
+def close_provider_clients():
+    """Close the pooled LLM / embedding HTTP clients and flush the vector index"""
+    provider_clients.close()
+    vector_index.close()
+
+
+@app.on_event("shutdown")
+def flush_security_events():
+    """Write the security events still queued"""
+    security_events.close()
+
+
 # Serve static files (profile photos and CVs)
 if os.path.exists("uploads"):
     app.mount("/uploads", StaticFiles(directory="uploads"), name="uploads")
 
 
+@app.get("/metrics")
+def get_metrics():
+    """Process metrics (chat time-to-first-token, ...) in the Prometheus text format"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
 @app.get("/health")
 def health():
     return {"status": "ok", "message": "EmpowerWork API is running"}
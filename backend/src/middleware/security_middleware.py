@@ -1,46 +1,103 @@
 """
 Security middleware for automatic threat detection
+A plain ASGI middleware (no BaseHTTPMiddleware): the app gets the original send, so
+streaming responses are passed through untouched. Only text bodies (JSON, forms,
+text) are inspected, and only their first SECURITY_SCAN_MAX_BODY_BYTES; what was
+read is replayed to the app and the rest of the body is never buffered, so CV and
+photo uploads stream straight through. Detection runs on a worker thread when the
+scanned body is larger than SECURITY_SCAN_THREAD_BYTES or an IDS model is loaded.
+Threats found only in the body are logged but not blocked unless SECURITY_BLOCK_ON_BODY
+is set: the rule patterns ("delete from", "`", "1=1") also occur in ordinary chat
+messages and job descriptions.
+Threats are queued on the batched security event writer, never written in the request.
 """
 import json
-from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
+from collections import deque
+from typing import List, Optional, Tuple
+from urllib.parse import unquote_plus
+
+from starlette.concurrency import run_in_threadpool
+from starlette.requests import Request
 from starlette.responses import Response
-from backend.src.utils.ids_detector import analyze_request
-from backend.src.db.database import get_db
-from backend.src.routes.security import log_security_event
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from backend.src.config import settings
+from backend.src.utils.ids_detector import analyze_request, load_ids_model
+from backend.src.utils.security_events import security_events
+
+# Skip security check for health and docs endpoints
+SKIP_PATHS = {'/health', '/docs', '/openapi.json', '/'}
+# Request bodies that are scanned; anything else (multipart uploads, PDFs, images) is not read
+SCANNED_CONTENT_TYPES = ("application/json", "application/x-www-form-urlencoded", "text/")
+
+
+def body_only(threat_result: dict) -> bool:
+    """True if every rule match of a threat is in the request body"""
+    matches = threat_result.get('matches')
+    return bool(matches) and all(
+        match['field'] == 'body' or match['field'].startswith('body.') for match in matches
+    )
 
 
-class SecurityMiddleware(BaseHTTPMiddleware):
+def decode_body(body: bytes, content_type: str, complete: bool):
+    """Scanned form of a body prefix: parsed JSON when complete, otherwise text"""
+    text = body.decode("utf-8", errors="replace")
+    if content_type.startswith("application/json") and complete:
+        try:
+            return json.loads(text)
+        except ValueError:
+            return text
+    if content_type.startswith("application/x-www-form-urlencoded"):
+        return unquote_plus(text)
+    return text
+
+
+class SecurityMiddleware:
     """Middleware to detect and log security threats"""
-    
-    async def dispatch(self, request: Request, call_next):
-        # Skip security check for health and docs endpoints
-        if request.url.path in ['/health', '/docs', '/openapi.json', '/']:
-            return await call_next(request)
-        
+
+    def __init__(self, app: ASGIApp, max_body_bytes: Optional[int] = None, thread_bytes: Optional[int] = None,
+                 block_on_body: Optional[bool] = None):
+        self.app = app
+        self.max_body_bytes = settings.SECURITY_SCAN_MAX_BODY_BYTES if max_body_bytes is None else max_body_bytes
+        self.thread_bytes = settings.SECURITY_SCAN_THREAD_BYTES if thread_bytes is None else thread_bytes
+        self.block_on_body = settings.SECURITY_BLOCK_ON_BODY if block_on_body is None else block_on_body
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or scope["path"] in SKIP_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        request = Request(scope)
+        content_type = request.headers.get("content-type", "")
+        body, complete, received = b"", True, []
+        if self.max_body_bytes > 0 and content_type.startswith(SCANNED_CONTENT_TYPES):
+            body, complete, received = await self.read_body_prefix(receive)
+
         # Analyze request for threats
         try:
-            threat_result = analyze_request(request)
-            
+            payload = decode_body(body, content_type, complete) if body else None
+            if len(body) > self.thread_bytes or load_ids_model() is not None:
+                threat_result = await run_in_threadpool(analyze_request, request, None, payload)
+            else:
+                threat_result = analyze_request(request, body=payload)
+
             if threat_result.get('is_threat'):
-                # Get database session
-                db = next(get_db())
-                
-                # Log the threat
-                log_security_event(
-                    db=db,
+                blocked = threat_result.get('blocked', False) or threat_result.get('severity') == 'critical'
+                if blocked and not self.block_on_body and body_only(threat_result):
+                    blocked = False
+                security_events.log(
                     ip_address=request.client.host if request.client else "unknown",
                     action=request.method + " " + request.url.path,
                     severity=threat_result.get('severity', 'warning'),
                     threat_type=threat_result.get('threat_type'),
                     details=threat_result.get('details', ''),
                     detected_by='ids_model' if threat_result.get('confidence', 0) > 0.5 else 'system',
-                    blocked=threat_result.get('blocked', False)
+                    blocked=blocked
                 )
-                
+
                 # Block if critical threat
-                if threat_result.get('blocked', False) or threat_result.get('severity') == 'critical':
-                    return Response(
+                if blocked:
+                    response = Response(
                         content=json.dumps({
                             "detail": "Request blocked due to security threat",
                             "threat_type": threat_result.get('threat_type')
@@ -48,11 +105,46 @@ class SecurityMiddleware(BaseHTTPMiddleware):
                         status_code=403,
                         media_type="application/json"
                     )
+                    await response(scope, receive, send)
+                    return
         except Exception as e:
             # Don't block on detection errors, just log
             print(f"Security detection error: {e}")
-        
-        # Continue with request
-        response = await call_next(request)
-        return response
 
+        # Continue with request: replay the body messages already read, then the rest
+        await self.app(scope, replay_receive(received, receive), send)
+
+    async def read_body_prefix(self, receive: Receive) -> Tuple[bytes, bool, List[Message]]:
+        """
+        Receive body messages until max_body_bytes are in: (body prefix, whether that is
+        the whole body, the messages received)
+        """
+        messages: List[Message] = []
+        chunks: List[bytes] = []
+        size = 0
+        while size <= self.max_body_bytes:
+            message = await receive()
+            messages.append(message)
+            if message["type"] != "http.request":
+                # Client disconnected
+                return b"".join(chunks), False, messages
+            chunk = message.get("body", b"")
+            chunks.append(chunk)
+            size += len(chunk)
+            if not message.get("more_body", False):
+                return b"".join(chunks)[:self.max_body_bytes], size <= self.max_body_bytes, messages
+        return b"".join(chunks)[:self.max_body_bytes], False, messages
+
+
+def replay_receive(messages: List[Message], receive: Receive) -> Receive:
+    """A receive callable returning messages first, then reading from receive"""
+    if not messages:
+        return receive
+    pending = deque(messages)
+
+    async def replay() -> Message:
+        if pending:
+            return pending.popleft()
+        return await receive()
+
+    return replay
@@ -0,0 +1,171 @@
+"""
+Shared LLM / embedding provider clients
+One long-lived client per provider for the whole process, so chat, speech-to-text and
+embedding calls reuse keep-alive connection pools instead of opening new connections
+(and TLS handshakes) on every request. Closed on FastAPI shutdown.
+
+LLM_PROVIDER=stub / EMBEDDING_PROVIDER=stub swap in offline clients with the same call
+surface, for local development and testing without API keys.
+"""
+import re
+import hashlib
+import math
+import threading
+from contextlib import contextmanager
+from types import SimpleNamespace
+from typing import Dict, List
+
+from backend.src.config import settings
+
+
+def _sdk_client(sdk, client_class, api_key: str):
+    """SDK client with our timeouts, retries and a bounded keep-alive connection pool"""
+    timeout = sdk.Timeout(settings.LLM_TIMEOUT_SECONDS, connect=settings.LLM_CONNECT_TIMEOUT_SECONDS)
+    # Build Limits from the SDK's own httpx flavour
+    limits = type(sdk.DEFAULT_CONNECTION_LIMITS)(
+        max_connections=settings.LLM_MAX_CONNECTIONS,
+        max_keepalive_connections=settings.LLM_MAX_CONNECTIONS,
+        keepalive_expiry=settings.LLM_KEEPALIVE_SECONDS,
+    )
+    return client_class(
+        api_key=api_key,
+        timeout=timeout,
+        max_retries=settings.LLM_MAX_RETRIES,
+        http_client=sdk.DefaultHttpxClient(limits=limits, timeout=timeout),
+    )
+
+
+def _groq_client():
+    import groq
+    return _sdk_client(groq, groq.Groq, settings.GROQ_API_KEY)
+
+
+def _openai_client():
+    import openai
+    return _sdk_client(openai, openai.OpenAI, settings.OPENAI_API_KEY)
+
+
+def stub_embedding(text: str, dimensions: int) -> List[float]:
+    """Deterministic hashed bag-of-words vector (unit length), so similar texts stay similar"""
+    vector = [0.0] * dimensions
+    for token in re.findall(r"\w+", (text or "").lower()):
+        digest = int(hashlib.md5(token.encode()).hexdigest()[:8], 16)
+        vector[digest % dimensions] += 1.0 if digest & 0x80000000 else -1.0
+    norm = math.sqrt(sum(value * value for value in vector))
+    return [value / norm for value in vector] if norm else vector
+
+
+class _StubStream:
+    def __init__(self, text: str):
+        self._pieces = re.findall(r"\S+\s*", text)
+
+    def __iter__(self):
+        for piece in self._pieces:
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=piece))])
+
+    def close(self):
+        self._pieces = []
+
+
+class StubChatClient:
+    """Offline stand-in for the Groq client: chat completions (plain and streamed) and transcription"""
+
+    def __init__(self):
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._complete))
+        self.audio = SimpleNamespace(transcriptions=SimpleNamespace(create=self._transcribe))
+
+    def _complete(self, messages: List[Dict], stream: bool = False, **kwargs):
+        prompt_words = len(messages[-1]["content"].split()) if messages else 0
+        text = f"- Stub response ({prompt_words} prompt words)\n- Set LLM_PROVIDER=groq for real answers"
+        if stream:
+            return _StubStream(text)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+
+    def _transcribe(self, file=None, **kwargs):
+        size = len(file[1]) if isinstance(file, tuple) else 0
+        return SimpleNamespace(text=f"stub transcription of {size} bytes")
+
+    def close(self):
+        pass
+
+
+class StubEmbeddingClient:
+    """Offline stand-in for the OpenAI client's embeddings API"""
+
+    def __init__(self, dimensions: int):
+        self.dimensions = dimensions
+        self.embeddings = SimpleNamespace(create=self._embed)
+
+    def _embed(self, input, model: str = "stub", **kwargs):
+        texts = [input] if isinstance(input, str) else list(input)
+        data = [
+            SimpleNamespace(index=i, embedding=stub_embedding(text, self.dimensions))
+            for i, text in enumerate(texts)
+        ]
+        return SimpleNamespace(data=data, model=model)
+
+    def close(self):
+        pass
+
+
+class ProviderClients:
+    """Process-wide registry of provider clients, created on first use"""
+
+    def __init__(self, max_concurrency: int):
+        self._lock = threading.Lock()
+        self._clients: Dict[str, object] = {}
+        self._slots = threading.BoundedSemaphore(max_concurrency)
+
+    def _get(self, name: str, factory):
+        client = self._clients.get(name)
+        if client is None:
+            with self._lock:
+                client = self._clients.get(name)
+                if client is None:
+                    client = factory()
+                    self._clients[name] = client
+        return client
+
+    def chat_configured(self) -> bool:
+        return settings.LLM_PROVIDER == "stub" or bool(settings.GROQ_API_KEY)
+
+    def embeddings_configured(self) -> bool:
+        return settings.EMBEDDING_PROVIDER == "stub" or bool(settings.OPENAI_API_KEY)
+
+    def chat(self):
+        """Groq client (or the stub) for chat completions and speech-to-text"""
+        if settings.LLM_PROVIDER == "stub":
+            return self._get("chat_stub", StubChatClient)
+        return self._get("groq", _groq_client)
+
+    def embeddings(self):
+        """OpenAI client (or the stub) for embeddings"""
+        if settings.EMBEDDING_PROVIDER == "stub":
+            return self._get("embeddings_stub", lambda: StubEmbeddingClient(settings.STUB_EMBED_DIMENSIONS))
+        return self._get("openai", _openai_client)
+
+    @contextmanager
+    def slot(self):
+        """
+        Hold one of LLM_MAX_CONCURRENCY in-flight provider calls, so a burst of chats
+        queues here instead of piling up connections and provider rate-limit errors
+        """
+        if not self._slots.acquire(timeout=settings.LLM_TIMEOUT_SECONDS):
+            raise TimeoutError("Too many concurrent provider requests")
+        try:
+            yield
+        finally:
+            self._slots.release()
+
+    def close(self):
+        """Close every client's connection pool (FastAPI shutdown)"""
+        with self._lock:
+            clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            try:
+                client.close()
+            except Exception as e:
+                print(f"⚠️  Warning: Could not close provider client: {e}")
+
+
+provider_clients = ProviderClients(settings.LLM_MAX_CONCURRENCY)
@@ -1,27 +1,94 @@
 import json
-from typing import List
-from openai import OpenAI
+from typing import Iterator, List
+
+import numpy as np
 
 from backend.src.config import settings
+from backend.src.rag.clients import provider_clients
+from backend.src.rag.embedding_cache import embedding_cache, content_key, decode_cached
 
 
-def get_embedding(text: str) -> List[float]:
-    if not settings.OPENAI_API_KEY:
+def estimate_tokens(text: str) -> int:
+    """Rough token count (~4 characters per token) used to size batches"""
+    return len(text) // 4 + 1
+
+
+def pack_batches(texts: List[str], max_texts: int, max_tokens: int) -> Iterator[List[str]]:
+    """Split texts into request-sized batches by count and estimated tokens"""
+    batch: List[str] = []
+    batch_tokens = 0
+    for text in texts:
+        tokens = estimate_tokens(text)
+        if batch and (len(batch) >= max_texts or batch_tokens + tokens > max_tokens):
+            yield batch
+            batch, batch_tokens = [], 0
+        batch.append(text)
+        batch_tokens += tokens
+    if batch:
+        yield batch
+
+
+def _embed_batch(texts: List[str]) -> List[List[float]]:
+    with provider_clients.slot():
+        resp = provider_clients.embeddings().embeddings.create(
+            model=settings.OPENAI_EMBED_MODEL,
+            input=texts,
+        )
+    # Results carry their input index; don't rely on response order
+    return [item.embedding for item in sorted(resp.data, key=lambda item: item.index)]
+
+
+def _embed_vectors(texts: List[str]) -> List[np.ndarray]:
+    """
+    float32 embeddings for many texts, in input order.
+    Cached texts (same model + same content) are served from the embedding cache;
+    the rest are de-duplicated and sent in as few API requests as the limits allow.
+    """
+    if not provider_clients.embeddings_configured():
         raise ValueError("OPENAI_API_KEY is not set")
 
-    text = text or ""
-    client = OpenAI(api_key=settings.OPENAI_API_KEY)
-    resp = client.embeddings.create(
-        model=settings.OPENAI_EMBED_MODEL,
-        input=text,
-    )
-    return resp.data[0].embedding
+    model = settings.OPENAI_EMBED_MODEL
+    texts = [text or "" for text in texts]
+    keys = [content_key(model, text) for text in texts]
+    vectors = embedding_cache.get_many(keys)
+
+    missing = {}
+    for key, text in zip(keys, texts):
+        if key not in vectors:
+            missing[key] = text
+    if missing:
+        missing_keys = list(missing)
+        start = 0
+        for batch in pack_batches(list(missing.values()), settings.EMBED_BATCH_MAX_TEXTS, settings.EMBED_BATCH_MAX_TOKENS):
+            batch_keys = missing_keys[start:start + len(batch)]
+            start += len(batch)
+            blobs = {key: embedding_cache.encode(vector) for key, vector in zip(batch_keys, _embed_batch(batch))}
+            embedding_cache.put_many(blobs)
+            # Decode what was stored so fresh and cached results are identical
+            vectors.update({key: decode_cached(blob) for key, blob in blobs.items()})
 
+    return [vectors[key] for key in keys]
 
+
+def get_embeddings(texts: List[str]) -> List[List[float]]:
+    """Embeddings for many texts, in input order (batched and cached)"""
+    return [vector.tolist() for vector in _embed_vectors(texts)]
+
+
+def get_embedding_matrix(texts: List[str]) -> np.ndarray:
+    """Embeddings for many texts as one (len(texts), dimensions) float32 array"""
+    vectors = _embed_vectors(texts)
+    return np.vstack(vectors) if vectors else np.empty((0, 0), dtype=np.float32)
+
+
+def get_embedding(text: str) -> List[float]:
+    return get_embeddings([text])[0]
+
+
+# Legacy text format; new code stores vectors with rag/vector_codec.py
 def embedding_to_json(vector: List[float]) -> str:
     return json.dumps(vector)
 
 
 def embedding_from_json(data: str) -> List[float]:
     return json.loads(data)
-
@@ -0,0 +1,94 @@
+"""
+Persistent embedding cache
+SQLite table keyed by a hash of (model, text), holding vectors as binary BLOBs
+(rag/vector_codec.py, EMBED_VECTOR_FORMAT), so unchanged job texts are never sent
+to the embedding API twice
+"""
+import os
+import sqlite3
+import hashlib
+import threading
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from backend.src.config import settings
+from backend.src.rag.vector_codec import encode_vector, decode_vector, vector_view, is_encoded
+
+
+def content_key(model: str, text: str) -> str:
+    """Cache key for a text embedded with a given model"""
+    return hashlib.sha256(f"{model}\0{text}".encode("utf-8")).hexdigest()
+
+
+def decode_cached(blob: bytes) -> np.ndarray:
+    """Stored vector as float32; also reads the headerless float32 rows of older caches"""
+    if isinstance(blob, bytes) and not is_encoded(blob):
+        return np.frombuffer(blob, dtype="<f4")
+    return decode_vector(blob)
+
+
+class EmbeddingCache:
+    """content_key -> float32 vector, shared by all threads of the process"""
+
+    def __init__(self, path: str, vector_format: str = "float32"):
+        self.path = path
+        self.vector_format = vector_format
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self.hits = 0
+        self.misses = 0
+
+    def _connection(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings ("
+                "key TEXT PRIMARY KEY, dimensions INTEGER NOT NULL, vector BLOB NOT NULL)"
+            )
+            self._conn = conn
+        return self._conn
+
+    def get_many(self, keys: Iterable[str]) -> Dict[str, np.ndarray]:
+        keys = list(dict.fromkeys(keys))
+        found: Dict[str, np.ndarray] = {}
+        with self._lock:
+            conn = self._connection()
+            # Stay under SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = conn.execute(
+                    f"SELECT key, vector FROM embeddings WHERE key IN ({placeholders})", chunk
+                ).fetchall()
+                for key, blob in rows:
+                    found[key] = decode_cached(blob)
+            self.hits += len(found)
+            self.misses += len(keys) - len(found)
+        return found
+
+    def encode(self, vector) -> bytes:
+        return encode_vector(vector, self.vector_format)
+
+    def put_many(self, blobs: Dict[str, bytes]):
+        """Store already-encoded vectors (see encode())"""
+        if not blobs:
+            return
+        rows = [(key, vector_view(blob)[0].size, blob) for key, blob in blobs.items()]
+        with self._lock:
+            conn = self._connection()
+            with conn:
+                conn.executemany("INSERT OR REPLACE INTO embeddings (key, dimensions, vector) VALUES (?, ?, ?)", rows)
+
+    def close(self):
+        with self._lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+embedding_cache = EmbeddingCache(settings.EMBED_CACHE_PATH, settings.EMBED_VECTOR_FORMAT)
@@ -0,0 +1,110 @@
+"""
+Job vector index for chat retrieval
+Each job's text (title, company, requirements, accessibility support, description)
+is embedded into the vector index (VECTOR_INDEX). Chat embeds the user's message and
+asks the index for the nearest jobs, instead of scanning an arbitrary slice of the table.
+"""
+from typing import Dict, Iterable, List, Optional
+
+from sqlalchemy.orm import Session
+
+from backend.src.config import settings
+from backend.src.db.database import SessionLocal
+from backend.src.rag.clients import provider_clients
+from backend.src.rag.embedder import get_embeddings, get_embedding
+from backend.src.rag.vector_index import vector_index
+from backend.src.utils.job_documents import job_document_cache
+
+
+def job_embedding_text(document: Dict) -> str:
+    """The text a job is embedded as"""
+    parts = [document["title"]]
+    if document["company_name"]:
+        parts.append(f"Company: {document['company_name']}")
+    if document["requirements"]:
+        parts.append("Requirements: " + ", ".join(document["requirements"]))
+    if document["disability_support"]:
+        parts.append("Accessibility support: " + ", ".join(document["disability_support"]))
+    parts.append(f"{document['employment_type'] or ''} {document['remote_type'] or ''}".strip())
+    parts.append(document["description"])
+    return "\n".join(part for part in parts if part)
+
+
+def job_vector_metadata(document: Dict) -> Dict:
+    """Filterable fields stored with each job vector"""
+    return {
+        "company_id": document["company_id"] or 0,
+        "employment_type": document["employment_type"] or "",
+        "remote_type": document["remote_type"] or "",
+    }
+
+
+def vector_retrieval_enabled() -> bool:
+    """The job vector index is in use (chat retrieval or the vector side of job search)"""
+    return (
+        (settings.CHAT_RETRIEVAL == "vector" or settings.SEARCH_HYBRID_VECTOR)
+        and vector_index.available()
+        and provider_clients.embeddings_configured()
+    )
+
+
+def index_job_documents(documents: List[Dict]):
+    """Embed (batched, cached) and upsert job documents"""
+    if not documents or not vector_retrieval_enabled():
+        return
+    texts = [job_embedding_text(document) for document in documents]
+    vector_index.upsert(
+        ids=[document["id"] for document in documents],
+        vectors=get_embeddings(texts),
+        metadatas=[job_vector_metadata(document) for document in documents],
+        texts=texts,
+    )
+
+
+def index_jobs(db: Session, job_ids: Iterable[int]):
+    index_job_documents(job_document_cache.load(db, list(job_ids)))
+
+
+def index_jobs_task(job_ids: List[int]):
+    """Background task for write routes: re-embed the given jobs after the response is sent"""
+    if not vector_retrieval_enabled():
+        return
+    db = SessionLocal()
+    try:
+        index_jobs(db, job_ids)
+    except Exception as e:
+        print(f"Warning: Could not index jobs {job_ids} for chat retrieval: {e}")
+    finally:
+        db.close()
+
+
+def remove_jobs_task(job_ids: List[int]):
+    if not vector_retrieval_enabled():
+        return
+    try:
+        vector_index.delete(job_ids)
+    except Exception as e:
+        print(f"Warning: Could not remove jobs {job_ids} from chat retrieval: {e}")
+
+
+def retrieve_job_ids(
+    message: str,
+    top_k: Optional[int] = None,
+    filters: Optional[Dict] = None,
+) -> Optional[Dict[int, float]]:
+    """
+    Nearest jobs to message as {job_id: similarity}, best first, optionally restricted
+    by metadata filters (e.g. {"remote_type": "remote"}).
+    None when vector retrieval is off, unavailable or the index is empty, so callers
+    can fall back to scanning jobs.
+    """
+    if not vector_retrieval_enabled():
+        return None
+    try:
+        if not vector_index.count():
+            return None
+        results = vector_index.search(get_embedding(message), top_k or settings.CHAT_RETRIEVAL_TOP_K, filters)
+    except Exception as e:
+        print(f"Warning: Chat retrieval failed: {e}")
+        return None
+    return dict(results) or None
@@ -0,0 +1,323 @@
+"""
+Chat prompt assembly
+The static parts of the prompt (system prompt, instruction block) are built and
+token-counted once; profile sections are cached per profile; each job's context
+snippet is formatted and counted once per job id and content (an LRU here, next to
+the profile sections). Jobs are then packed in priority order into
+CHAT_PROMPT_MAX_TOKENS, and every prompt reports its token count.
+
+Tokens are counted with tiktoken (CHAT_TOKENIZER encoding) when it is installed,
+otherwise with a local word/punctuation approximation.
+"""
+import re
+import threading
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from backend.src.config import settings
+
+try:
+    import tiktoken
+    TIKTOKEN_AVAILABLE = True
+except ImportError:
+    TIKTOKEN_AVAILABLE = False
+
+
+SYSTEM_PROMPT = """You are a helpful job assistant for people with disabilities. 
+You have access to the user's profile, their application history, and a curated list of relevant job listings.
+
+CRITICAL RESPONSE FORMAT:
+- NO EMOJIS - Never use emojis in your responses
+- NO PARAGRAPHS - Use bullet points, short sentences, or concise summaries
+- BE CONCISE - Keep responses brief and to the point
+- USE BULLET POINTS - Format information as lists when possible
+- SHORT SENTENCES - Maximum 15-20 words per sentence
+
+IMPORTANT GUIDELINES:
+- Prioritize jobs that support the user's specific disabilities
+- Consider the user's application history - don't recommend jobs they've already applied to (unless they ask)
+- Match jobs to user's skills and preferences
+- Be personalized and specific - mention why each job is good for their disability
+- Recommend 2-3 best matching jobs with specific details (title, company, key requirements)
+- Explain how each job accommodates their disability in brief points
+- Be friendly, supportive, and informative but concise
+- Always mention specific job titles and companies when recommending jobs
+- Don't overwhelm the user with too many options - quality over quantity
+- Format responses as bullet points or short summary sentences"""
+
+PROMPT_INSTRUCTIONS = """
+
+CRITICAL RESPONSE FORMAT REQUIREMENTS:
+- NO EMOJIS - Do not use any emojis in your response
+- NO PARAGRAPHS - Use bullet points or short sentences only
+- BE CONCISE - Keep response brief and summary-style
+- MAXIMUM 100 words total response length
+- Use bullet points for job recommendations
+- One short sentence per point
+
+CRITICAL INSTRUCTIONS:
+1. Disability Matching: Prioritize jobs marked "PERFECT MATCH" - these support the user's specific disabilities
+2. Application History: Don't recommend jobs marked "(Already Applied)" unless user specifically asks about them
+3. Personalization: Briefly explain why each job matches their disability
+4. Recommendations: Suggest 2-3 best matching jobs that support their disabilities
+5. Be Specific: Mention job title, company, and accommodation in brief points
+6. Be Supportive: Acknowledge their disability briefly
+7. Keep Focused: Don't list all jobs - only the best matches
+8. Format: Use bullet points, no paragraphs, no emojis, concise summary style"""
+
+NO_JOBS_TEXT = "No matching jobs found in the database."
+JOBS_HEADER = "\nAvailable Job Listings (sorted by relevance to user's disabilities):\n"
+NO_JOBS_NOTE = "\nNote: No matching jobs found in the database."
+MATCH_INDICATOR = "PERFECT MATCH"
+APPLIED_INDICATOR = " (Already Applied)"
+
+# Fallback tokenizer: words, numbers and single punctuation marks, long words split
+# roughly the way BPE vocabularies split them
+TOKEN_PATTERN = re.compile(r"\w{1,6}|[^\w\s]|\n")
+
+
+_encoding = None
+_encoding_lock = threading.Lock()
+
+
+def _get_encoding():
+    global _encoding, TIKTOKEN_AVAILABLE
+    if _encoding is None and TIKTOKEN_AVAILABLE:
+        with _encoding_lock:
+            if _encoding is None:
+                try:
+                    _encoding = tiktoken.get_encoding(settings.CHAT_TOKENIZER)
+                except Exception as e:
+                    print(f"Warning: Could not load tokenizer {settings.CHAT_TOKENIZER}, estimating tokens: {e}")
+                    TIKTOKEN_AVAILABLE = False
+    return _encoding
+
+
+def count_tokens(text: str) -> int:
+    """Prompt tokens in text"""
+    encoding = _get_encoding()
+    if encoding is not None:
+        return len(encoding.encode(text, disallowed_special=()))
+    return len(TOKEN_PATTERN.findall(text))
+
+
+@lru_cache(maxsize=None)
+def _static_tokens(text: str) -> int:
+    """Token count of a constant prompt part, counted once"""
+    return count_tokens(text)
+
+
+class JobSnippet(NamedTuple):
+    """A job's context lines, formatted once per job version"""
+    title_line: str
+    body: str
+    tokens: int
+    disability_support_lower: tuple
+
+
+def build_job_snippet(job: Dict) -> JobSnippet:
+    disability_support = job.get('disability_support', [])
+    title_line = f"Job #{job.get('id', 'N/A')}: {job.get('title', 'N/A')} at {job.get('company', 'Unknown')}"
+    body = f"""Location: {job.get('location', 'Not specified')} | Type: {job.get('employment_type', 'N/A')} ({job.get('remote_type', 'N/A')})
+Key Requirements: {', '.join(job.get('requirements', [])[:3])}
+Disability Support: {', '.join(disability_support[:3]) if disability_support else 'Not specified'}
+"""
+    return JobSnippet(
+        title_line, body, count_tokens(f"{title_line}\n{body}"),
+        tuple(d.lower() for d in disability_support),
+    )
+
+
+class _JobSnippetCache:
+    """
+    LRU of job snippets keyed by job id and the fields the snippet shows, so an edited
+    job (or one reloaded with another worker's edit) gets a new entry
+    """
+
+    def __init__(self, max_entries: int = 10000):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[tuple, JobSnippet]" = OrderedDict()
+
+    @staticmethod
+    def key(job: Dict) -> tuple:
+        return (
+            job.get('id'),
+            job.get('title'),
+            job.get('company'),
+            job.get('location'),
+            job.get('employment_type'),
+            job.get('remote_type'),
+            tuple(job.get('requirements', [])[:3]),
+            tuple(job.get('disability_support', [])),
+        )
+
+    def get(self, job: Dict) -> JobSnippet:
+        key = self.key(job)
+        with self._lock:
+            snippet = self._entries.get(key)
+            if snippet is not None:
+                self._entries.move_to_end(key)
+                return snippet
+        snippet = build_job_snippet(job)
+        with self._lock:
+            self._entries[key] = snippet
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return snippet
+
+
+job_snippets = _JobSnippetCache(settings.JOB_CACHE_MAX_ENTRIES)
+
+
+def job_snippet(job: Dict) -> JobSnippet:
+    """The job's snippet, formatted and token-counted once per job content"""
+    return job_snippets.get(job)
+
+
+def disability_matches(snippet: JobSnippet, user_dis_lower: Sequence[str]) -> int:
+    """How many of the user's disabilities the job supports"""
+    return sum(1 for ud in user_dis_lower
+               if any(ud in ds or ds in ud for ds in snippet.disability_support_lower))
+
+
+def _rank_jobs(jobs: List[Dict], user_disabilities: Optional[List[str]]) -> List[tuple]:
+    """(job, snippet, disability matches), disability matches first"""
+    user_dis_lower = [d.lower() for d in user_disabilities or []]
+    ranked = [
+        (job, snippet, disability_matches(snippet, user_dis_lower) if user_dis_lower else 0)
+        for job, snippet in ((job, job_snippet(job)) for job in jobs)
+    ]
+    if user_disabilities:
+        # Jobs supporting more of the user's disabilities first, already-applied ones after
+        ranked.sort(key=lambda item: (item[2], -(1 if item[0].get('has_applied') else 0)), reverse=True)
+    return ranked
+
+
+def _render_job(job: Dict, snippet: JobSnippet, matches: int) -> str:
+    match_indicator = MATCH_INDICATOR if matches else ""
+    applied_indicator = APPLIED_INDICATOR if job.get('has_applied') else ""
+    return f"{match_indicator}{snippet.title_line}{applied_indicator}\n{snippet.body}"
+
+
+def _job_tokens(job: Dict, snippet: JobSnippet, matches: int) -> int:
+    tokens = snippet.tokens + 1  # joining newline
+    if matches:
+        tokens += _static_tokens(MATCH_INDICATOR)
+    if job.get('has_applied'):
+        tokens += _static_tokens(APPLIED_INDICATOR)
+    return tokens
+
+
+def format_jobs_for_context(jobs: List[Dict], user_disabilities: Optional[List[str]] = None) -> str:
+    """Format jobs data into a concise, readable context string, prioritizing disability matches"""
+    if not jobs:
+        return NO_JOBS_TEXT
+    ranked = _rank_jobs(jobs, user_disabilities)[:settings.CHAT_CONTEXT_MAX_JOBS]
+    return "\n".join(_render_job(*item) for item in ranked)
+
+
+class _ProfileSectionCache:
+    """Small LRU of rendered profile sections keyed by the profile fields they use"""
+
+    def __init__(self, max_entries: int = 1024):
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[tuple, tuple]" = OrderedDict()
+
+    @staticmethod
+    def key(user_profile: dict) -> tuple:
+        return (
+            tuple(user_profile.get("disabilities") or ()),
+            tuple(app.get('job_title', 'Unknown') for app in (user_profile.get("applied_jobs") or [])[:5]),
+            tuple(user_profile.get("skills") or ()),
+            user_profile.get("location"),
+            user_profile.get("preferred_job_type"),
+        )
+
+    def get(self, user_profile: Optional[dict]) -> tuple:
+        """(context lines, tokens) for the profile part of the user context"""
+        if not user_profile:
+            return (), 0
+        key = self.key(user_profile)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                return entry
+        entry = self._render(*key)
+        with self._lock:
+            self._entries[key] = entry
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+        return entry
+
+    @staticmethod
+    def _render(disabilities, applied_titles, skills, location, preferred_job_type) -> tuple:
+        context_parts = []
+        # User disabilities - VERY IMPORTANT for recommendations
+        if disabilities:
+            context_parts.append(f"USER DISABILITIES: {', '.join(disabilities)}")
+            context_parts.append("CRITICAL: Prioritize jobs that support these specific disabilities")
+        # User's application history
+        if applied_titles:
+            context_parts.append(f"Jobs user has already applied to: {', '.join(applied_titles)}")
+            context_parts.append("NOTE: Don't recommend these jobs unless user specifically asks about them")
+        if skills:
+            context_parts.append(f"User skills: {', '.join(skills)}")
+        if location:
+            context_parts.append(f"User location: {location}")
+        if preferred_job_type:
+            context_parts.append(f"Preferred job type: {preferred_job_type}")
+        lines = tuple(context_parts)
+        return lines, count_tokens("\n".join(lines)) + 1 if lines else 0
+
+
+profile_sections = _ProfileSectionCache()
+
+
+class ChatPrompt(NamedTuple):
+    """The user prompt plus the token count of the whole request (system prompt included)"""
+    text: str
+    tokens: int
+    jobs_included: int
+    jobs_dropped: int
+
+
+def build_prompt(message: str, user_profile: Optional[dict], jobs_data: Optional[List[Dict]] = None,
+                 max_tokens: Optional[int] = None) -> ChatPrompt:
+    """
+    User prompt: profile, application history and job listings context plus the question.
+    Jobs are added best first while the request stays within max_tokens
+    (CHAT_PROMPT_MAX_TOKENS); the best job is always kept.
+    """
+    max_tokens = max_tokens or settings.CHAT_PROMPT_MAX_TOKENS
+    profile_lines, profile_tokens = profile_sections.get(user_profile)
+    context_parts = list(profile_lines)
+
+    question = f"\n\nUser Question: {message}"
+    tokens = (_static_tokens(SYSTEM_PROMPT) + _static_tokens(PROMPT_INSTRUCTIONS)
+              + _static_tokens("User Context:\n") + profile_tokens + count_tokens(question))
+
+    # Add jobs database context (only relevant jobs are passed)
+    included, dropped = [], 0
+    if jobs_data:
+        user_disabilities = user_profile.get("disabilities") if user_profile else None
+        tokens += _static_tokens(JOBS_HEADER)
+        for item in _rank_jobs(jobs_data, user_disabilities)[:settings.CHAT_CONTEXT_MAX_JOBS]:
+            job_tokens = _job_tokens(*item)
+            if included and tokens + job_tokens > max_tokens:
+                dropped += 1
+                continue
+            included.append(_render_job(*item))
+            tokens += job_tokens
+        context_parts.append(f"{JOBS_HEADER}{chr(10).join(included)}")
+    else:
+        tokens += _static_tokens(NO_JOBS_NOTE)
+        context_parts.append(NO_JOBS_NOTE)
+
+    # Build the prompt
+    user_context = "\n".join(context_parts) if context_parts else ""
+    text = f"User Context:\n{user_context}{question}{PROMPT_INSTRUCTIONS}"
+    return ChatPrompt(text, tokens, len(included), dropped)
@@ -0,0 +1,206 @@
+"""
+Chat response cache
+Reuses chatbot answers for repeated questions. An answer is only reused for the same
+scope (every profile field the prompt renders, the user's applied job ids and the
+same set of candidate jobs), and then either for the same normalised message or, when embeddings
+are configured, for a message whose embedding is at least RESPONSE_CACHE_SIMILARITY
+similar ("show me remote jobs" / "remote jobs for me").
+
+Entries expire after RESPONSE_CACHE_TTL_SECONDS (and are dropped when a lookup finds
+them expired), the least recently used are evicted
+beyond RESPONSE_CACHE_MAX_ENTRIES, and job writes drop every answer that used the job.
+
+The message embedding is computed at most once per chat: lookup() hands the vector it
+used to put(), and a message lookup() didn't embed is embedded on a background thread
+after the answer is stored, never on the request path.
+"""
+import re
+import time
+import queue
+import threading
+from collections import OrderedDict
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from backend.src.config import settings
+from backend.src.rag.clients import provider_clients
+from backend.src.rag.embedder import get_embedding
+from backend.src.rag.prompt_builder import profile_sections
+from backend.src.utils.metrics import metrics
+
+NON_WORD_PATTERN = re.compile(r"[^\w\s]")
+
+response_cache_hits = metrics.counter("chat_response_cache_hits_total", "Chat answers served from the response cache")
+response_cache_similar_hits = metrics.counter(
+    "chat_response_cache_similar_hits_total", "Response cache hits found by embedding similarity"
+)
+response_cache_misses = metrics.counter("chat_response_cache_misses_total", "Chat answers generated by the model")
+
+
+def normalize_message(message: str) -> str:
+    """Lowercase, punctuation removed, whitespace collapsed"""
+    return " ".join(NON_WORD_PATTERN.sub(" ", message.lower()).split())
+
+
+def profile_signature(user_profile: Optional[dict]) -> tuple:
+    """
+    The parts of the user profile that shape the answer: the fields the prompt's profile
+    section is rendered from (disabilities, skills, applied job titles, location,
+    preferred job type) and the applied job ids
+    """
+    if not user_profile:
+        return ()
+    return profile_sections.key(user_profile) + (tuple(sorted(user_profile.get("applied_job_ids") or [])),)
+
+
+def response_scope(user_profile: Optional[dict], jobs_data: Optional[List[Dict]]) -> tuple:
+    job_ids = frozenset(job["id"] for job in jobs_data or [] if job.get("id") is not None)
+    return profile_signature(user_profile), job_ids
+
+
+class ResponseCache:
+    """Thread-safe LRU of (scope, normalised message) -> answer, with per-scope message vectors"""
+
+    # Messages waiting for a background embedding; more are stored without a vector
+    MAX_PENDING_EMBEDDINGS = 1000
+
+    def __init__(self, max_entries: int, ttl_seconds: float, similarity: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.similarity = similarity
+        self._lock = threading.Lock()
+        # (scope, message) -> (stored_at, answer, unit vector or None)
+        self._entries: "OrderedDict[Tuple[tuple, str], tuple]" = OrderedDict()
+        self._scopes: Dict[tuple, set] = {}
+        self._pending: "queue.Queue[Tuple[tuple, str]]" = queue.Queue(self.MAX_PENDING_EMBEDDINGS)
+        self._embedder: Optional[threading.Thread] = None
+
+    def __len__(self):
+        return len(self._entries)
+
+    def _similarity_enabled(self) -> bool:
+        return self.similarity > 0 and provider_clients.embeddings_configured()
+
+    def _message_vector(self, message: str) -> Optional[np.ndarray]:
+        # The raw message, so the embedding cache entry from retrieval is reused
+        try:
+            vector = np.asarray(get_embedding(message), dtype=np.float32)
+        except Exception as e:
+            print(f"Warning: Response cache could not embed message: {e}")
+            return None
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else None
+
+    def _remove(self, key):
+        self._entries.pop(key, None)
+        messages = self._scopes.get(key[0])
+        if messages is not None:
+            messages.discard(key[1])
+            if not messages:
+                del self._scopes[key[0]]
+
+    def get(self, message: str, user_profile: Optional[dict], jobs_data: Optional[List[Dict]]) -> Optional[str]:
+        return self.lookup(message, user_profile, jobs_data)[0]
+
+    def lookup(
+        self, message: str, user_profile: Optional[dict], jobs_data: Optional[List[Dict]]
+    ) -> Tuple[Optional[str], Optional[np.ndarray]]:
+        """
+        (cached answer or None, the message vector if one was computed): pass the vector
+        on to put() so the message isn't embedded again
+        """
+        if self.max_entries <= 0:
+            return None, None
+        scope = response_scope(user_profile, jobs_data)
+        key = (scope, normalize_message(message))
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if now - entry[0] <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    response_cache_hits.inc()
+                    return entry[1], None
+                self._remove(key)
+            has_scope = scope in self._scopes
+
+        vector = None
+        if has_scope and self._similarity_enabled():
+            vector = self._message_vector(message)
+            if vector is not None:
+                with self._lock:
+                    candidates = [
+                        (scope, other) for other in self._scopes.get(scope, ())
+                        if self._entries[(scope, other)][2] is not None
+                        and now - self._entries[(scope, other)][0] <= self.ttl_seconds
+                    ]
+                    if candidates:
+                        scores = np.stack([self._entries[other][2] for other in candidates]) @ vector
+                        best = int(np.argmax(scores))
+                        if scores[best] >= self.similarity:
+                            self._entries.move_to_end(candidates[best])
+                            response_cache_hits.inc()
+                            response_cache_similar_hits.inc()
+                            return self._entries[candidates[best]][1], vector
+        response_cache_misses.inc()
+        return None, vector
+
+    def put(self, message: str, user_profile: Optional[dict], jobs_data: Optional[List[Dict]], answer: str,
+            vector: Optional[np.ndarray] = None):
+        """Store answer; vector is the one lookup() returned (embedded later when None)"""
+        if self.max_entries <= 0:
+            return
+        scope = response_scope(user_profile, jobs_data)
+        key = (scope, normalize_message(message))
+        with self._lock:
+            self._entries[key] = (time.monotonic(), answer, vector)
+            self._entries.move_to_end(key)
+            self._scopes.setdefault(scope, set()).add(key[1])
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+        if vector is None and self._similarity_enabled():
+            self._embed_later(key, message)
+
+    def _embed_later(self, key: Tuple[tuple, str], message: str):
+        try:
+            self._pending.put_nowait((key, message))
+        except queue.Full:
+            return
+        with self._lock:
+            if self._embedder is None or not self._embedder.is_alive():
+                self._embedder = threading.Thread(
+                    target=self._embed_pending, name="response-cache-embedder", daemon=True
+                )
+                self._embedder.start()
+
+    def _embed_pending(self):
+        """Background thread: attach message vectors to entries stored without one"""
+        while True:
+            key, message = self._pending.get()
+            vector = self._message_vector(message)
+            if vector is None:
+                continue
+            with self._lock:
+                entry = self._entries.get(key)
+                if entry is not None and entry[2] is None:
+                    self._entries[key] = (entry[0], entry[1], vector)
+
+    def invalidate_jobs(self, job_ids: Iterable[int]):
+        """Drop every answer whose candidate jobs include one of job_ids (call after job writes)"""
+        job_ids = set(job_ids)
+        with self._lock:
+            for key in [key for key in self._entries if key[0][1] & job_ids]:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._scopes.clear()
+
+
+response_cache = ResponseCache(
+    settings.RESPONSE_CACHE_MAX_ENTRIES,
+    settings.RESPONSE_CACHE_TTL_SECONDS,
+    settings.RESPONSE_CACHE_SIMILARITY,
+)
@@ -1,3 +1,9 @@
+"""
+Vector database retrieval (ChromaDB)
+One persistent client and collection handle per process, opened at startup and shared
+by every request; the index lives in CHROMA_DIR and survives restarts.
+"""
+import threading
 from typing import List, Dict, Optional
 
 try:
@@ -10,49 +16,162 @@ except ImportError:
 from backend.src.config import settings
 
 
+class ChromaStore:
+    """
+    Lazily opened, thread-safe Chroma collection handle.
+
+    Writes are group-committed: rows queue in _pending and whichever writer holds the
+    write lock flushes everything queued so far, in chunks of at most write_batch_size,
+    so concurrent single-job upserts become a few batched calls.
+    """
+
+    def __init__(self, path: str, collection_name: str, write_batch_size: int):
+        self.path = path
+        self.collection_name = collection_name
+        self.write_batch_size = write_batch_size
+        self._open_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._pending_lock = threading.Lock()
+        self._pending: Dict[str, tuple] = {}
+        self._client = None
+        self._collection = None
+
+    def collection(self):
+        if self._collection is None:
+            if not CHROMADB_AVAILABLE:
+                raise RuntimeError("ChromaDB is not available. Install dependencies: pip install chromadb")
+            with self._open_lock:
+                if self._collection is None:
+                    self._client = chromadb.PersistentClient(
+                        path=self.path,
+                        settings=ChromaSettings(anonymized_telemetry=False),
+                    )
+                    # Cosine distance, so 1 - distance is the embedding similarity
+                    self._collection = self._check_metric(self._client.get_or_create_collection(
+                        self.collection_name, metadata={"hnsw:space": "cosine"}
+                    ))
+        return self._collection
+
+    def _check_metric(self, collection):
+        """
+        get_or_create_collection keeps an existing collection's distance metric: an empty
+        one is recreated with cosine, a filled one is kept with a warning
+        """
+        space = (collection.metadata or {}).get("hnsw:space", "l2")
+        if space == "cosine":
+            return collection
+        if collection.count() == 0:
+            self._client.delete_collection(self.collection_name)
+            return self._client.create_collection(self.collection_name, metadata={"hnsw:space": "cosine"})
+        print(f"\n⚠️  Warning: ChromaDB collection '{self.collection_name}' uses {space} distance, not cosine: "
+              f"retrieval similarities are wrong. Delete the collection (or {self.path}) and run "
+              f"backend/scripts/index_job_vectors.py to rebuild it.\n")
+        return collection
+
+    def _batch_size(self) -> int:
+        get_max = getattr(self._client, "get_max_batch_size", None)
+        return min(self.write_batch_size, get_max()) if get_max else self.write_batch_size
+
+    def _flush(self):
+        """Write every queued row; caller holds _write_lock"""
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        collection = self.collection()
+        ids = list(pending)
+        batch_size = self._batch_size()
+        for start in range(0, len(ids), batch_size):
+            chunk = ids[start:start + batch_size]
+            try:
+                collection.upsert(
+                    ids=chunk,
+                    documents=[pending[doc_id][0] for doc_id in chunk],
+                    metadatas=[pending[doc_id][1] for doc_id in chunk],
+                    embeddings=[pending[doc_id][2] for doc_id in chunk],
+                )
+            except Exception:
+                # Requeue what wasn't written (unless a newer version is queued) so the
+                # next writer retries it instead of dropping another caller's rows
+                with self._pending_lock:
+                    for doc_id in ids[start:]:
+                        self._pending.setdefault(doc_id, pending[doc_id])
+                raise
+
+    def upsert(self, ids: List[str], texts: List[str], metadatas: List[Dict], embeddings: List[List[float]]):
+        """Add or replace documents; returns once they are written"""
+        with self._pending_lock:
+            for row in zip(ids, texts, metadatas, embeddings):
+                self._pending[row[0]] = row[1:]
+        with self._write_lock:
+            self._flush()
+
+    def delete(self, ids: List[str]):
+        with self._write_lock:
+            self._flush()
+            self.collection().delete(ids=ids)
+
+    def query(self, embedding: List[float], n_results: int, where: Optional[Dict] = None) -> Dict:
+        if where:
+            return self.collection().query(query_embeddings=[embedding], n_results=n_results, where=where)
+        return self.collection().query(query_embeddings=[embedding], n_results=n_results)
+
+    def count(self) -> int:
+        return self.collection().count()
+
+
+chroma_store = ChromaStore(settings.CHROMA_DIR, settings.CHROMA_COLLECTION, settings.CHROMA_WRITE_BATCH_SIZE)
+
+
 def get_chroma_client():
-    if not CHROMADB_AVAILABLE:
-        raise RuntimeError("ChromaDB is not available. Install dependencies: pip install chromadb")
-    return chromadb.Client(
-        ChromaSettings(
-            persist_directory=settings.CHROMA_DIR,
-            anonymized_telemetry=False,
-        )
-    )
+    chroma_store.collection()
+    return chroma_store._client
 
 
 def get_collection():
     if not CHROMADB_AVAILABLE:
         return None
-    client = get_chroma_client()
-    return client.get_or_create_collection(settings.CHROMA_COLLECTION)
+    return chroma_store.collection()
 
 
-def add_to_chroma(doc_id: str, text: str, metadata: Dict, embedding: List[float]):
+def open_chroma():
+    """Open the collection at startup, so the first request doesn't pay for it"""
     if not CHROMADB_AVAILABLE:
-        return  # Skip if chromadb not available
+        return
+    try:
+        print(f"✅ ChromaDB collection '{settings.CHROMA_COLLECTION}' ready ({chroma_store.count()} vectors)")
+    except Exception as e:
+        print(f"\n⚠️  Warning: Could not open ChromaDB at {settings.CHROMA_DIR}: {e}\n")
+
+
+def add_to_chroma(doc_id: str, text: str, metadata: Dict, embedding: List[float]):
+    upsert_to_chroma([doc_id], [text], [metadata], [embedding])
+
+
+def upsert_to_chroma(ids: List[str], texts: List[str], metadatas: List[Dict], embeddings: List[List[float]]):
+    """Add or replace many documents (batched)"""
+    if not CHROMADB_AVAILABLE or not ids:
+        return
     try:
-        collection = get_collection()
-        if collection:
-            collection.add(
-                ids=[doc_id],
-                documents=[text],
-                metadatas=[metadata],
-                embeddings=[embedding],
-            )
+        chroma_store.upsert(ids, texts, metadatas, embeddings)
     except Exception as e:
-        print(f"Warning: Could not add to ChromaDB: {e}")
+        print(f"Warning: Could not upsert to ChromaDB: {e}")
 
 
-def search_chroma(query_embedding: List[float], n_results: int = 5) -> Optional[Dict]:
+def delete_from_chroma(ids: List[str]):
+    if not CHROMADB_AVAILABLE or not ids:
+        return
+    try:
+        chroma_store.delete(ids)
+    except Exception as e:
+        print(f"Warning: Could not delete from ChromaDB: {e}")
+
+
+def search_chroma(query_embedding: List[float], n_results: int = 5, where: Optional[Dict] = None) -> Optional[Dict]:
     if not CHROMADB_AVAILABLE:
         return None  # Return None if chromadb not available
     try:
-        collection = get_collection()
-        if collection:
-            results = collection.query(query_embeddings=[query_embedding], n_results=n_results)
-            return results
+        return chroma_store.query(query_embedding, n_results, where)
     except Exception as e:
         print(f"Warning: Could not search ChromaDB: {e}")
     return None
-
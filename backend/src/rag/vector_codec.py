@@ -0,0 +1,77 @@
+"""
+Binary vector codec
+Embeddings are stored as a 12-byte header followed by the raw little-endian values:
+- float32: 4 bytes per dimension, exact
+- float16: 2 bytes per dimension
+- int8:    1 byte per dimension, symmetric quantisation with a float32 scale
+
+vector_view() returns a zero-copy NumPy view over the stored bytes. Legacy JSON lists
+(embedding_to_json) still decode, so old blobs can be read until they're migrated.
+"""
+import json
+import struct
+from typing import List, Sequence, Tuple, Union
+
+import numpy as np
+
+MAGIC = b"EV"
+# magic, format code, (pad), dimensions, scale
+HEADER = struct.Struct("<2sBxIf")
+
+FORMATS = {
+    "float32": (0, np.dtype("<f4")),
+    "float16": (1, np.dtype("<f2")),
+    "int8": (2, np.dtype("i1")),
+}
+_FORMAT_BY_CODE = {code: (name, dtype) for name, (code, dtype) in FORMATS.items()}
+
+
+def is_encoded(blob: Union[bytes, memoryview]) -> bool:
+    return len(blob) >= HEADER.size and bytes(blob[:2]) == MAGIC
+
+
+def encode_vector(vector: Union[Sequence[float], np.ndarray], fmt: str = "float32") -> bytes:
+    """Header + packed values for one vector"""
+    if fmt not in FORMATS:
+        raise ValueError(f"Unknown vector format: {fmt}")
+    code, dtype = FORMATS[fmt]
+    values = np.asarray(vector, dtype=np.float32).ravel()
+    scale = 1.0
+    if fmt == "int8":
+        peak = float(np.abs(values).max()) if values.size else 0.0
+        scale = peak / 127.0 if peak else 1.0
+        values = np.clip(np.rint(values / scale), -127, 127)
+    return HEADER.pack(MAGIC, code, values.size, scale) + values.astype(dtype).tobytes()
+
+
+def vector_view(blob: Union[bytes, memoryview]) -> Tuple[np.ndarray, float]:
+    """(values, scale) without copying: values is a read-only view over blob in its stored dtype"""
+    magic, code, dimensions, scale = HEADER.unpack_from(blob)
+    if magic != MAGIC or code not in _FORMAT_BY_CODE:
+        raise ValueError("Not an encoded vector")
+    dtype = _FORMAT_BY_CODE[code][1]
+    return np.frombuffer(blob, dtype=dtype, count=dimensions, offset=HEADER.size), scale
+
+
+def vector_format(blob: Union[bytes, memoryview]) -> str:
+    return _FORMAT_BY_CODE[HEADER.unpack_from(blob)[1]][0]
+
+
+def decode_vector(blob: Union[bytes, memoryview, str]) -> np.ndarray:
+    """
+    float32 array for a stored vector. Zero-copy for float32 blobs; float16 and int8
+    are widened (and int8 rescaled). Legacy JSON text is parsed.
+    """
+    if isinstance(blob, str) or not is_encoded(blob):
+        return np.asarray(json.loads(blob), dtype=np.float32)
+    values, scale = vector_view(blob)
+    if values.dtype == np.float32:
+        return values
+    values = values.astype(np.float32)
+    if scale != 1.0:
+        values *= scale
+    return values
+
+
+def decode_list(blob: Union[bytes, memoryview, str]) -> List[float]:
+    return decode_vector(blob).tolist()
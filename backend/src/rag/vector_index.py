@@ -0,0 +1,329 @@
+"""
+Job vector indexes
+VectorIndex is what chat retrieval talks to; VECTOR_INDEX picks the implementation:
+- numpy:  in-process brute-force cosine search over a memory-mapped float32 matrix
+          (fast to start, no extra service; fine well past our catalogue size)
+- chroma: the persistent Chroma collection in rag/retriever.py
+
+Both return (job_id, cosine similarity) pairs, best first, and can filter on the
+metadata stored with each vector (e.g. remote_type, employment_type, company_id).
+"""
+import os
+import json
+import sqlite3
+import threading
+from contextlib import contextmanager, nullcontext
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: no cross-process lock, so run a single writer process
+    fcntl = None
+
+from backend.src.config import settings
+from backend.src.rag import retriever
+
+
+class VectorIndex:
+    """Base class for job vector indexes"""
+    name = "base"
+
+    def available(self) -> bool:
+        return True
+
+    def open(self):
+        """Load / connect at startup"""
+
+    def close(self):
+        """Flush at shutdown"""
+
+    def upsert(self, ids: List[int], vectors: Sequence[Sequence[float]], metadatas: List[Dict],
+               texts: Optional[List[str]] = None):
+        raise NotImplementedError
+
+    def delete(self, ids: List[int]):
+        raise NotImplementedError
+
+    def search(self, vector: Sequence[float], top_k: int, filters: Optional[Dict] = None) -> List[Tuple[int, float]]:
+        raise NotImplementedError
+
+    def count(self) -> int:
+        raise NotImplementedError
+
+
+class ChromaVectorIndex(VectorIndex):
+    name = "chroma"
+
+    def available(self) -> bool:
+        return retriever.CHROMADB_AVAILABLE
+
+    def open(self):
+        retriever.open_chroma()
+
+    def upsert(self, ids, vectors, metadatas, texts=None):
+        vectors = [np.asarray(vector, dtype=np.float32).tolist() for vector in vectors]
+        retriever.upsert_to_chroma([str(job_id) for job_id in ids], texts or [""] * len(ids), metadatas, vectors)
+
+    def delete(self, ids):
+        retriever.delete_from_chroma([str(job_id) for job_id in ids])
+
+    def search(self, vector, top_k, filters=None):
+        where = None
+        if filters:
+            clauses = [{field: value} for field, value in filters.items()]
+            where = clauses[0] if len(clauses) == 1 else {"$and": clauses}
+        results = retriever.search_chroma(np.asarray(vector, dtype=np.float32).tolist(), top_k, where=where)
+        if not results or not results.get("ids") or not results["ids"][0]:
+            return []
+        distances = (results.get("distances") or [[]])[0] or [1.0] * len(results["ids"][0])
+        return [(int(doc_id), 1.0 - float(distance)) for doc_id, distance in zip(results["ids"][0], distances)]
+
+    def count(self):
+        return retriever.chroma_store.count() if self.available() else 0
+
+
+class NumpyVectorIndex(VectorIndex):
+    """
+    Unit-normalised float32 rows in a memory-mapped file (matrix.f32), with job ids,
+    row numbers and metadata in a small SQLite table next to it.
+
+    Rows stay dense: a delete moves the last row into the freed slot. Search is one
+    batched matrix-vector product per block of rows plus argpartition for the top k.
+
+    Every uvicorn worker and scripts/index_job_vectors.py share the files: writes hold
+    an exclusive flock on index.lock and searches a shared one, and each process
+    reloads its row map whenever SQLite reports another connection's commit. Each
+    thread locks through its own handle, so the flock also keeps writer threads out of
+    a scan in the same process; the process lock is only held to reload and to take a
+    snapshot of the row map, never for the matrix scan.
+    """
+    name = "numpy"
+    BLOCK_ROWS = 65536
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        self._lock = threading.RLock()
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock_files = threading.local()
+        self._lock_handles: list = []
+        self._data_version = None
+        self._matrix: Optional[np.memmap] = None
+        self.dimensions = 0
+        self._size = 0
+        self._ids = np.empty(0, dtype=np.int64)
+        self._rows: Dict[int, int] = {}
+        self._metadata: List[Dict] = []
+        self._columns: Dict[str, np.ndarray] = {}
+
+    @property
+    def _matrix_path(self) -> str:
+        return os.path.join(self.directory, "matrix.f32")
+
+    def open(self):
+        with self._lock:
+            if self._db is not None:
+                return
+            os.makedirs(self.directory, exist_ok=True)
+            db = sqlite3.connect(os.path.join(self.directory, "index.sqlite3"), check_same_thread=False)
+            db.execute("CREATE TABLE IF NOT EXISTS info (key TEXT PRIMARY KEY, value TEXT NOT NULL)")
+            db.execute("CREATE TABLE IF NOT EXISTS vectors (job_id INTEGER PRIMARY KEY, row INTEGER NOT NULL, metadata TEXT NOT NULL)")
+            db.commit()
+            self._db = db
+            with self._file_lock(shared=True):
+                self._load()
+        print(f"✅ Vector index loaded ({self._size} vectors, {self.dimensions} dimensions)")
+
+    def _load(self):
+        """(Re)read the row map and metadata from SQLite and map the matrix file"""
+        self._data_version = self._db.execute("PRAGMA data_version").fetchone()[0]
+        info = dict(self._db.execute("SELECT key, value FROM info").fetchall())
+        self.dimensions = int(info.get("dimensions", 0))
+        rows = self._db.execute("SELECT job_id, row, metadata FROM vectors ORDER BY row").fetchall()
+        self._size = len(rows)
+        self._ids = np.array([job_id for job_id, _, _ in rows], dtype=np.int64)
+        self._rows = {job_id: row for job_id, row, _ in rows}
+        self._metadata = [json.loads(metadata) for _, _, metadata in rows]
+        self._columns = {}
+        capacity = os.path.getsize(self._matrix_path) // (4 * self.dimensions) if (
+            self.dimensions and os.path.exists(self._matrix_path)) else 0
+        self._matrix = self._map(capacity) if capacity else None
+
+    def _refresh(self):
+        """Reload if another process committed since the last load (call under the file lock)"""
+        if self._db.execute("PRAGMA data_version").fetchone()[0] != self._data_version:
+            self._load()
+
+    def _lock_handle(self):
+        """This thread's handle on index.lock (flocks belong to the open file, not the process)"""
+        handle = getattr(self._lock_files, "handle", None)
+        if handle is None or handle.closed:
+            handle = self._lock_files.handle = open(os.path.join(self.directory, "index.lock"), "a")
+            with self._lock:
+                self._lock_handles.append(handle)
+        return handle
+
+    @contextmanager
+    def _file_lock(self, shared: bool):
+        """flock on index.lock; take it before self._lock, never while holding it"""
+        if fcntl is None:
+            yield
+            return
+        handle = self._lock_handle()
+        fcntl.flock(handle, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(handle, fcntl.LOCK_UN)
+
+    def close(self):
+        with self._lock:
+            if self._matrix is not None:
+                self._matrix.flush()
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+            for handle in self._lock_handles:
+                handle.close()
+            self._lock_handles = []
+
+    def _map(self, capacity: int) -> np.memmap:
+        mode = "r+" if os.path.exists(self._matrix_path) else "w+"
+        return np.memmap(self._matrix_path, dtype=np.float32, mode=mode, shape=(capacity, self.dimensions))
+
+    def _ensure_capacity(self, rows: int):
+        capacity = self._matrix.shape[0] if self._matrix is not None else 0
+        if rows <= capacity:
+            return
+        new_capacity = max(rows, capacity * 2, 1024)
+        if self._matrix is not None:
+            self._matrix.flush()
+        with open(self._matrix_path, "ab") as handle:
+            handle.truncate(new_capacity * self.dimensions * 4)
+        self._matrix = self._map(new_capacity)
+
+    def upsert(self, ids, vectors, metadatas, texts=None):
+        vectors = np.asarray(vectors, dtype=np.float32)
+        if vectors.ndim != 2 or len(vectors) != len(ids):
+            raise ValueError("Expected one vector per id")
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        vectors = vectors / np.where(norms == 0, 1.0, norms)
+        self.open()
+        with self._file_lock(shared=False), self._lock:
+            # Rows are allocated from the committed row map, whichever process wrote last
+            self._refresh()
+            if not self.dimensions:
+                self.dimensions = vectors.shape[1]
+                self._db.execute("INSERT OR REPLACE INTO info VALUES ('dimensions', ?)", (str(self.dimensions),))
+            elif vectors.shape[1] != self.dimensions:
+                raise ValueError(f"Vector index holds {self.dimensions}-dim vectors, got {vectors.shape[1]}")
+
+            new_ids = [job_id for job_id in dict.fromkeys(ids) if job_id not in self._rows]
+            self._ensure_capacity(self._size + len(new_ids))
+            if new_ids:
+                self._ids = np.concatenate([self._ids, np.array(new_ids, dtype=np.int64)])
+                for job_id in new_ids:
+                    self._rows[job_id] = self._size
+                    self._metadata.append({})
+                    self._size += 1
+            for job_id, vector, metadata in zip(ids, vectors, metadatas):
+                row = self._rows[job_id]
+                self._matrix[row] = vector
+                self._metadata[row] = metadata
+            self._matrix.flush()
+            with self._db:
+                self._db.executemany(
+                    "INSERT OR REPLACE INTO vectors (job_id, row, metadata) VALUES (?, ?, ?)",
+                    [(int(job_id), self._rows[job_id], json.dumps(metadata)) for job_id, metadata in zip(ids, metadatas)],
+                )
+            self._columns = {}
+
+    def delete(self, ids):
+        self.open()
+        with self._file_lock(shared=False), self._lock:
+            self._refresh()
+            for job_id in ids:
+                row = self._rows.pop(job_id, None)
+                if row is None:
+                    continue
+                last = self._size - 1
+                moved_id = None
+                if row != last:
+                    # Keep rows dense: move the last row into the freed slot
+                    moved_id = int(self._ids[last])
+                    self._matrix[row] = self._matrix[last]
+                    self._ids[row] = moved_id
+                    self._metadata[row] = self._metadata[last]
+                    self._rows[moved_id] = row
+                self._ids = self._ids[:last]
+                self._metadata.pop()
+                self._size = last
+                self._matrix.flush()
+                with self._db:
+                    self._db.execute("DELETE FROM vectors WHERE job_id = ?", (int(job_id),))
+                    if moved_id is not None:
+                        self._db.execute("UPDATE vectors SET row = ? WHERE job_id = ?", (row, moved_id))
+            self._columns = {}
+
+    def _column(self, field: str) -> np.ndarray:
+        column = self._columns.get(field)
+        if column is None:
+            column = np.array([metadata.get(field) for metadata in self._metadata], dtype=object)
+            self._columns[field] = column
+        return column
+
+    def search(self, vector, top_k, filters=None):
+        query = np.asarray(vector, dtype=np.float32)
+        norm = np.linalg.norm(query)
+        if not norm or top_k <= 0:
+            return []
+        query = query / norm
+
+        self.open()
+        # The shared flock keeps writers (a delete moves rows and their ids in place) out
+        # until the scan is done; without fcntl the process lock has to cover the scan
+        with self._file_lock(shared=True), (self._lock if fcntl is None else nullcontext()):
+            with self._lock:
+                self._refresh()
+                size, matrix, ids = self._size, self._matrix, self._ids
+                columns = [(self._column(field), value) for field, value in (filters or {}).items()]
+            if not size or matrix is None:
+                return []
+            mask = None
+            for column, value in columns:
+                matches = column == value
+                mask = matches if mask is None else mask & matches
+
+            scores = np.empty(size, dtype=np.float32)
+            for start in range(0, size, self.BLOCK_ROWS):
+                end = min(start + self.BLOCK_ROWS, size)
+                scores[start:end] = matrix[start:end] @ query
+            if mask is not None:
+                scores[~mask] = -np.inf
+
+            k = min(top_k, size)
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+            return [(int(ids[row]), float(scores[row])) for row in top if scores[row] != -np.inf]
+
+    def count(self):
+        self.open()
+        with self._file_lock(shared=True), self._lock:
+            self._refresh()
+            return self._size
+
+
+VECTOR_INDEXES = {
+    "numpy": lambda: NumpyVectorIndex(settings.VECTOR_INDEX_DIR),
+    "chroma": lambda: ChromaVectorIndex(),
+}
+
+
+def get_vector_index(name: Optional[str] = None) -> VectorIndex:
+    """Build the vector index configured by VECTOR_INDEX (defaults to numpy)"""
+    factory = VECTOR_INDEXES.get((name or settings.VECTOR_INDEX).lower(), VECTOR_INDEXES["numpy"])
+    return factory()
+
+
+vector_index = get_vector_index()
@@ -17,6 +17,7 @@ from backend.src.utils.security import (
     sanitize_input, validate_integer_id, validate_string_length,
     check_rate_limit
 )
+from backend.src.utils.pagination import keyset_page, count_cache
 
 router = APIRouter(prefix="/applications", tags=["applications"])
 
@@ -26,7 +27,7 @@ CV_UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
 
 @router.post("/apply_manual")
-async def apply_for_job_manual(
+def apply_for_job_manual(
     request: Request,
     job_id: int = Form(...),
     user_id: int = Form(...),
@@ -107,7 +108,7 @@ async def apply_for_job_manual(
 
 
 @router.post("/apply")
-async def apply_for_job(
+def apply_for_job(
     request: Request,
     job_id: int = Form(...),
     user_id: int = Form(...),
@@ -261,23 +262,25 @@ def get_job_applications(
 def get_pending_applications(
     limit: Optional[int] = 100,
     offset: Optional[int] = 0,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     db: Session = Depends(get_db),
 ):
-    """Get all pending applications (admin queue) - optimized with eager loading"""
+    """
+    Get all pending applications (admin queue) - optimized with eager loading
+    Keyset-paginated, oldest first: pass next_cursor back as cursor for the next page
+    """
     try:
+        pending = db.query(models.JobApplication).filter(models.JobApplication.status == "pending")
         # Use eager loading to prevent N+1 queries
-        applications = db.query(models.JobApplication)\
-            .options(
+        applications, next_cursor = keyset_page(
+            pending.options(
                 joinedload(models.JobApplication.job),
                 joinedload(models.JobApplication.user)
-            )\
-            .filter(
-                models.JobApplication.status == "pending"
-            )\
-            .order_by(models.JobApplication.applied_at.asc())\
-            .offset(offset)\
-            .limit(limit)\
-            .all()  # Oldest first (queue)
+            ),
+            [models.JobApplication.applied_at, models.JobApplication.id],
+            limit, cursor, offset=offset,
+        )  # Oldest first (queue)
         
         results = []
         for app in applications:
@@ -294,7 +297,12 @@ def get_pending_applications(
                 "applied_at": app.applied_at.isoformat() if app.applied_at else None,
             })
         
-        return {"applications": results, "count": len(results)}
+        page = {"applications": results, "count": len(results), "next_cursor": next_cursor}
+        if include_total:
+            page["total"] = count_cache.count(("job_applications", "pending"), pending)
+        return page
+    except HTTPException:
+        raise
     except Exception as e:
         # Return empty list if error (e.g., table doesn't exist yet)
         return {"applications": [], "count": 0, "error": str(e)}
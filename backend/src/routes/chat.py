@@ -1,29 +1,56 @@
-from typing import Optional
-from fastapi import APIRouter, Depends, HTTPException, Request, Query, UploadFile, File
+import json
+import time
+import asyncio
+from typing import Dict, Optional, List, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Request, Response, Query, UploadFile, File
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session, joinedload, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+import anyio
+from starlette.concurrency import iterate_in_threadpool, run_in_threadpool
 
-from backend.src.db.database import get_db
+from backend.src.db.database import get_async_db, get_async_sessionmaker
 from backend.src.db import models
-from backend.src.rag.rag_chat import chat_with_rag
+from backend.src.rag.rag_chat import chat_with_rag, stream_chat_with_rag
+from backend.src.rag.clients import provider_clients
+from backend.src.utils.hybrid_search import hybrid_candidates
 from backend.src.utils.security import (
     sanitize_input, validate_string_length, validate_integer_id,
     check_rate_limit
 )
 from backend.src.utils.search_intelligence import filter_jobs_for_chat
+from backend.src.utils.job_documents import job_document_cache, document_to_chat_context
+from backend.src.utils.metrics import metrics
 from backend.src.config import settings
-from groq import Groq
 
 
 router = APIRouter(prefix="/chat", tags=["chat"])
 
+chat_time_to_first_token = metrics.histogram(
+    "chat_time_to_first_token_seconds",
+    "Time from a /chat/stream request to its first streamed token",
+)
+chat_stream_duration = metrics.histogram(
+    "chat_stream_duration_seconds",
+    "Time from a /chat/stream request to the end of its response",
+)
+# Chat pipeline stages (also sent per request in the Server-Timing header)
+CHAT_STAGES = {
+    "retrieval": "hybrid job retrieval",
+    "jobs": "loading the retrieved jobs",
+    "profile": "loading the user profile",
+    "applications": "loading the user's recent applications",
+    "context": "all context stages (run concurrently)",
+    "llm": "generating the answer (/chat/ only)",
+}
+chat_stage_seconds = {
+    stage: metrics.histogram(f"chat_stage_{stage}_seconds", f"Chat pipeline stage: {description}")
+    for stage, description in CHAT_STAGES.items()
+}
 
-@router.post("/")
-def chat(
-    request: Request,
-    user_id: Optional[int] = Query(None),
-    message: Optional[str] = Query(None),
-    db: Session = Depends(get_db),
-):
+
+def validate_chat_request(request: Request, message: Optional[str], user_id: Optional[int]) -> str:
+    """Rate limit and validate a chat request; returns the sanitized message"""
     # Security: Rate limiting
     client_ip = request.client.host if request.client else "unknown"
     if not check_rate_limit(f"chat_{client_ip}", max_requests=20, window_seconds=60):
@@ -39,122 +66,232 @@ def chat(
     
     if user_id and not validate_integer_id(user_id):
         raise HTTPException(status_code=400, detail="Invalid user ID")
-    
-    # Get user profile and applications with eager loading
-    user_profile = None
-    user_applications = []
+    return message
+
+
+def load_user_profile(db: Session, user_id: Optional[int]) -> Optional[dict]:
+    """User disabilities, skills and preferences (sync, for run_sync)"""
+    if not user_id:
+        return None
     try:
-        if user_id:
-            user = db.query(models.User)\
-                .options(
-                    selectinload(models.User.disabilities),
-                    selectinload(models.User.skills)
-                )\
-                .filter(models.User.id == user_id).first()
-            if user:
-                # Get user's disabilities
-                user_disabilities = [d.name for d in user.disabilities] if user.disabilities else []
-                
-                # Get user's applications with eager loading
-                try:
-                    applications = db.query(models.JobApplication)\
-                        .options(
-                            joinedload(models.JobApplication.job)
-                        )\
-                        .filter(
-                            models.JobApplication.user_id == user_id
-                        )\
-                        .order_by(models.JobApplication.applied_at.desc())\
-                        .limit(10)\
-                        .all()
-                except Exception as e:
-                    print(f"Error loading applications: {e}")
-                    applications = []
-                
-                applied_job_ids = [app.job_id for app in applications]
-                applied_jobs_info = []
-                for app in applications:
-                    try:
-                        if app.job:
-                            applied_jobs_info.append({
-                                "job_id": app.job_id,
-                                "job_title": app.job.title,
-                                "status": app.status,
-                                "applied_at": app.applied_at.isoformat() if app.applied_at else None,
-                            })
-                    except Exception as e:
-                        print(f"Error processing application {app.id}: {e}")
-                        continue
-                
-                user_profile = {
-                    "disabilities": user_disabilities,
-                    "skills": [s.name for s in user.skills] if user.skills else [],
-                    "location": user.location,
-                    "preferred_job_type": user.preferred_job_type,
-                    "applied_jobs": applied_jobs_info,
-                    "applied_job_ids": applied_job_ids,
-                }
+        user = db.query(models.User)\
+            .options(
+                selectinload(models.User.disabilities),
+                selectinload(models.User.skills)
+            )\
+            .filter(models.User.id == user_id).first()
+        if not user:
+            return None
+        return {
+            "disabilities": [d.name for d in user.disabilities] if user.disabilities else [],
+            "skills": [s.name for s in user.skills] if user.skills else [],
+            "location": user.location,
+            "preferred_job_type": user.preferred_job_type,
+        }
     except Exception as e:
         print(f"Error loading user profile: {e}")
-        user_profile = None
-    
-    # Get ALL jobs with eager loading to prevent N+1 queries
+        return None
+
+
+def load_user_applications(db: Session, user_id: Optional[int]) -> Tuple[List[int], List[dict]]:
+    """Job ids and summaries of the user's 10 most recent applications (sync, for run_sync)"""
+    if not user_id:
+        return [], []
     try:
-        all_jobs = db.query(models.Job)\
+        applications = db.query(models.JobApplication)\
             .options(
-                joinedload(models.Job.company),
-                joinedload(models.Job.location),
-                selectinload(models.Job.requirements),
-                selectinload(models.Job.disabilities)
+                joinedload(models.JobApplication.job)
+            )\
+            .filter(
+                models.JobApplication.user_id == user_id
             )\
-            .limit(50)\
+            .order_by(models.JobApplication.applied_at.desc())\
+            .limit(10)\
             .all()
     except Exception as e:
-        print(f"Error loading jobs: {e}")
-        all_jobs = []
+        print(f"Error loading applications: {e}")
+        return [], []
     
-    jobs_data = []
-    for job in all_jobs:
+    applied_job_ids = [app.job_id for app in applications]
+    applied_jobs_info = []
+    for app in applications:
         try:
-            requirements = [req.requirement for req in job.requirements] if job.requirements else []
-            disability_support = [d.name for d in job.disabilities] if job.disabilities else []
-            
-            # Check if user has applied to this job
-            has_applied = user_profile and job.id in user_profile.get("applied_job_ids", [])
-            
-            # Safely access location fields
-            location_str = "Remote"
-            if job.location:
-                city = job.location.city or ""
-                country = job.location.country or ""
-                if city or country:
-                    location_str = f"{city}, {country}".strip(", ")
-            
-            jobs_data.append({
-                "id": job.id,
-                "title": job.title or "Untitled",
-                "description": job.description or "",
-                "company": job.company.name if job.company else "Unknown",
-                "location": location_str,
-                "employment_type": job.employment_type or "full-time",
-                "remote_type": job.remote_type or "remote",
-                "requirements": requirements,
-                "disability_support": disability_support,
-                "has_applied": has_applied,
-            })
+            if app.job:
+                applied_jobs_info.append({
+                    "job_id": app.job_id,
+                    "job_title": app.job.title,
+                    "status": app.status,
+                    "applied_at": app.applied_at.isoformat() if app.applied_at else None,
+                })
         except Exception as e:
-            print(f"Error processing job {job.id if job else 'unknown'}: {e}")
+            print(f"Error processing application {app.id}: {e}")
             continue
+    return applied_job_ids, applied_jobs_info
+
+
+def load_chat_jobs(db: Session, job_ids: Optional[List[int]] = None) -> List[dict]:
+    """
+    Job documents for the chatbot: the retrieved jobs, or the first 50 jobs without
+    job_ids. Served from the job document cache (only uncached jobs touch the ORM)
+    """
+    try:
+        if job_ids is None:
+            job_ids = [job_id for (job_id,) in db.query(models.Job.id).limit(50).all()]
+        return job_document_cache.load(db, job_ids)
+    except Exception as e:
+        print(f"Error loading jobs: {e}")
+        return []
+
+
+async def _timed(timings: Dict[str, float], stage: str, awaitable):
+    started = time.perf_counter()
+    try:
+        return await awaitable
+    finally:
+        timings[stage] = time.perf_counter() - started
+        chat_stage_seconds[stage].observe(timings[stage])
+
+
+def server_timing(timings: Dict[str, float]) -> str:
+    """Server-Timing header value (milliseconds per stage)"""
+    return ", ".join(f"{stage};dur={seconds * 1000:.1f}" for stage, seconds in timings.items())
+
+
+async def select_chat_jobs(
+    db: AsyncSession,
+    sessions: async_sessionmaker,
+    message: str,
+    user_id: Optional[int],
+    timings: Dict[str, float],
+) -> Tuple[Optional[dict], List[dict]]:
+    """
+    Load the chatbot's context in concurrent stages:
+    - retrieval, then jobs: keyword + vector candidates for the message (hybrid search),
+      then only those jobs (request session); with CHAT_RETRIEVAL=scan, the first 50 jobs
+    - profile and applications: the user's profile and recent applications (one session each)
+    The database time is the slowest chain instead of the sum of every query.
+    The jobs are then reranked by disability/skill match in the threadpool.
+    """
+    async def retrieve_jobs():
+        scores = None
+        if settings.CHAT_RETRIEVAL != "scan":
+            scores = await _timed(timings, "retrieval", hybrid_candidates(
+                db, message, settings.CHAT_RETRIEVAL_TOP_K, vector=settings.CHAT_RETRIEVAL == "vector"
+            ))
+        # No candidates (scan, or hybrid search off): the first 50 jobs, keyword filtered
+        scores = dict(list(scores.items())[:settings.CHAT_RETRIEVAL_TOP_K]) if scores else None
+        job_ids = list(scores) if scores is not None else None
+        documents = await _timed(timings, "jobs", db.run_sync(load_chat_jobs, job_ids))
+        return scores, documents
+
+    async def load_for_user(load, default):
+        if not user_id:
+            return default
+        async with sessions() as session:
+            return await session.run_sync(load, user_id)
+
+    (scores, documents), user_profile, (applied_job_ids, applied_jobs_info) = await _timed(
+        timings, "context", asyncio.gather(
+            retrieve_jobs(),
+            _timed(timings, "profile", load_for_user(load_user_profile, None)),
+            _timed(timings, "applications", load_for_user(load_user_applications, ([], []))),
+        )
+    )
+    if user_profile is not None:
+        user_profile["applied_jobs"] = applied_jobs_info
+        user_profile["applied_job_ids"] = applied_job_ids
     
-    # Intelligently filter jobs based on user message and profile
-    # Prioritize jobs that match user's disabilities
-    relevant_jobs = filter_jobs_for_chat(jobs_data, message, user_profile)
+    def rerank() -> List[dict]:
+        jobs_data = [document_to_chat_context(document, applied_job_ids) for document in documents]
+        # Intelligently filter jobs based on user message and profile
+        # Prioritize jobs that match user's disabilities
+        return filter_jobs_for_chat(jobs_data, message, user_profile, scores)
     
-    # Use filtered jobs for chatbot
-    answer = chat_with_rag(message, user_profile, relevant_jobs)
+    # CPU only: off the event loop, like the search ranking
+    return user_profile, await run_in_threadpool(rerank)
+
+
+@router.post("/")
+async def chat(
+    request: Request,
+    response: Response,
+    user_id: Optional[int] = Query(None),
+    message: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_db),
+    sessions: async_sessionmaker = Depends(get_async_sessionmaker),
+):
+    message = validate_chat_request(request, message, user_id)
+    timings: Dict[str, float] = {}
+    user_profile, relevant_jobs = await select_chat_jobs(db, sessions, message, user_id, timings)
+    
+    # Use filtered jobs for chatbot (the Groq call blocks, so it runs in the threadpool)
+    answer = await _timed(timings, "llm", run_in_threadpool(chat_with_rag, message, user_profile, relevant_jobs))
+    response.headers["Server-Timing"] = server_timing(timings)
     return {"answer": answer}
 
 
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post("/stream")
+async def chat_stream(
+    request: Request,
+    user_id: Optional[int] = Query(None),
+    message: Optional[str] = Query(None),
+    db: AsyncSession = Depends(get_async_db),
+    sessions: async_sessionmaker = Depends(get_async_sessionmaker),
+):
+    """
+    Same as /chat/ but streams the answer as Server-Sent Events while Groq generates it:
+    "token" events ({"text": ...}) as text arrives, then a final "done" event
+    """
+    started = time.perf_counter()
+    message = validate_chat_request(request, message, user_id)
+    timings: Dict[str, float] = {}
+    user_profile, relevant_jobs = await select_chat_jobs(db, sessions, message, user_id, timings)
+    
+    async def events():
+        # The Groq stream is a sync generator: each chunk is read in the threadpool
+        tokens = stream_chat_with_rag(message, user_profile, relevant_jobs)
+        try:
+            first_token = True
+            async for text in iterate_in_threadpool(tokens):
+                if first_token:
+                    chat_time_to_first_token.observe(time.perf_counter() - started)
+                    first_token = False
+                yield _sse("token", {"text": text})
+            chat_stream_duration.observe(time.perf_counter() - started)
+            yield _sse("done", {})
+        finally:
+            # A client disconnect cancels this generator: close the Groq stream (and free
+            # its provider slot) now rather than whenever the suspended generator is collected
+            with anyio.CancelScope(shield=True):
+                await run_in_threadpool(tokens.close)
+    
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={
+            "Cache-Control": "no-cache",
+            "X-Accel-Buffering": "no",
+            # Context stages only: the answer is still being generated
+            "Server-Timing": server_timing(timings),
+        },
+    )
+
+
+def transcribe_audio(filename: str, contents: bytes):
+    """Blocking Whisper call on the shared Groq client (run it in the threadpool)"""
+    with provider_clients.slot():
+        return provider_clients.chat().audio.transcriptions.create(
+            file=(filename, contents),
+            model="whisper-large-v3-turbo",
+            temperature=0,
+            response_format="verbose_json",
+        )
+
+
 @router.post("/speech-to-text")
 async def speech_to_text(
     request: Request,
@@ -172,7 +309,7 @@ async def speech_to_text(
             detail="Too many speech requests. Please wait a moment and try again."
         )
 
-    if not settings.GROQ_API_KEY:
+    if not provider_clients.chat_configured():
         raise HTTPException(status_code=500, detail="GROQ_API_KEY is not configured on the server.")
 
     # Basic content-type check (optional but helpful)
@@ -184,13 +321,7 @@ async def speech_to_text(
         if not contents:
             raise HTTPException(status_code=400, detail="Uploaded audio file is empty.")
 
-        client = Groq(api_key=settings.GROQ_API_KEY)
-        transcription = client.audio.transcriptions.create(
-            file=(file.filename or "audio.webm", contents),
-            model="whisper-large-v3-turbo",
-            temperature=0,
-            response_format="verbose_json",
-        )
+        transcription = await run_in_threadpool(transcribe_audio, file.filename or "audio.webm", contents)
 
         # Groq Whisper returns an object with a .text attribute in verbose_json mode
         text = None
@@ -2,11 +2,16 @@
 Company routes for managing companies
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request, Response
 from sqlalchemy.orm import Session
 
 from backend.src.db.database import get_db
 from backend.src.db import models
+from backend.src.rag.job_vectors import index_jobs_task
+from backend.src.rag.response_cache import response_cache
+from backend.src.utils.job_documents import job_document_cache
+from backend.src.utils.pagination import keyset_page, count_cache
+from backend.src.utils.search_index import job_index
 from backend.src.utils.security import (
     sanitize_input, validate_string_length, validate_integer_id,
     check_rate_limit
@@ -17,15 +22,25 @@ router = APIRouter(prefix="/companies", tags=["companies"])
 
 @router.get("/")
 def get_all_companies(
+    response: Response,
     limit: Optional[int] = 100,
     offset: Optional[int] = 0,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     db: Session = Depends(get_db),
 ):
-    """Get all companies with pagination (optimized for dashboard)"""
-    companies = db.query(models.Company)\
-        .offset(offset)\
-        .limit(limit)\
-        .all()
+    """
+    Get all companies with keyset pagination on id (optimized for dashboard)
+    The next page's cursor is sent in the X-Next-Cursor header (absent on the last page);
+    include_total adds X-Total-Count
+    """
+    companies, next_cursor = keyset_page(
+        db.query(models.Company), [models.Company.id], limit, cursor, offset=offset
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if include_total:
+        response.headers["X-Total-Count"] = str(count_cache.count(("companies",), db.query(models.Company)))
     
     return [
         {
@@ -112,6 +127,7 @@ def add_company(
 def update_company(
     company_id: int,
     request: Request,
+    background_tasks: BackgroundTasks,
     name: Optional[str] = None,
     description: Optional[str] = None,
     website: Optional[str] = None,
@@ -123,10 +139,12 @@ def update_company(
     if not company:
         raise HTTPException(status_code=404, detail="Company not found")
     
+    renamed = False
     if name:
         name = sanitize_input(name, max_length=255)
         if not validate_string_length(name, max_length=255, min_length=1):
             raise HTTPException(status_code=400, detail="Invalid company name")
+        renamed = name != company.name
         company.name = name
     
     if description is not None:
@@ -143,6 +161,14 @@ def update_company(
     
     db.commit()
     db.refresh(company)
+    # Job documents (and the search index tokens and job embeddings) embed the company name
+    job_document_cache.invalidate_company(company.id)
+    if renamed:
+        job_index.reindex_jobs(db, models.Job.company_id == company.id)
+        job_ids = [job_id for (job_id,) in db.query(models.Job.id).filter(models.Job.company_id == company.id)]
+        if job_ids:
+            background_tasks.add_task(index_jobs_task, job_ids)
+    response_cache.clear()
     
     return {
         "id": company.id,
@@ -162,5 +188,7 @@ def delete_company(company_id: int, db: Session = Depends(get_db)):
     
     db.delete(company)
     db.commit()
+    job_document_cache.invalidate_company(company_id)
+    response_cache.clear()
     return {"message": "Company deleted successfully"}
 
@@ -2,7 +2,7 @@
 Disability management routes
 """
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 
 from backend.src.db.database import get_db
@@ -11,6 +11,11 @@ from backend.src.utils.security import (
     sanitize_input, validate_string_length, validate_integer_id,
     check_rate_limit
 )
+from backend.src.utils.fuzzy_index import fuzzy_index
+from backend.src.utils.search_index import job_index, tokenize
+from backend.src.rag.job_vectors import index_jobs_task
+from backend.src.rag.response_cache import response_cache
+from backend.src.utils.job_documents import job_document_cache
 
 router = APIRouter(prefix="/disabilities", tags=["disabilities"])
 
@@ -111,6 +116,7 @@ def add_disability(
     db.add(disability)
     db.commit()
     db.refresh(disability)
+    fuzzy_index.add_terms(tokenize(disability.name))
     
     return {
         "id": disability.id,
@@ -127,6 +133,7 @@ def add_disability(
 def update_disability(
     disability_id: int,
     request: Request,
+    background_tasks: BackgroundTasks,
     name: Optional[str] = None,
     description: Optional[str] = None,
     category: Optional[str] = None,
@@ -140,6 +147,7 @@ def update_disability(
         raise HTTPException(status_code=404, detail="Disability not found")
     
     # Security: Input validation
+    previous_name = disability.name
     if name is not None:
         name = sanitize_input(name, max_length=255)
         if not validate_string_length(name, max_length=255, min_length=1):
@@ -152,7 +160,6 @@ def update_disability(
         ).first()
         if existing:
             raise HTTPException(status_code=400, detail="Disability name already exists")
-        
         disability.name = name
     
     if description is not None:
@@ -175,6 +182,20 @@ def update_disability(
     
     db.commit()
     db.refresh(disability)
+    # Job documents (and the search index tokens and job embeddings) embed supported
+    # disability names
+    job_document_cache.invalidate_disability(disability.id)
+    if disability.name != previous_name:
+        # Keep the search vocabulary in step with the renamed disability
+        for token in tokenize(previous_name):
+            fuzzy_index.remove(token)
+        fuzzy_index.add_terms(tokenize(disability.name))
+        supported = models.Job.disabilities.any(models.Disability.id == disability.id)
+        job_index.reindex_jobs(db, supported)
+        job_ids = [job_id for (job_id,) in db.query(models.Job.id).filter(supported)]
+        if job_ids:
+            background_tasks.add_task(index_jobs_task, job_ids)
+    response_cache.clear()
     
     return {
         "id": disability.id,
@@ -218,6 +239,8 @@ def delete_disability(disability_id: int, db: Session = Depends(get_db)):
     
     db.delete(disability)
     db.commit()
+    for token in tokenize(disability.name):
+        fuzzy_index.remove(token)
     
     return {"message": "Disability deleted successfully"}
 
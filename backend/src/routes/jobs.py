@@ -1,15 +1,24 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Request
-from sqlalchemy.orm import Session, joinedload, selectinload
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Request
+from sqlalchemy.orm import Session, selectinload
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from backend.src.db.database import get_db
+from backend.src.db.database import get_db, get_async_db
 from backend.src.db import models
+from backend.src.config import settings
 from backend.src.utils.security import (
     sanitize_input, validate_search_query, validate_integer_id,
     check_rate_limit, validate_string_length
 )
-from backend.src.utils.search_intelligence import intelligent_job_search
-# Embedding imports removed - using Groq only
+from starlette.concurrency import run_in_threadpool
+
+from backend.src.utils.search_intelligence import async_job_search
+from backend.src.utils.hybrid_search import hybrid_candidates, async_rank_hybrid_candidates
+from backend.src.utils.search_index import job_index
+from backend.src.rag.response_cache import response_cache
+from backend.src.utils.job_documents import job_document_cache, document_to_listing
+from backend.src.utils.pagination import keyset_page, count_cache
+from backend.src.rag.job_vectors import index_jobs_task, remove_jobs_task
 
 
 router = APIRouter(prefix="/jobs", tags=["jobs"])
@@ -18,6 +27,7 @@ router = APIRouter(prefix="/jobs", tags=["jobs"])
 @router.post("/add_job")
 def add_job(
     request: Request,
+    background_tasks: BackgroundTasks,
     title: str,
     description: str,
     employment_type: Optional[str] = "full-time",
@@ -82,16 +92,17 @@ def add_job(
         dis_objs = db.query(models.Disability).filter(models.Disability.id.in_(disabilities)).all()
         job.disabilities.extend(dis_objs)
 
-    # Skip embedding creation since we're using Groq only
-    # Embeddings are optional and can be added later if needed
-
     db.commit()
     db.refresh(job)
+    job_document_cache.invalidate(job.id)
+    job_index.index_job(job)
+    # Embed for chat retrieval after the response is sent
+    background_tasks.add_task(index_jobs_task, [job.id])
     return {"job_id": job.id, "message": "Job created and embedded"}
 
 
 @router.post("/search_jobs")
-def search_jobs(
+async def search_jobs(
     request: Request,
     user_id: Optional[int] = None,
     disability_ids: Optional[List[int]] = None,
@@ -101,7 +112,7 @@ def search_jobs(
     query: Optional[str] = None,
     employment_type: Optional[str] = None,
     remote_type: Optional[str] = None,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
 ):
     # Security: Rate limiting
     client_ip = request.client.host if request.client else "unknown"
@@ -155,106 +166,132 @@ def search_jobs(
             if not validate_integer_id(sid):
                 raise HTTPException(status_code=400, detail=f"Invalid skill ID: {sid}")
     
+    # Query searches fuse keyword and vector candidates (None when hybrid search or its
+    # vector side is off; then the keyword search alone is enough)
+    candidates = await hybrid_candidates(
+        db, query, 20, disability_ids, skill_ids, employment_type, remote_type
+    ) if query and settings.SEARCH_HYBRID_VECTOR else None
+    
     # Get user profile if user_id provided
-    user_profile = None
-    if user_id:
-        user = db.query(models.User).filter(models.User.id == user_id).first()
-        if user:
-            user_profile = {
-                "disabilities": [d.name for d in user.disabilities],
-                "skills": [s.name for s in user.skills],
-                "location": user.location,
-                "preferred_job_type": user.preferred_job_type,
-            }
+    user_profile = await db.run_sync(load_search_profile, user_id) if user_id else None
     
-    # Use intelligent search
-    results = intelligent_job_search(
-        db=db,
-        query=query,
-        disability_ids=disability_ids,
-        skill_ids=skill_ids,
-        employment_type=employment_type,
-        remote_type=remote_type,
-        user_profile=user_profile,
-        limit=20
-    )
+    if candidates is not None:
+        # Rows are loaded on the session, the ranking runs in the threadpool
+        results = await async_rank_hybrid_candidates(
+            db, candidates, disability_ids, skill_ids, employment_type, remote_type, user_profile, 20
+        )
+    else:
+        # Use intelligent search (ranking runs in the threadpool, not on the event loop)
+        results = await async_job_search(
+            db,
+            query=query,
+            disability_ids=disability_ids,
+            skill_ids=skill_ids,
+            employment_type=employment_type,
+            remote_type=remote_type,
+            user_profile=user_profile,
+            limit=20
+        )
 
     return {"results": results, "count": len(results)}
 
 
+def load_search_profile(db: Session, user_id: int) -> Optional[dict]:
+    """The profile fields search boosts on (sync, for run_sync)"""
+    user = db.query(models.User)\
+        .options(
+            selectinload(models.User.disabilities),
+            selectinload(models.User.skills)
+        )\
+        .filter(models.User.id == user_id).first()
+    if not user:
+        return None
+    return {
+        "disabilities": [d.name for d in user.disabilities],
+        "skills": [s.name for s in user.skills],
+        "location": user.location,
+        "preferred_job_type": user.preferred_job_type,
+    }
+
+
+def load_job_page(
+    db: Session,
+    limit: Optional[int],
+    cursor: Optional[str] = None,
+    offset: Optional[int] = None,
+    include_total: bool = False,
+) -> dict:
+    """One page of the job listing (sync)"""
+    page = load_job_page_documents(db, limit, cursor, offset, include_total)
+    return format_job_page(page)
+
+
+def load_job_page_documents(
+    db: Session,
+    limit: Optional[int],
+    cursor: Optional[str] = None,
+    offset: Optional[int] = None,
+    include_total: bool = False,
+) -> dict:
+    """The database half of a job listing page: documents, next cursor and total (for run_sync)"""
+    rows, next_cursor = keyset_page(
+        db.query(models.Job.id, models.Job.created_at),
+        [models.Job.created_at, models.Job.id],
+        limit, cursor, offset=offset,
+    )
+    page = {"documents": job_document_cache.load(db, [row.id for row in rows]), "next_cursor": next_cursor}
+    if include_total:
+        page["total"] = count_cache.count(("jobs",), db.query(models.Job))
+    return page
+
+
+def format_job_page(page: dict) -> dict:
+    """Listing response for a page from load_job_page_documents"""
+    results = [document_to_listing(document) for document in page.pop("documents")]
+    return {"results": results, "count": len(results), **page}
+
+
+async def async_job_page(
+    db: AsyncSession,
+    limit: Optional[int],
+    cursor: Optional[str] = None,
+    offset: Optional[int] = None,
+    include_total: bool = False,
+) -> dict:
+    """load_job_page for async routes: queries on the session, formatting in the threadpool"""
+    page = await db.run_sync(load_job_page_documents, limit, cursor, offset, include_total)
+    return await run_in_threadpool(format_job_page, page)
+
+
 @router.get("/")
-def get_all_jobs(
+async def get_all_jobs(
     limit: Optional[int] = 50,
     offset: Optional[int] = 0,
-    db: Session = Depends(get_db),
+    cursor: Optional[str] = None,
+    include_total: bool = False,
+    db: AsyncSession = Depends(get_async_db),
 ):
-    """Get all jobs with pagination (optimized with eager loading)"""
-    # Use eager loading to prevent N+1 queries
-    jobs = db.query(models.Job)\
-        .options(
-            joinedload(models.Job.company),
-            joinedload(models.Job.location),
-            selectinload(models.Job.requirements),
-            selectinload(models.Job.disabilities)
-        )\
-        .offset(offset)\
-        .limit(limit)\
-        .all()
-    
-    results = []
-    for job in jobs:
-        requirements = [req.requirement for req in job.requirements]
-        disability_support = [d.name for d in job.disabilities]
-        
-        results.append(
-            {
-                "id": job.id,
-                "title": job.title,
-                "description": job.description,
-                "company_name": job.company.name if job.company else None,
-                "company_id": job.company_id,
-                "location_city": job.location.city if job.location else None,
-                "location_country": job.location.country if job.location else None,
-                "employment_type": job.employment_type,
-                "remote_type": job.remote_type,
-                "required_skills": requirements,
-                "disability_support": disability_support,
-                "posted_at": job.posted_at.isoformat() if job.posted_at else None,
-            }
-        )
-    return {"results": results, "count": len(results)}
+    """
+    Get all jobs, oldest first, with keyset pagination (served from the job document cache)
+    Pass next_cursor back as cursor for the next page
+    """
+    return await async_job_page(db, limit, cursor, offset, include_total)
 
 
 @router.get("/{job_id}")
-def get_job(job_id: int, db: Session = Depends(get_db)):
+async def get_job(job_id: int, db: AsyncSession = Depends(get_async_db)):
     """Get a single job by ID"""
-    job = db.query(models.Job).filter(models.Job.id == job_id).first()
-    if not job:
+    document = await db.run_sync(job_document_cache.load_one, job_id)
+    if not document:
         raise HTTPException(status_code=404, detail="Job not found")
-    
-    requirements = [req.requirement for req in job.requirements]
-    disability_support = [d.name for d in job.disabilities]
-    
-    return {
-        "id": job.id,
-        "title": job.title,
-        "description": job.description,
-        "company_name": job.company.name if job.company else None,
-        "company_id": job.company_id,
-        "location_city": job.location.city if job.location else None,
-        "location_country": job.location.country if job.location else None,
-        "employment_type": job.employment_type,
-        "remote_type": job.remote_type,
-        "required_skills": requirements,
-        "disability_support": disability_support,
-        "posted_at": job.posted_at.isoformat() if job.posted_at else None,
-    }
+    return document_to_listing(document)
 
 
 @router.put("/{job_id}")
 def update_job(
     job_id: int,
     request: Request,
+    background_tasks: BackgroundTasks,
     title: str,
     description: str,
     employment_type: Optional[str] = None,
@@ -321,11 +358,15 @@ def update_job(
     
     db.commit()
     db.refresh(job)
+    job_document_cache.invalidate(job.id)
+    response_cache.invalidate_jobs([job.id])
+    job_index.index_job(job)
+    background_tasks.add_task(index_jobs_task, [job.id])
     return {"job_id": job.id, "message": "Job updated successfully"}
 
 
 @router.delete("/{job_id}")
-def delete_job(job_id: int, db: Session = Depends(get_db)):
+def delete_job(job_id: int, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     """Delete a job"""
     job = db.query(models.Job).filter(models.Job.id == job_id).first()
     if not job:
@@ -333,5 +374,9 @@ def delete_job(job_id: int, db: Session = Depends(get_db)):
     
     db.delete(job)
     db.commit()
+    job_document_cache.invalidate(job_id)
+    response_cache.invalidate_jobs([job_id])
+    job_index.remove_job(job_id)
+    background_tasks.add_task(remove_jobs_task, [job_id])
     return {"message": "Job deleted successfully"}
 
@@ -4,12 +4,13 @@ Security monitoring and intrusion detection routes
 from typing import List, Optional
 from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
-from sqlalchemy import desc, func
+from sqlalchemy import func
 from datetime import datetime, timedelta
 
 from backend.src.db.database import get_db
 from backend.src.db import models
 from backend.src.utils.security import check_rate_limit
+from backend.src.utils.pagination import keyset_page, count_cache
 
 router = APIRouter(prefix="/security", tags=["security"])
 
@@ -48,9 +49,15 @@ def get_security_logs(
     offset: int = 0,
     severity: Optional[str] = None,
     threat_type: Optional[str] = None,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     db: Session = Depends(get_db),
 ):
-    """Get security logs (admin only)"""
+    """
+    Get security logs, newest first (admin only)
+    Keyset-paginated: pass next_cursor back as cursor for the next page. The total is
+    only counted when include_total is set, and is cached for a few seconds
+    """
     query = db.query(models.SecurityLog)
     
     if severity:
@@ -58,8 +65,11 @@ def get_security_logs(
     if threat_type:
         query = query.filter(models.SecurityLog.threat_type == threat_type)
     
-    logs = query.order_by(desc(models.SecurityLog.created_at)).offset(offset).limit(limit).all()
-    total = query.count()
+    logs, next_cursor = keyset_page(
+        query, [models.SecurityLog.created_at, models.SecurityLog.id],
+        limit, cursor, descending=True, offset=offset,
+    )
+    total = count_cache.count(("security_logs", severity, threat_type), query) if include_total else None
     
     return {
         "logs": [
@@ -79,7 +89,8 @@ def get_security_logs(
         ],
         "total": total,
         "limit": limit,
-        "offset": offset
+        "offset": offset,
+        "next_cursor": next_cursor,
     }
 
 
@@ -134,7 +145,7 @@ def get_security_stats(
 
 
 @router.post("/detect")
-async def detect_threat(
+def detect_threat(
     request: Request,
     data: dict,
     db: Session = Depends(get_db),
@@ -1,5 +1,5 @@
 from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Request
+from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Request, Response
 from fastapi.responses import FileResponse
 from sqlalchemy.orm import Session, joinedload
 from werkzeug.security import generate_password_hash, check_password_hash
@@ -13,6 +13,7 @@ from backend.src.utils.security import (
     sanitize_input, validate_email, validate_name, validate_phone,
     validate_string_length, validate_integer_id, check_rate_limit
 )
+from backend.src.utils.pagination import keyset_page, count_cache
 
 router = APIRouter(prefix="/users", tags=["users"])
 
@@ -22,7 +23,7 @@ UPLOAD_DIR.mkdir(parents=True, exist_ok=True)
 
 
 @router.post("/add_user")
-async def add_user(
+def add_user(
     request: Request,
     name: str = Form(...),
     email: str = Form(...),
@@ -224,7 +225,7 @@ def get_user(user_id: int, db: Session = Depends(get_db)):
 
 
 @router.put("/{user_id}")
-async def update_user(
+def update_user(
     user_id: int,
     name: Optional[str] = Form(None),
     email: Optional[str] = Form(None),
@@ -325,17 +326,25 @@ async def update_user(
 
 @router.get("/")
 def get_all_users(
+    response: Response,
     limit: Optional[int] = 100,
     offset: Optional[int] = 0,
+    cursor: Optional[str] = None,
+    include_total: bool = False,
     db: Session = Depends(get_db)
 ):
-    """Get all users with pagination (optimized for dashboard)"""
-    # For dashboard stats, we only need count, so limit to 1
-    # But if limit is provided, use it for full list
-    if limit is None:
-        limit = 100
-    
-    users = db.query(models.User).offset(offset).limit(limit).all()
+    """
+    Get all users with keyset pagination (optimized for dashboard)
+    The next page's cursor is sent in the X-Next-Cursor header (absent on the last page);
+    include_total adds X-Total-Count
+    """
+    users, next_cursor = keyset_page(
+        db.query(models.User), [models.User.created_at, models.User.id], limit, cursor, offset=offset
+    )
+    if next_cursor:
+        response.headers["X-Next-Cursor"] = next_cursor
+    if include_total:
+        response.headers["X-Total-Count"] = str(count_cache.count(("users",), db.query(models.User)))
     return [
         {
             "id": u.id,
@@ -0,0 +1,145 @@
+"""
+Character-trigram index over the job search vocabulary
+Corrects misspelled query terms and answers substring lookups with one index probe
+"""
+import threading
+from typing import Dict, List, Optional, Set, Tuple, Iterable
+
+
+def trigrams(term: str) -> Set[str]:
+    """Padded character trigrams ("dev" -> "  d", " de", "dev", "ev ")"""
+    padded = f"  {term} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def bounded_edit_distance(a: str, b: str, max_distance: int) -> Optional[int]:
+    """
+    Edit distance counting adjacent transpositions as one edit ("pyhton" -> "python"),
+    or None as soon as it must exceed max_distance
+    """
+    if abs(len(a) - len(b)) > max_distance:
+        return None
+    before_previous = None
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i] + [0] * len(b)
+        for j, char_b in enumerate(b, 1):
+            current[j] = min(
+                previous[j] + 1,
+                current[j - 1] + 1,
+                previous[j - 1] + (char_a != char_b),
+            )
+            if (before_previous is not None and j > 1
+                    and char_a == b[j - 2] and a[i - 2] == char_b):
+                current[j] = min(current[j], before_previous[j - 2] + 1)
+        if min(current) > max_distance:
+            return None
+        before_previous, previous = previous, current
+    return previous[-1] if previous[-1] <= max_distance else None
+
+
+class TrigramIndex:
+    """
+    trigram -> vocabulary terms, with reference counts per term.
+
+    The job search index adds a term when its first posting appears and removes it
+    when the last one goes; skills and disability names are added on top, so a term
+    stays in the vocabulary while any source still references it.
+    """
+
+    def __init__(self, min_similarity: float = 0.25, max_edit_distance: int = 2):
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Set[str]] = {}
+        self._refcounts: Dict[str, int] = {}
+        self.min_similarity = min_similarity
+        self.max_edit_distance = max_edit_distance
+
+    def __contains__(self, term: str) -> bool:
+        return term in self._refcounts
+
+    def __len__(self):
+        return len(self._refcounts)
+
+    def clear(self):
+        with self._lock:
+            self._postings.clear()
+            self._refcounts.clear()
+
+    def replace(self, other: "TrigramIndex"):
+        """Take over other's terms (a vocabulary rebuilt on the side)"""
+        with self._lock:
+            self._postings, self._refcounts = other._postings, other._refcounts
+
+    def add(self, term: str):
+        with self._lock:
+            count = self._refcounts.get(term, 0)
+            self._refcounts[term] = count + 1
+            if count == 0:
+                for gram in trigrams(term):
+                    self._postings.setdefault(gram, set()).add(term)
+
+    def add_terms(self, terms: Iterable[str]):
+        for term in terms:
+            self.add(term)
+
+    def remove(self, term: str):
+        with self._lock:
+            count = self._refcounts.get(term, 0)
+            if count > 1:
+                self._refcounts[term] = count - 1
+                return
+            if count == 0:
+                return
+            del self._refcounts[term]
+            for gram in trigrams(term):
+                terms = self._postings.get(gram)
+                if terms is not None:
+                    terms.discard(term)
+                    if not terms:
+                        del self._postings[gram]
+
+    def containing(self, fragment: str) -> List[str]:
+        """Vocabulary terms containing fragment, via the fragment's inner trigrams"""
+        with self._lock:
+            if len(fragment) < 3:
+                return [term for term in self._refcounts if fragment in term]
+            inner = [fragment[i:i + 3] for i in range(len(fragment) - 2)]
+            # Intersect from the rarest trigram up
+            postings = sorted((self._postings.get(gram, set()) for gram in inner), key=len)
+            candidates = set(postings[0])
+            for terms in postings[1:]:
+                candidates &= terms
+                if not candidates:
+                    break
+            return [term for term in candidates if fragment in term]
+
+    def correct(self, word: str, limit: int = 3) -> List[Tuple[str, float]]:
+        """
+        Vocabulary terms close to word, best first, as (term, similarity).
+
+        Candidates share trigrams with the word (Jaccard >= min_similarity) and are
+        within max_edit_distance edits; similarity is the trigram Jaccard score.
+        """
+        grams = trigrams(word)
+        with self._lock:
+            shared: Dict[str, int] = {}
+            for gram in grams:
+                for term in self._postings.get(gram, ()):
+                    shared[term] = shared.get(term, 0) + 1
+        scored = []
+        for term, overlap in shared.items():
+            if term == word:
+                continue
+            similarity = overlap / (len(grams) + len(term) + 1 - overlap)
+            if similarity < self.min_similarity:
+                continue
+            distance = bounded_edit_distance(word, term, self.max_edit_distance)
+            if distance is None:
+                continue
+            scored.append((distance, -similarity, term))
+        scored.sort()
+        return [(term, -negative) for _, negative, term in scored[:limit]]
+
+
+# Vocabulary of the job search index plus skill and disability names
+fuzzy_index = TrigramIndex()
@@ -0,0 +1,162 @@
+"""
+Hybrid lexical + vector job retrieval
+The keyword search backend and the job vector index generate candidates side by side
+(the vector lookup and the lexical ranking both run in the threadpool; only the
+lexical search's database reads use the session); their rankings are merged with
+reciprocal rank fusion and the usual profile boosts are applied on top, again in the
+threadpool. Semantic queries ("work I can do with low vision") find
+jobs that share no keywords with the query, and keyword queries keep their matches.
+
+If the vector side misses HYBRID_LATENCY_BUDGET_MS, the lexical ranking is used alone.
+Vector hits under HYBRID_VECTOR_MIN_SCORE are dropped: the index always has nearest
+neighbours, even for queries that match nothing.
+"""
+import time
+import asyncio
+from typing import Dict, List, Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+
+from backend.src.config import settings
+from backend.src.rag.job_vectors import retrieve_job_ids
+from backend.src.utils.job_documents import job_document_cache
+from backend.src.utils.metrics import metrics
+from backend.src.utils.search_intelligence import (
+    async_job_search, load_skill_names, profile_bonus, _format_search_result, TEXT_MATCH_WEIGHT,
+)
+
+hybrid_search_seconds = metrics.histogram(
+    "hybrid_search_seconds", "Time to generate and fuse hybrid search candidates"
+)
+hybrid_vector_timeouts = metrics.counter(
+    "hybrid_vector_timeouts_total", "Hybrid searches that fell back to lexical results on the latency budget"
+)
+
+
+def reciprocal_rank_fusion(rankings: List[List[int]], weights: List[float], k: int = 60) -> Dict[int, float]:
+    """
+    Fuse ranked id lists: score(id) = sum of weight / (k + rank), normalized so the best
+    fused job scores 1.0 (like the top text match of a keyword search). Returned best first.
+    """
+    fused: Dict[int, float] = {}
+    for ranking, weight in zip(rankings, weights):
+        for rank, job_id in enumerate(ranking, start=1):
+            fused[job_id] = fused.get(job_id, 0.0) + weight / (k + rank)
+    ordered = sorted(fused.items(), key=lambda item: item[1], reverse=True)
+    best = ordered[0][1] if ordered and ordered[0][1] > 0 else 1.0
+    return {job_id: score / best for job_id, score in ordered}
+
+
+async def hybrid_candidates(
+    db: AsyncSession,
+    query: str,
+    limit: int,
+    disability_ids: Optional[List[int]] = None,
+    skill_ids: Optional[List[int]] = None,
+    employment_type: Optional[str] = None,
+    remote_type: Optional[str] = None,
+    vector: bool = True,
+) -> Optional[Dict[int, float]]:
+    """
+    Fused {job_id: score (0-1)} for query, best first, up to limit * HYBRID_CANDIDATE_MULTIPLIER
+    candidates; empty when nothing matches. None when hybrid search is off or the query
+    is empty. vector=False skips the vector lookup (and its embedding call).
+    """
+    if not settings.SEARCH_HYBRID or not query or not query.strip():
+        return None
+    started = time.perf_counter()
+    fetch = limit * settings.HYBRID_CANDIDATE_MULTIPLIER
+
+    vector_task = None
+    if vector:
+        filters = {field: value for field, value in (("employment_type", employment_type), ("remote_type", remote_type)) if value}
+        vector_task = asyncio.ensure_future(run_in_threadpool(retrieve_job_ids, query, fetch, filters or None))
+
+    # Text relevance only: profile boosts are applied once, after fusion
+    results = await async_job_search(db, query, disability_ids, skill_ids, employment_type, remote_type, None, fetch)
+    lexical_ids = [result["id"] for result in results]
+
+    vector_ids: List[int] = []
+    remaining = settings.HYBRID_LATENCY_BUDGET_MS / 1000 - (time.perf_counter() - started)
+    try:
+        if vector_task is not None:
+            # shield: a late vector lookup finishes in the background (warming the embedding cache)
+            vector_scores = await asyncio.wait_for(asyncio.shield(vector_task), max(remaining, 0.001))
+            vector_ids = [
+                job_id for job_id, similarity in (vector_scores or {}).items()
+                if similarity >= settings.HYBRID_VECTOR_MIN_SCORE
+            ]
+    except asyncio.TimeoutError:
+        hybrid_vector_timeouts.inc()
+    except Exception as e:
+        print(f"Warning: Vector candidates unavailable: {e}")
+
+    fused = reciprocal_rank_fusion(
+        [lexical_ids, vector_ids],
+        [settings.HYBRID_LEXICAL_WEIGHT, settings.HYBRID_VECTOR_WEIGHT],
+        settings.HYBRID_RRF_K,
+    )
+    hybrid_search_seconds.observe(time.perf_counter() - started)
+    return dict(list(fused.items())[:fetch])
+
+
+def _matches_filters(document: Dict, disability_ids, skill_names, employment_type, remote_type) -> bool:
+    """The search filters, for vector candidates that didn't come through the backend"""
+    if disability_ids and not set(disability_ids) & set(document["disability_ids"]):
+        return False
+    if employment_type and document["employment_type"] != employment_type:
+        return False
+    if remote_type and document["remote_type"] != remote_type:
+        return False
+    if skill_names:
+        requirements_text = " ".join(document["requirements_lower"])
+        if not any(name in requirements_text for name in skill_names):
+            return False
+    return True
+
+
+async def async_rank_hybrid_candidates(
+    db: AsyncSession,
+    candidates: Dict[int, float],
+    disability_ids: Optional[List[int]],
+    skill_ids: Optional[List[int]],
+    employment_type: Optional[str],
+    remote_type: Optional[str],
+    user_profile: Optional[Dict],
+    limit: int,
+) -> List[Dict]:
+    """
+    Search results from fused candidates for async routes: skill names and job documents
+    are read on the session, the ranking runs in the threadpool
+    """
+    skill_names = await db.run_sync(load_skill_names, skill_ids) if skill_ids else None
+    documents = await db.run_sync(job_document_cache.load, list(candidates))
+    return await run_in_threadpool(
+        rank_hybrid_candidates, documents, candidates, disability_ids, skill_names, employment_type, remote_type,
+        user_profile, limit,
+    )
+
+
+def rank_hybrid_candidates(
+    documents: List[Dict],
+    candidates: Dict[int, float],
+    disability_ids: Optional[List[int]],
+    skill_names: Optional[List[str]],
+    employment_type: Optional[str],
+    remote_type: Optional[str],
+    user_profile: Optional[Dict],
+    limit: int,
+) -> List[Dict]:
+    """
+    Search results from the candidates' documents: filters, then fused score plus
+    profile_bonus (no database access)
+    """
+    jobs_with_scores = []
+    for document in documents:
+        if not _matches_filters(document, disability_ids, skill_names, employment_type, remote_type):
+            continue
+        score = candidates[document["id"]] * TEXT_MATCH_WEIGHT + profile_bonus(document, user_profile)
+        jobs_with_scores.append((document, min(score, 1.0)))
+    jobs_with_scores.sort(key=lambda x: x[1], reverse=True)
+    return [_format_search_result(document, score) for document, score in jobs_with_scores[:limit]]
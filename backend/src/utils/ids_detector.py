@@ -1,20 +1,210 @@
 """
 Intrusion Detection System (IDS) Integration
 This module provides utilities for integrating with your custom IDS model
+
+Rule-based detection compiles every pattern in THREAT_PATTERNS into one trie-shaped
+regular expression (built once at import) and scans all request fields (method,
+path, headers, query parameters, body) in a single pass. 'blocked' in a result is the
+rule's verdict; SecurityMiddleware only logs threats found in the body alone unless
+SECURITY_BLOCK_ON_BODY is set.
 """
 import os
-import json
-from typing import Optional, Dict, Any
-from datetime import datetime
+import re
+from bisect import bisect_right
+from functools import lru_cache
+from typing import Optional, Dict, Any, Iterable, List, Tuple
 
 # Path to your IDS model (you'll upload this)
 IDS_MODEL_PATH = os.getenv("IDS_MODEL_PATH", "models/ids_model.pkl")
 IDS_ENABLED = os.getenv("IDS_ENABLED", "true").lower() == "true"
 
+# Attack signatures by threat type, matched case-insensitively anywhere in a request field
+THREAT_PATTERNS = {
+    'sql_injection': [
+        "union select", "drop table", "insert into", "delete from",
+        "'; --", "1=1", "1' OR '1'='1", "exec(", "xp_cmdshell"
+    ],
+    'xss': [
+        "<script>", "javascript:", "onerror=", "onload=",
+        "eval(", "alert(", "<img src=x", "document.cookie"
+    ],
+    'path_traversal': [
+        "../", "..\\", "/etc/passwd", "C:\\", "..%2F", "%2E%2E"
+    ],
+    'command_injection': [
+        "; ls", "| cat", "&& whoami", "`", "$(", "<?php"
+    ]
+}
+
+# Joins scanned text; no pattern contains it, so matches never span two fields
+FIELD_SEPARATOR = "\x00"
+
+# Rough character frequencies in request text (percent). Each pattern is anchored on
+# its rarest character, so the regex is only tried at a few positions per request.
+CHAR_FREQUENCY = dict(zip("etaoinsrhldcumfpgwybvkxjqz", (
+    12.7, 9.1, 8.2, 7.5, 7.0, 6.7, 6.3, 6.0, 6.1, 4.0, 4.3, 2.8, 2.8,
+    2.4, 2.2, 1.9, 2.0, 2.4, 2.0, 1.5, 1.0, 0.8, 0.2, 0.15, 0.1, 0.07,
+)))
+CHAR_FREQUENCY[" "] = 17.0
+
+
+def _anchor(pattern: str) -> int:
+    """Index of the pattern's rarest character (digits 0.5%, punctuation 0.1%)"""
+    return min(
+        range(len(pattern)),
+        key=lambda i: (CHAR_FREQUENCY.get(pattern[i], 0.5 if pattern[i].isdigit() else 0.1), i),
+    )
+
+
+def _compile_patterns(patterns: Iterable[str]) -> "re.Pattern":
+    """
+    One regex for all patterns: a trie over the text from each pattern's anchor onwards,
+    with a lookbehind checking the part before the anchor. The match starts at the anchor.
+    """
+    trie: Dict[str, dict] = {}
+    for pattern in patterns:
+        node = trie
+        for char in pattern[_anchor(pattern):]:
+            node = node.setdefault(char, {})
+        node.setdefault("", []).append(pattern)
+
+    def build(node: dict) -> str:
+        branches = [re.escape(char) + build(child) for char, child in sorted(node.items()) if char]
+        ends = node.get("", [])
+        if any(_anchor(pattern) == 0 for pattern in ends):
+            end = ""
+        else:
+            end = "|".join(f"(?<={re.escape(pattern)})" for pattern in ends)
+        if not ends:
+            return branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if not branches:
+            return f"(?:{end})" if len(ends) > 1 else end
+        return "(?:" + "|".join(branches + [end]) + ")"
+
+    return re.compile(build(trie))
+
+
+class ThreatMatcher:
+    """
+    Multi-pattern matcher: all patterns in one compiled regex, run once over the
+    request's fields joined into a single lowercased string. Every match (overlapping
+    ones included) is reported with its field and offset.
+    """
+
+    def __init__(self, patterns: Dict[str, List[str]]):
+        # pattern (lowercased) -> (rank, threat type, pattern as written); first rule wins
+        self.rules: Dict[str, Tuple[int, str, str]] = {}
+        for threat_type, threat_patterns in patterns.items():
+            for pattern in threat_patterns:
+                self.rules.setdefault(pattern.lower(), (len(self.rules), threat_type, pattern))
+        self.regex = _compile_patterns(self.rules)
+        # Patterns that can match at an anchor character, checked in full on a hit
+        self.by_anchor: Dict[str, List[Tuple[str, int]]] = {}
+        for pattern in self.rules:
+            anchor = _anchor(pattern)
+            self.by_anchor.setdefault(pattern[anchor], []).append((pattern, anchor))
+
+    def scan(self, request_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """All matches as {'threat_type', 'pattern', 'field', 'position', 'rank'}"""
+        texts: List[str] = []
+        owners: List[tuple] = []
+        _flatten(request_data, (), texts, owners)
+        joined = FIELD_SEPARATOR.join(texts)
+        haystack = joined.lower()
+        if len(haystack) != len(joined):
+            # Some characters lowercase to several ('İ' -> 'i̇'), which shifts every later
+            # offset: lowercase field by field so field starts match the haystack
+            texts = [text.lower() for text in texts]
+            haystack = FIELD_SEPARATOR.join(texts)
+        match = self.regex.search(haystack)
+        if match is None:
+            return []
+
+        starts, offset = [], 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + 1
+        matches = []
+        while match is not None:
+            at = match.start()
+            for pattern, anchor in self.by_anchor[haystack[at]]:
+                start = at - anchor
+                if start >= 0 and haystack.startswith(pattern, start):
+                    rank, threat_type, written = self.rules[pattern]
+                    field, position = _locate(haystack, starts, owners, start)
+                    matches.append({
+                        'threat_type': threat_type,
+                        'pattern': written,
+                        'field': field,
+                        'position': position,
+                        'rank': rank,
+                    })
+            # Resume one character later so overlapping patterns are found too
+            match = self.regex.search(haystack, at + 1)
+        return matches
+
 
+def _flatten(data: Dict[Any, Any], path: tuple, texts: List[str], owners: List[tuple]):
+    """
+    Append every key and scalar value in data to texts, and what each text is to
+    owners: (path, None) for one value, (path, keys) for joined values
+    """
+    try:
+        texts.append(FIELD_SEPARATOR.join(data))
+    except TypeError:
+        texts.append(FIELD_SEPARATOR.join(map(str, data)))
+    owners.append((path, None))  # keys are reported under their container
+    _flatten_values(data.items(), path, texts, owners)
+
+
+def _flatten_values(items: Iterable[Tuple[Any, Any]], path: tuple, texts: List[str], owners: List[tuple]):
+    for key, value in items:
+        if isinstance(value, str):
+            texts.append(value)
+            owners.append((path + (key,), None))
+        elif isinstance(value, dict):
+            try:
+                # Flat dicts of strings (headers, query parameters): C-level joins
+                joined_keys, joined_values = FIELD_SEPARATOR.join(value), FIELD_SEPARATOR.join(value.values())
+            except TypeError:
+                _flatten(value, path + (key,), texts, owners)
+            else:
+                texts.append(joined_keys)
+                owners.append((path + (key,), None))
+                texts.append(joined_values)
+                owners.append((path + (key,), list(value)))
+        elif isinstance(value, (list, tuple)):
+            # List indexes can't match a pattern, only the items are scanned
+            try:
+                texts.append(FIELD_SEPARATOR.join(value))
+            except TypeError:
+                _flatten_values(enumerate(value), path + (key,), texts, owners)
+            else:
+                owners.append((path + (key,), range(len(value))))
+        elif value is not None:
+            texts.append(str(value))
+            owners.append((path + (key,), None))
+
+
+def _locate(haystack: str, starts: List[int], owners: List[tuple], at: int) -> Tuple[str, int]:
+    """Field name and offset in that field for a haystack position"""
+    index = bisect_right(starts, at) - 1
+    path, keys = owners[index]
+    # Offset from the start of the text, or of the value / key within joined text
+    item_start = max(haystack.rfind(FIELD_SEPARATOR, starts[index], at) + 1, starts[index])
+    if keys is not None:
+        path = path + (keys[haystack.count(FIELD_SEPARATOR, starts[index], at)],)
+    return ".".join(map(str, path)) or "request", at - item_start
+
+
+threat_matcher = ThreatMatcher(THREAT_PATTERNS)
+
+
+@lru_cache(maxsize=1)
 def load_ids_model():
     """
-    Load your intrusion detection model
+    Load your intrusion detection model (once per process; detect_threat calls this
+    on every request)
     You can modify this to load your specific model format (pickle, joblib, tensorflow, etc.)
     """
     if not IDS_ENABLED:
@@ -127,39 +317,21 @@ def rule_based_detection(
 ) -> Dict[str, Any]:
     """
     Rule-based threat detection (fallback when model not available)
-    Detects common attack patterns
-    """
-    threat_patterns = {
-        'sql_injection': [
-            "union select", "drop table", "insert into", "delete from",
-            "'; --", "1=1", "1' OR '1'='1", "exec(", "xp_cmdshell"
-        ],
-        'xss': [
-            "<script>", "javascript:", "onerror=", "onload=",
-            "eval(", "alert(", "<img src=x", "document.cookie"
-        ],
-        'path_traversal': [
-            "../", "..\\", "/etc/passwd", "C:\\", "..%2F", "%2E%2E"
-        ],
-        'command_injection': [
-            "; ls", "| cat", "&& whoami", "`", "$(", "<?php"
-        ]
-    }
-    
-    # Check request body/query for threats
-    request_str = json.dumps(request_data).lower()
-    
-    for threat_type, patterns in threat_patterns.items():
-        for pattern in patterns:
-            if pattern.lower() in request_str:
-                return {
-                    'is_threat': True,
-                    'threat_type': threat_type,
-                    'severity': 'critical',
-                    'confidence': 0.9,
-                    'details': f'Detected {threat_type} pattern: {pattern}',
-                    'blocked': True
-                }
+    Detects common attack patterns; every match is listed under 'matches'
+    """
+    matches = threat_matcher.scan(request_data)
+    if matches:
+        # Reported threat: the first rule in THREAT_PATTERNS order that matched
+        first = min(matches, key=lambda match: match['rank'])
+        return {
+            'is_threat': True,
+            'threat_type': first['threat_type'],
+            'severity': 'critical',
+            'confidence': 0.9,
+            'details': f"Detected {first['threat_type']} pattern: {first['pattern']}",
+            'blocked': True,
+            'matches': matches,
+        }
     
     return {
         'is_threat': False,
@@ -167,14 +339,16 @@ def rule_based_detection(
         'severity': 'info',
         'confidence': 0.0,
         'details': 'No threats detected',
-        'blocked': False
+        'blocked': False,
+        'matches': [],
     }
 
 
-def analyze_request(request, user_id: Optional[int] = None) -> Dict[str, Any]:
+def analyze_request(request, user_id: Optional[int] = None, body: Any = None) -> Dict[str, Any]:
     """
     Analyze an incoming request for threats
-    This is called from middleware or route handlers
+    This is called from middleware or route handlers; pass the already-read body
+    (parsed JSON or text) to scan it too
     """
     client_ip = request.client.host if request.client else "unknown"
     
@@ -186,12 +360,9 @@ def analyze_request(request, user_id: Optional[int] = None) -> Dict[str, Any]:
         'query_params': dict(request.query_params),
     }
     
-    # Try to get body if available
-    try:
-        if hasattr(request, 'json'):
-            request_data['body'] = request.json()
-    except:
-        pass
+    # request.json() is a coroutine, so the caller reads the body
+    if body is not None:
+        request_data['body'] = body
     
     # Run detection
     result = detect_threat(request_data, client_ip, user_id)
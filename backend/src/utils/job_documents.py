@@ -0,0 +1,183 @@
+"""
+Materialized job document cache
+Keeps one denormalized dict per job (relationships flattened, text pre-lowercased)
+so job listings, search results and the chatbot are served without the ORM
+"""
+import time
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Iterable
+
+from sqlalchemy.orm import Session
+
+from backend.src.config import settings
+from backend.src.db import models
+from backend.src.db.job_queries import load_jobs_by_ids
+from backend.src.utils.search_index import job_to_document
+
+
+def build_job_document(job: models.Job) -> Dict:
+    """Flatten an eager-loaded ORM job into its cached document"""
+    document = job_to_document(job)
+    document.update({
+        "company_id": job.company_id,
+        "location_city": job.location.city if job.location else None,
+        "location_country": job.location.country if job.location else None,
+        "posted_at_iso": job.posted_at.isoformat() if job.posted_at else None,
+        # Pre-lowercased text for the chat filter and scorers
+        "title_lower": document["title"].lower(),
+        "description_lower": document["description"].lower(),
+        "company_lower": (document["company_name"] or "").lower(),
+        "requirements_lower": [req.lower() for req in document["requirements"]],
+        "disability_support_lower": [name.lower() for name in document["disability_support"]],
+    })
+    return document
+
+
+def document_to_listing(document: Dict) -> Dict:
+    """Shape a job document for the /jobs list and detail responses"""
+    return {
+        "id": document["id"],
+        "title": document["title"],
+        "description": document["description"],
+        "company_name": document["company_name"],
+        "company_id": document["company_id"],
+        "location_city": document["location_city"],
+        "location_country": document["location_country"],
+        "employment_type": document["employment_type"],
+        "remote_type": document["remote_type"],
+        "required_skills": list(document["requirements"]),
+        "disability_support": list(document["disability_support"]),
+        "posted_at": document["posted_at_iso"],
+    }
+
+
+def document_to_chat_context(document: Dict, applied_job_ids: Optional[List[int]] = None) -> Dict:
+    """Shape a job document for the chatbot context (see prompt_builder.format_jobs_for_context)"""
+    city = document["location_city"] or ""
+    country = document["location_country"] or ""
+    location_str = f"{city}, {country}".strip(", ") if city or country else "Remote"
+
+    context = {
+        "id": document["id"],
+        "title": document["title"] or "Untitled",
+        "description": document["description"],
+        "company": document["company_name"] or "Unknown",
+        "location": location_str,
+        "employment_type": document["employment_type"] or "full-time",
+        "remote_type": document["remote_type"] or "remote",
+        "requirements": list(document["requirements"]),
+        "disability_support": list(document["disability_support"]),
+        "has_applied": bool(applied_job_ids) and document["id"] in applied_job_ids,
+        # Used by filter_jobs_for_chat; format_jobs_for_context ignores them
+        "title_lower": document["title_lower"],
+        "description_lower": document["description_lower"],
+    }
+    return context
+
+
+class JobDocumentCache:
+    """
+    Process-wide LRU of job documents, keyed by job id and version.
+
+    Every invalidation bumps the job's version (company and disability invalidations
+    bump a cache-wide generation); a document loaded from the database is only stored
+    if the versions it was read under are still current, so a request racing a write
+    can't cache the old row. Entries also expire after ttl_seconds,
+    which bounds staleness from writes made by other worker processes.
+    """
+
+    def __init__(self, max_entries: int = 10000, ttl_seconds: float = 300.0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        # job_id -> (version, stored_at, document)
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()
+        self._versions: Dict[int, int] = {}
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def version(self, job_id: int) -> tuple:
+        """Current (generation, job version); pass to put() after loading the job"""
+        with self._lock:
+            return self._generation, self._versions.get(job_id, 0)
+
+    def get_many(self, job_ids: Iterable[int]) -> Dict[int, Dict]:
+        """Cached, unexpired documents for job_ids"""
+        found = {}
+        now = time.monotonic()
+        with self._lock:
+            for job_id in job_ids:
+                entry = self._entries.get(job_id)
+                if entry is None or entry[0] != self._versions.get(job_id, 0) \
+                        or now - entry[1] > self.ttl_seconds:
+                    self.misses += 1
+                    continue
+                self._entries.move_to_end(job_id)
+                found[job_id] = entry[2]
+                self.hits += 1
+        return found
+
+    def put(self, job: models.Job, version: Optional[tuple] = None) -> Dict:
+        """
+        Build and store the document for job. Pass the version read before the job
+        was loaded; the document is returned but not stored if it changed since.
+        """
+        document = build_job_document(job)
+        with self._lock:
+            current = self._versions.get(job.id, 0)
+            if version is None or version == (self._generation, current):
+                self._entries[job.id] = (current, time.monotonic(), document)
+                self._entries.move_to_end(job.id)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return document
+
+    def load(self, db: Session, job_ids: Iterable[int]) -> List[Dict]:
+        """Documents for job_ids in the given order; misses are loaded in one query"""
+        job_ids = list(job_ids)
+        documents = self.get_many(job_ids)
+        missing = [job_id for job_id in job_ids if job_id not in documents]
+        if missing:
+            versions = {job_id: self.version(job_id) for job_id in missing}
+            for job_id, job in load_jobs_by_ids(db, missing).items():
+                documents[job_id] = self.put(job, versions[job_id])
+        return [documents[job_id] for job_id in job_ids if job_id in documents]
+
+    def load_one(self, db: Session, job_id: int) -> Optional[Dict]:
+        documents = self.load(db, [job_id])
+        return documents[0] if documents else None
+
+    def invalidate(self, job_id: int):
+        """Drop a job's document (call after a job write is committed)"""
+        with self._lock:
+            self._versions[job_id] = self._versions.get(job_id, 0) + 1
+            self._entries.pop(job_id, None)
+
+    def _invalidate_where(self, predicate):
+        with self._lock:
+            self._generation += 1
+            stale = [job_id for job_id, (_, _, document) in self._entries.items() if predicate(document)]
+            for job_id in stale:
+                self._versions[job_id] = self._versions.get(job_id, 0) + 1
+                del self._entries[job_id]
+
+    def invalidate_company(self, company_id: int):
+        """Drop every job of a company (its name is denormalized into the documents)"""
+        self._invalidate_where(lambda document: document["company_id"] == company_id)
+
+    def invalidate_disability(self, disability_id: int):
+        """Drop every job supporting a disability (its name is denormalized into the documents)"""
+        self._invalidate_where(lambda document: disability_id in document["disability_ids"])
+
+    def clear(self):
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+
+job_document_cache = JobDocumentCache(settings.JOB_CACHE_MAX_ENTRIES, settings.JOB_CACHE_TTL_SECONDS)
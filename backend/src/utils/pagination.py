@@ -0,0 +1,115 @@
+"""
+Keyset (cursor) pagination for list endpoints
+Pages are read with WHERE (created_at, id) > (last row) instead of OFFSET, so deep
+pages cost the same as the first; cursors are opaque base64 tokens
+"""
+import json
+import time
+import base64
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+from sqlalchemy.orm import Query
+
+from backend.src.config import settings
+
+
+def encode_cursor(values: List[Any]) -> str:
+    """Opaque cursor token for a row's key values"""
+    payload = [value.isoformat() if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(json.dumps(payload, separators=(",", ":")).encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, key_columns: List) -> List[Any]:
+    """Key values from a cursor token; raises HTTPException 400 if it's malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        if not isinstance(values, list) or len(values) != len(key_columns):
+            raise ValueError("wrong number of key values")
+        decoded = []
+        for column, value in zip(key_columns, values):
+            if value is not None and column.type.python_type is datetime:
+                value = datetime.fromisoformat(value)
+            decoded.append(value)
+        return decoded
+    except (ValueError, TypeError, NotImplementedError):
+        raise HTTPException(status_code=400, detail="Invalid pagination cursor")
+
+
+def _after(key_columns: List, values: List[Any], descending: bool):
+    """
+    WHERE clause for rows strictly after values in (key_columns) order.
+
+    Nullable leading keys (e.g. created_at on legacy rows) follow MySQL ordering:
+    NULLs sort first ascending and last descending. The last key must be unique
+    and non-null (the primary key).
+    """
+    column, value = key_columns[0], values[0]
+    if len(key_columns) == 1:
+        return column < value if descending else column > value
+
+    rest = _after(key_columns[1:], values[1:], descending)
+    if value is None:
+        tie = and_(column.is_(None), rest)
+        return tie if descending else or_(tie, column.isnot(None))
+    beyond = column < value if descending else column > value
+    clause = or_(beyond, and_(column == value, rest))
+    return or_(clause, column.is_(None)) if descending else clause
+
+
+def keyset_page(
+    query: Query,
+    key_columns: List,
+    limit: int,
+    cursor: Optional[str] = None,
+    descending: bool = False,
+    offset: Optional[int] = None,
+) -> Tuple[List[Any], Optional[str]]:
+    """
+    One page of query ordered by key_columns (e.g. [created_at, id]).
+
+    Returns (rows, next_cursor); next_cursor is None on the last page. Rows may be ORM
+    objects or named rows, as long as each key column is readable as an attribute.
+    offset is only honoured without a cursor, for clients that haven't moved to cursors.
+    """
+    limit = max(1, min(limit or 100, settings.PAGINATION_MAX_LIMIT))
+    if cursor:
+        query = query.filter(_after(key_columns, decode_cursor(cursor, key_columns), descending))
+    elif offset:
+        query = query.offset(offset)
+    order = [column.desc() if descending else column.asc() for column in key_columns]
+    rows = query.order_by(*order).limit(limit + 1).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_cursor([getattr(last, column.key) for column in key_columns])
+    return rows, next_cursor
+
+
+class CountCache:
+    """Total row counts per (table, filters) key, recomputed at most every ttl_seconds"""
+
+    def __init__(self, ttl_seconds: float = 30.0):
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self._counts: Dict[tuple, Tuple[float, int]] = {}
+
+    def count(self, key: tuple, query: Query) -> int:
+        now = time.monotonic()
+        with self._lock:
+            cached = self._counts.get(key)
+        if cached and now - cached[0] < self.ttl_seconds:
+            return cached[1]
+        total = query.order_by(None).count()
+        with self._lock:
+            self._counts[key] = (now, total)
+        return total
+
+
+count_cache = CountCache(settings.PAGINATION_COUNT_TTL_SECONDS)
@@ -0,0 +1,201 @@
+"""
+Ranking engines for job search
+Score jobs against expanded query keywords using the statistics kept by job_index
+"""
+import math
+from collections import Counter
+from typing import Dict, List, Optional, Iterable
+
+from backend.src.config import settings
+from backend.src.utils.search_index import FIELD_WEIGHTS, JobSearchIndex, job_index
+
+
+# Query keywords arrive expanded: one {term: match_weight} dict per keyword
+ExpandedKeywords = List[Dict[str, float]]
+
+
+class RankingEngine:
+    """
+    Base class for ranking engines.
+
+    Both methods return text-match scores in the 0.0 - 1.0 range so callers can
+    combine them with the profile bonuses in calculate_relevance_score.
+    """
+    name = "base"
+
+    def __init__(self, index: JobSearchIndex):
+        self.index = index
+
+    def score(self, expanded_keywords: ExpandedKeywords, job_ids: Optional[Iterable[int]] = None) -> Dict[int, float]:
+        """Score indexed jobs (every job matching any term when job_ids is None)"""
+        raise NotImplementedError
+
+    def score_fields(self, field_tokens: Dict[str, List[str]], expanded_keywords: ExpandedKeywords) -> float:
+        """Score a job that is not (necessarily) in the index from its field tokens"""
+        raise NotImplementedError
+
+
+class FieldMatchRanker(RankingEngine):
+    """
+    Binary per-field matching, the pre-BM25 behaviour.
+    Each keyword earns its best term weight times the weights of the fields it appears in.
+    """
+    name = "field_match"
+
+    def score(self, expanded_keywords, job_ids=None):
+        if not expanded_keywords:
+            return {}
+        wanted = set(job_ids) if job_ids is not None else None
+        scores: Dict[int, float] = {}
+        with self.index.lock:
+            for terms in expanded_keywords:
+                best: Dict[int, float] = {}
+                for term, weight in terms.items():
+                    for job_id, fields in self.index.postings.get(term, {}).items():
+                        if wanted is not None and job_id not in wanted:
+                            continue
+                        value = weight * sum(FIELD_WEIGHTS[field] for field in fields)
+                        if value > best.get(job_id, 0.0):
+                            best[job_id] = value
+                for job_id, value in best.items():
+                    scores[job_id] = scores.get(job_id, 0.0) + value
+        total_weight = sum(FIELD_WEIGHTS.values()) * len(expanded_keywords)
+        return {job_id: min(value / total_weight, 1.0) for job_id, value in scores.items()}
+
+    def score_fields(self, field_tokens, expanded_keywords):
+        if not expanded_keywords:
+            return 0.0
+        field_sets = {field: set(tokens) for field, tokens in field_tokens.items()}
+        total = 0.0
+        for terms in expanded_keywords:
+            total += max(
+                (weight * sum(FIELD_WEIGHTS[f] for f, tokens in field_sets.items() if term in tokens)
+                 for term, weight in terms.items()),
+                default=0.0,
+            )
+        return min(total / (sum(FIELD_WEIGHTS.values()) * len(expanded_keywords)), 1.0)
+
+
+class BM25FRanker(RankingEngine):
+    """
+    BM25F over the title, description, requirements and company fields.
+
+    Per-field term frequencies are length-normalized and boosted, summed into one
+    pseudo-frequency, then saturated with k1. Each keyword contributes the best of
+    its expanded terms (weighted by match quality and idf); the sum is divided by the
+    keywords' maximum attainable idf so scores are comparable across queries.
+    """
+    name = "bm25f"
+
+    # Relative field boosts (same proportions as FIELD_WEIGHTS)
+    FIELD_BOOSTS = {field: weight * 10 for field, weight in FIELD_WEIGHTS.items()}
+    FIELD_B = {"title": 0.5, "description": 0.75, "requirements": 0.5, "company": 0.3}
+
+    def __init__(self, index: JobSearchIndex, k1: float = 1.2):
+        super().__init__(index)
+        self.k1 = k1
+
+    def _idf(self, term: str, doc_count: int) -> float:
+        df = self.index.document_frequency(term)
+        return math.log(1.0 + (doc_count - df + 0.5) / (df + 0.5))
+
+    def _field_params(self) -> Dict[str, tuple]:
+        """(boost, b, average length) per field, computed once per scoring call"""
+        return {
+            field: (self.FIELD_BOOSTS[field], self.FIELD_B[field], self.index.average_field_length(field))
+            for field in FIELD_WEIGHTS
+        }
+
+    @staticmethod
+    def _pseudo_frequency(fields: Dict[str, int], lengths: Dict[str, int], params: Dict[str, tuple]) -> float:
+        total = 0.0
+        for field, tf in fields.items():
+            boost, b, average = params[field]
+            length = lengths.get(field, 0)
+            total += boost * tf / (1.0 - b + b * length / (average or length or 1.0))
+        return total
+
+    def _keyword_weights(self, expanded_keywords: ExpandedKeywords, doc_count: int):
+        """
+        [(per-term weight * idf, max attainable for this keyword)] for each keyword.
+
+        The maximum is the largest idf among terms that occur in the corpus, so a
+        misspelled keyword doesn't inflate the normalizer and partial/corrected matches
+        still score below exact ones. With an empty index every term counts.
+        """
+        weighted = []
+        corpus_known = len(self.index) > 0
+        for terms in expanded_keywords:
+            term_weights = {}
+            maximum = 0.0
+            for term, weight in terms.items():
+                idf = self._idf(term, doc_count)
+                term_weights[term] = weight * idf
+                if not corpus_known or self.index.document_frequency(term):
+                    maximum = max(maximum, idf)
+            weighted.append((term_weights, maximum))
+        return weighted
+
+    def score(self, expanded_keywords, job_ids=None):
+        if not expanded_keywords:
+            return {}
+        wanted = set(job_ids) if job_ids is not None else None
+        scores: Dict[int, float] = {}
+        with self.index.lock:
+            doc_count = max(len(self.index), 1)
+            params = self._field_params()
+            field_lengths = self.index.field_lengths
+            pseudo_frequency = self._pseudo_frequency
+            weighted = self._keyword_weights(expanded_keywords, doc_count)
+            normalizer = sum(maximum for _, maximum in weighted) or 1.0
+            k1 = self.k1
+            for term_weights, _ in weighted:
+                best: Dict[int, float] = {}
+                for term, term_weight in term_weights.items():
+                    for job_id, fields in self.index.postings.get(term, {}).items():
+                        if wanted is not None and job_id not in wanted:
+                            continue
+                        tf = pseudo_frequency(fields, field_lengths[job_id], params)
+                        value = term_weight * tf / (k1 + tf)
+                        if value > best.get(job_id, 0.0):
+                            best[job_id] = value
+                for job_id, value in best.items():
+                    scores[job_id] = scores.get(job_id, 0.0) + value
+        return {job_id: value / normalizer for job_id, value in scores.items()}
+
+    def score_fields(self, field_tokens, expanded_keywords):
+        if not expanded_keywords:
+            return 0.0
+        counts = {field: Counter(tokens) for field, tokens in field_tokens.items()}
+        lengths = {field: len(tokens) for field, tokens in field_tokens.items()}
+        with self.index.lock:
+            doc_count = max(len(self.index), 1)
+            params = self._field_params()
+            weighted = self._keyword_weights(expanded_keywords, doc_count)
+        normalizer = sum(maximum for _, maximum in weighted) or 1.0
+        total = 0.0
+        for term_weights, _ in weighted:
+            best = 0.0
+            for term, term_weight in term_weights.items():
+                fields = {field: counter[term] for field, counter in counts.items() if counter[term]}
+                if not fields:
+                    continue
+                tf = self._pseudo_frequency(fields, lengths, params)
+                best = max(best, term_weight * tf / (self.k1 + tf))
+            total += best
+        return total / normalizer
+
+
+RANKING_ENGINES = {
+    BM25FRanker.name: BM25FRanker,
+    FieldMatchRanker.name: FieldMatchRanker,
+}
+
+
+def get_ranking_engine(name: Optional[str] = None, index: Optional[JobSearchIndex] = None) -> RankingEngine:
+    """Build the ranking engine configured by SEARCH_RANKER (defaults to BM25F)"""
+    engine_class = RANKING_ENGINES.get((name or settings.SEARCH_RANKER).lower(), BM25FRanker)
+    return engine_class(index or job_index)
+
+
+ranking_engine = get_ranking_engine()
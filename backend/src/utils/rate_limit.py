@@ -0,0 +1,204 @@
+"""
+Rate limiting
+Each key keeps a small fixed-size state instead of a list of request times:
+- sliding_window: request counts for the current and previous fixed windows, the
+  previous one weighted by how much of it still overlaps the sliding window
+- token_bucket: up to limit requests at once, refilled at limit per window
+
+Keys are dropped once they are back to a full allowance (idle long enough), and the
+least recently used ones beyond RATE_LIMIT_MAX_KEYS, so memory stays bounded however
+many clients call. RATE_LIMIT_ALGORITHM picks the algorithm.
+
+With RATE_LIMIT_STORAGE=sqlite or redis the sliding window counts live in shared
+storage (utils/rate_limit_storage.py) instead, so every worker enforces one limit.
+"""
+import time
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from backend.src.config import settings
+from backend.src.utils.metrics import metrics
+from backend.src.utils.rate_limit_storage import RateLimitStorage, get_rate_limit_storage
+
+rate_limit_rejections = metrics.counter("rate_limit_rejections_total", "Requests refused by the rate limiter")
+rate_limit_keys = metrics.gauge("rate_limit_keys", "Keys tracked by the in-process rate limiter")
+rate_limit_storage_errors = metrics.counter(
+    "rate_limit_storage_errors_total", "Failed rate limit storage calls (checks then limit per process)"
+)
+
+
+class RateLimitAlgorithm:
+    """
+    Base class for rate limit algorithms.
+
+    A key's state is a short list updated in place; state[0] is always the time at which
+    the key is back to a full allowance, so the limiter can forget it from then on.
+    """
+    name = "base"
+
+    def new_state(self, now: float, limit: int, window: float) -> list:
+        raise NotImplementedError
+
+    def allow(self, state: list, now: float, limit: int, window: float) -> bool:
+        """Count one request against state; False if it is over the limit"""
+        raise NotImplementedError
+
+
+class SlidingWindowCounter(RateLimitAlgorithm):
+    """State: [expires_at, window index, count in that window, count in the window before]"""
+    name = "sliding_window"
+
+    def new_state(self, now, limit, window):
+        return [0.0, int(now // window), 0, 0]
+
+    def allow(self, state, now, limit, window):
+        index = int(now // window)
+        if index != state[1]:
+            state[3] = state[2] if index == state[1] + 1 else 0
+            state[2] = 0
+            state[1] = index
+        # Share of the previous window still inside the sliding window
+        previous_weight = 1.0 - (now / window - index)
+        if state[3] * previous_weight + state[2] >= limit:
+            return False
+        state[2] += 1
+        state[0] = (index + 2) * window
+        return True
+
+
+class TokenBucket(RateLimitAlgorithm):
+    """State: [expires_at, tokens, last update]"""
+    name = "token_bucket"
+
+    def new_state(self, now, limit, window):
+        return [0.0, float(limit), now]
+
+    def allow(self, state, now, limit, window):
+        tokens = min(float(limit), state[1] + (now - state[2]) * limit / window)
+        state[2] = now
+        allowed = tokens >= 1.0
+        if allowed:
+            tokens -= 1.0
+        state[1] = tokens
+        state[0] = now + (limit - tokens) * window / limit
+        return allowed
+
+
+RATE_LIMIT_ALGORITHMS = {
+    SlidingWindowCounter.name: SlidingWindowCounter,
+    TokenBucket.name: TokenBucket,
+}
+
+
+class RateLimiter:
+    """Thread-safe per-key limiter with LRU order and eviction of keys back at a full allowance"""
+
+    def __init__(self, algorithm: RateLimitAlgorithm, max_keys: int):
+        self.algorithm = algorithm
+        self.max_keys = max_keys
+        self._lock = threading.Lock()
+        self._states: "OrderedDict[str, list]" = OrderedDict()
+
+    def __len__(self):
+        return len(self._states)
+
+    def allow(self, key: str, limit: int, window_seconds: float) -> bool:
+        """True if the request is allowed (and counted)"""
+        now = time.time()
+        states = self._states
+        with self._lock:
+            state = states.get(key)
+            if state is None:
+                state = states[key] = self.algorithm.new_state(now, limit, window_seconds)
+            else:
+                states.move_to_end(key)
+                if state[0] <= now:
+                    state = states[key] = self.algorithm.new_state(now, limit, window_seconds)
+            allowed = self.algorithm.allow(state, now, limit, window_seconds)
+
+            # Least recently used first: drop idle keys from the front, then anything over the cap
+            for _ in range(2):
+                oldest = next(iter(states))
+                if states[oldest][0] > now or oldest == key:
+                    break
+                del states[oldest]
+            while len(states) > self.max_keys:
+                states.popitem(last=False)
+            rate_limit_keys.set(len(states))
+        if not allowed:
+            rate_limit_rejections.inc()
+        return allowed
+
+    def reset(self, key: Optional[str] = None):
+        """Forget one key (or every key)"""
+        with self._lock:
+            if key is None:
+                self._states.clear()
+            else:
+                self._states.pop(key, None)
+
+
+class StorageRateLimiter:
+    """
+    Sliding window counter over shared storage: the current window's count is
+    incremented and the previous window's read in one storage call. If the storage is
+    unreachable, the in-process fallback limiter is used, and the storage is only tried
+    again every RETRY_SECONDS so requests don't wait on connection timeouts.
+    """
+    RETRY_SECONDS = 5.0
+
+    def __init__(self, storage: RateLimitStorage, fallback: RateLimiter):
+        self.storage = storage
+        self.fallback = fallback
+        self._failing = False
+        self._retry_at = 0.0
+
+    def allow(self, key: str, limit: int, window_seconds: float) -> bool:
+        """True if the request is allowed (and counted)"""
+        now = time.time()
+        if self._failing and now < self._retry_at:
+            return self.fallback.allow(key, limit, window_seconds)
+        index = int(now // window_seconds)
+        current_key = f"rl:{key}:{index}"
+        try:
+            count, previous = self.storage.incr_and_get(current_key, 1, 2 * window_seconds, f"rl:{key}:{index - 1}")
+            previous_weight = 1.0 - (now / window_seconds - index)
+            allowed = previous * previous_weight + count <= limit
+            if not allowed:
+                # Only allowed requests count, as in the in-process limiter
+                self.storage.incr(current_key, -1, 2 * window_seconds)
+        except Exception as e:
+            rate_limit_storage_errors.inc()
+            if not self._failing:
+                print(f"Warning: {self.storage.name} rate limit storage unavailable, limiting per process: {e}")
+                self._failing = True
+            self._retry_at = now + self.RETRY_SECONDS
+            return self.fallback.allow(key, limit, window_seconds)
+        if self._failing:
+            print(f"✅ {self.storage.name} rate limit storage reachable again")
+            self._failing = False
+        if not allowed:
+            rate_limit_rejections.inc()
+        return allowed
+
+
+def get_rate_limiter(name: Optional[str] = None, max_keys: Optional[int] = None,
+                     storage: Optional[RateLimitStorage] = None):
+    """
+    Build the rate limiter configured by RATE_LIMIT_ALGORITHM (defaults to the sliding
+    window) and RATE_LIMIT_STORAGE (in-process unless a shared storage is configured)
+    """
+    algorithm_name = (name or settings.RATE_LIMIT_ALGORITHM).lower()
+    algorithm_class = RATE_LIMIT_ALGORITHMS.get(algorithm_name, SlidingWindowCounter)
+    max_keys = max_keys or settings.RATE_LIMIT_MAX_KEYS
+    storage = storage or get_rate_limit_storage()
+    if storage is None:
+        return RateLimiter(algorithm_class(), max_keys)
+    if algorithm_class is not SlidingWindowCounter:
+        print(f"Warning: {storage.name} rate limit storage only supports sliding_window, not {algorithm_name}")
+    # Per-process limiting while the storage is unreachable
+    return StorageRateLimiter(storage, RateLimiter(SlidingWindowCounter(), max_keys))
+
+
+rate_limiter = get_rate_limiter()
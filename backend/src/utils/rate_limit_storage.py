@@ -0,0 +1,228 @@
+"""
+Shared rate limit storage
+Counters with atomic increment-and-expire, shared by every uvicorn worker so limits
+hold across processes and restarts (RATE_LIMIT_STORAGE):
+- sqlite: a local SQLite file (RATE_LIMIT_SQLITE_PATH) used by all workers on the host;
+  one upsert statement per increment
+- redis: any Redis-protocol server (RATE_LIMIT_REDIS_URL); one pipelined
+  MULTI / SET NX PX / INCRBY / GET / EXEC round trip per request
+
+No lock is taken around a check: each request increments first and reads the result,
+and a request that went over the limit gives its increment back.
+"""
+import os
+import socket
+import sqlite3
+import threading
+import time
+from typing import List, Optional, Tuple
+from urllib.parse import urlparse, unquote
+
+from backend.src.config import settings
+
+
+class RateLimitStorage:
+    """
+    Base class for rate limit storage backends.
+
+    Keys are created with an expiry (ttl seconds) on their first increment; expired
+    keys read as 0 and start again from 0.
+    """
+    name = "base"
+
+    def incr(self, key: str, amount: int, ttl: float) -> int:
+        """Atomically add amount to key; its value after the increment"""
+        raise NotImplementedError
+
+    def get(self, key: str) -> int:
+        raise NotImplementedError
+
+    def incr_and_get(self, key: str, amount: int, ttl: float, other_key: str) -> Tuple[int, int]:
+        """incr(key) and get(other_key) together (one round trip where the backend allows)"""
+        return self.incr(key, amount, ttl), self.get(other_key)
+
+    def close(self):
+        pass
+
+
+class SQLiteStorage(RateLimitStorage):
+    """Counters in a SQLite file; one connection per thread, WAL so workers don't block readers"""
+    name = "sqlite"
+
+    # Expired rows are deleted every this many increments per connection
+    PURGE_EVERY = 1000
+
+    def __init__(self, path: str):
+        self.path = path
+        self._local = threading.local()
+
+    def _connection(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            # Autocommit: every statement is its own (atomic) transaction
+            conn = sqlite3.connect(self.path, timeout=5.0, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            # Counters are disposable: skip fsync on every write
+            conn.execute("PRAGMA synchronous=OFF")
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS rate_limits ("
+                "key TEXT PRIMARY KEY, value INTEGER NOT NULL, expires_at REAL NOT NULL) WITHOUT ROWID"
+            )
+            self._local.conn = conn
+            self._local.writes = 0
+        return conn
+
+    def incr(self, key, amount, ttl):
+        conn = self._connection()
+        now = time.time()
+        (value,) = conn.execute(
+            "INSERT INTO rate_limits (key, value, expires_at) VALUES (?, ?, ?) "
+            "ON CONFLICT(key) DO UPDATE SET "
+            "value = CASE WHEN expires_at <= ? THEN excluded.value ELSE value + excluded.value END, "
+            "expires_at = CASE WHEN expires_at <= ? THEN excluded.expires_at ELSE expires_at END "
+            "RETURNING value",
+            (key, amount, now + ttl, now, now),
+        ).fetchone()
+        self._local.writes += 1
+        if self._local.writes % self.PURGE_EVERY == 0:
+            conn.execute("DELETE FROM rate_limits WHERE expires_at <= ?", (now,))
+        return value
+
+    def get(self, key):
+        row = self._connection().execute(
+            "SELECT value FROM rate_limits WHERE key = ? AND expires_at > ?", (key, time.time())
+        ).fetchone()
+        return row[0] if row else 0
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+class RedisError(Exception):
+    """Error reply from the Redis server"""
+
+
+class RedisConnection:
+    """Minimal RESP client: enough for the pipelined commands RedisStorage sends"""
+
+    def __init__(self, url: str, timeout: float):
+        parsed = urlparse(url)
+        self.sock = socket.create_connection((parsed.hostname or "localhost", parsed.port or 6379), timeout)
+        self.sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        self.reader = self.sock.makefile("rb")
+        setup: List[tuple] = []
+        if parsed.password:
+            setup.append(("AUTH", unquote(parsed.username), unquote(parsed.password)) if parsed.username
+                         else ("AUTH", unquote(parsed.password)))
+        database = parsed.path.lstrip("/")
+        if database and database != "0":
+            setup.append(("SELECT", database))
+        if setup:
+            self.pipeline(setup)
+
+    @staticmethod
+    def encode(command: tuple) -> bytes:
+        parts = [b"*%d\r\n" % len(command)]
+        for arg in command:
+            data = arg if isinstance(arg, bytes) else str(arg).encode()
+            parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+        return b"".join(parts)
+
+    def read_reply(self):
+        line = self.reader.readline()
+        if not line:
+            raise ConnectionError("Redis connection closed")
+        kind, payload = line[:1], line[1:-2]
+        if kind == b"+":
+            return payload.decode()
+        if kind == b":":
+            return int(payload)
+        if kind == b"$":
+            length = int(payload)
+            if length < 0:
+                return None
+            data = self.reader.read(length + 2)
+            return data[:-2]
+        if kind == b"*":
+            length = int(payload)
+            return None if length < 0 else [self.read_reply() for _ in range(length)]
+        if kind == b"-":
+            return RedisError(payload.decode())
+        raise ConnectionError(f"Unexpected Redis reply: {line!r}")
+
+    def pipeline(self, commands: List[tuple]) -> list:
+        """Send every command in one write, then read one reply per command"""
+        self.sock.sendall(b"".join(self.encode(command) for command in commands))
+        replies = [self.read_reply() for _ in commands]
+        for reply in replies:
+            if isinstance(reply, RedisError):
+                raise reply
+        return replies
+
+    def close(self):
+        self.reader.close()
+        self.sock.close()
+
+
+class RedisStorage(RateLimitStorage):
+    """Counters in Redis (or any server speaking its protocol); one connection per thread"""
+    name = "redis"
+
+    def __init__(self, url: str, timeout: float = 0.5):
+        self.url = url
+        self.timeout = timeout
+        self._local = threading.local()
+
+    def _execute(self, commands: List[tuple]) -> list:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = RedisConnection(self.url, self.timeout)
+        try:
+            return conn.pipeline(commands)
+        except (OSError, ConnectionError):
+            # Reconnect on the next call
+            conn.close()
+            self._local.conn = None
+            raise
+
+    @staticmethod
+    def _incr_commands(key: str, amount: int, ttl: float) -> List[tuple]:
+        # SET NX PX gives a new key its expiry; INCRBY keeps it
+        return [("SET", key, 0, "PX", max(int(ttl * 1000), 1), "NX"), ("INCRBY", key, amount)]
+
+    def incr(self, key, amount, ttl):
+        replies = self._execute([("MULTI",)] + self._incr_commands(key, amount, ttl) + [("EXEC",)])
+        return int(replies[-1][1])
+
+    def get(self, key):
+        (value,) = self._execute([("GET", key)])
+        return int(value) if value is not None else 0
+
+    def incr_and_get(self, key, amount, ttl, other_key):
+        replies = self._execute(
+            [("MULTI",)] + self._incr_commands(key, amount, ttl) + [("GET", other_key), ("EXEC",)]
+        )
+        _, value, other = replies[-1]
+        return int(value), int(other) if other is not None else 0
+
+    def close(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+
+def get_rate_limit_storage(name: Optional[str] = None) -> Optional[RateLimitStorage]:
+    """Storage configured by RATE_LIMIT_STORAGE; None for in-process limiting ("memory")"""
+    name = (name or settings.RATE_LIMIT_STORAGE).lower()
+    if name == SQLiteStorage.name:
+        return SQLiteStorage(settings.RATE_LIMIT_SQLITE_PATH)
+    if name == RedisStorage.name:
+        return RedisStorage(settings.RATE_LIMIT_REDIS_URL)
+    return None
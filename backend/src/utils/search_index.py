@@ -0,0 +1,375 @@
+"""
+In-memory inverted index for job search
+Keeps token -> job postings in process so searches don't scan the jobs table
+
+Writes in this process update the index directly. Writes made by other uvicorn workers
+are picked up by a rebuild once the index is older than SEARCH_INDEX_TTL_SECONDS (the
+same bound the job document cache's TTL gives); 0 disables it, for a single worker.
+"""
+import re
+import time
+import heapq
+import threading
+from typing import Dict, List, Optional, Set, Iterable, Tuple
+
+from sqlalchemy.orm import Session, joinedload, selectinload
+from backend.src.config import settings
+from backend.src.db import models
+from backend.src.db.database import SessionLocal
+from backend.src.utils.fuzzy_index import TrigramIndex, fuzzy_index
+
+
+# Same word pattern as extract_keywords so query and index tokens line up
+TOKEN_PATTERN = re.compile(r'\b[\w\d]{2,}\b')
+
+# Field weights used by calculate_relevance_score (title 40%, description 30%, ...)
+FIELD_WEIGHTS = {
+    "title": 0.4,
+    "description": 0.3,
+    "requirements": 0.2,
+    "company": 0.05,
+}
+
+# Only the first 500 description characters are used for scoring
+DESCRIPTION_SCORE_CHARS = 500
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    """Split text into lowercase index tokens"""
+    if not text:
+        return []
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def job_to_document(job: models.Job) -> Dict:
+    """Flatten an ORM job into the fields the index stores and scores on"""
+    requirements = [req.requirement for req in job.requirements]
+    disabilities = list(job.disabilities)
+    return {
+        "id": job.id,
+        "title": job.title or "",
+        "description": job.description or "",
+        "company_name": job.company.name if job.company else None,
+        "requirements": requirements,
+        "disability_ids": [d.id for d in disabilities],
+        "disability_support": [d.name for d in disabilities],
+        "employment_type": job.employment_type,
+        "remote_type": job.remote_type,
+        "posted_at": job.posted_at,
+    }
+
+
+def indexed_job_query(db: Session):
+    """Jobs with the relationships job_to_document reads"""
+    return db.query(models.Job).options(
+        joinedload(models.Job.company),
+        selectinload(models.Job.requirements),
+        selectinload(models.Job.disabilities)
+    )
+
+
+def document_field_tokens(document: Dict) -> Dict[str, List[str]]:
+    """Tokens per indexed field of a job document"""
+    return {
+        "title": tokenize(document["title"]),
+        "description": tokenize(document["description"]),
+        "requirements": tokenize(" ".join(document["requirements"])),
+        "company": tokenize(document["company_name"]),
+    }
+
+
+class JobSearchIndex:
+    """
+    Incrementally maintained inverted index over jobs.
+
+    postings maps token -> {job_id: {field: term_frequency}}; documents keeps the
+    fields needed to score a job without touching the ORM, and field_lengths /
+    total_field_lengths hold the per-field token counts rankers normalize by.
+    Every term is mirrored into the trigram vocabulary for fuzzy lookups.
+
+    Rebuilds fill a second index and swap it in, so searches keep using the current one
+    (memory for both is held meanwhile); writes made in this process during a rebuild
+    are replayed onto the new index before the swap.
+    """
+
+    def __init__(self, vocabulary: TrigramIndex, ttl_seconds: float = 0.0):
+        self._lock = threading.RLock()
+        self._build_lock = threading.Lock()
+        self.vocabulary = vocabulary
+        self.ttl_seconds = ttl_seconds
+        self.built_at = 0.0
+        self._rebuilding = False
+        # (job_id, document or None for a removal) recorded while a rebuild runs
+        self._changes: Optional[List[Tuple[int, Optional[Dict]]]] = None
+        self.postings: Dict[str, Dict[int, Dict[str, int]]] = {}
+        self.documents: Dict[int, Dict] = {}
+        self._doc_terms: Dict[int, Set[str]] = {}
+        self.field_lengths: Dict[int, Dict[str, int]] = {}
+        self.total_field_lengths: Dict[str, int] = {field: 0 for field in FIELD_WEIGHTS}
+        self._by_employment_type: Dict[str, Set[int]] = {}
+        self._by_remote_type: Dict[str, Set[int]] = {}
+        self._by_disability: Dict[int, Set[int]] = {}
+        self.ready = False
+        self.vocabulary_loaded = False
+
+    def __len__(self):
+        return len(self.documents)
+
+    @property
+    def lock(self) -> threading.RLock:
+        """Held by readers (e.g. ranking engines) that walk the postings"""
+        return self._lock
+
+    def build(self, db: Session, batch_size: int = 1000):
+        """(Re)build the whole index from the database in id-ordered batches"""
+        with self._build_lock:
+            with self._lock:
+                self._changes = []
+            fresh = JobSearchIndex(TrigramIndex(self.vocabulary.min_similarity, self.vocabulary.max_edit_distance))
+            try:
+                last_id = 0
+                while True:
+                    jobs = indexed_job_query(db)\
+                        .filter(models.Job.id > last_id)\
+                        .order_by(models.Job.id)\
+                        .limit(batch_size)\
+                        .all()
+                    if not jobs:
+                        break
+                    for job in jobs:
+                        fresh._add(job_to_document(job))
+                    last_id = jobs[-1].id
+                    db.expunge_all()
+                fresh._add_name_terms(db)
+            except BaseException:
+                with self._lock:
+                    self._changes = None
+                raise
+            with self._lock:
+                # Writes committed while the batches were read may be missing from them
+                for job_id, document in self._changes:
+                    fresh._remove(job_id)
+                    if document is not None:
+                        fresh._add(document)
+                self._changes = None
+                self._take(fresh)
+                self.ready = True
+                self.vocabulary_loaded = True
+                self.built_at = time.monotonic()
+        print(f"✅ Job search index built ({len(self.documents)} jobs, {len(self.postings)} terms)")
+
+    def refresh_if_stale(self):
+        """
+        Start a rebuild on a background thread once the index is older than ttl_seconds,
+        so jobs written by other workers show up; searches use the current index meanwhile
+        """
+        if not self.ready or self.ttl_seconds <= 0 or time.monotonic() - self.built_at < self.ttl_seconds:
+            return
+        with self._lock:
+            if self._rebuilding:
+                return
+            self._rebuilding = True
+        threading.Thread(target=self._rebuild, name="job-index-rebuild", daemon=True).start()
+
+    def _rebuild(self):
+        db = SessionLocal()
+        try:
+            self.build(db)
+        except Exception as e:
+            print(f"Warning: Could not rebuild the job search index: {e}")
+            # Try again after another ttl_seconds
+            self.built_at = time.monotonic()
+        finally:
+            db.close()
+            self._rebuilding = False
+
+    def _take(self, other: "JobSearchIndex"):
+        """Swap in other's contents (call under self._lock)"""
+        self.postings = other.postings
+        self.documents = other.documents
+        self._doc_terms = other._doc_terms
+        self.field_lengths = other.field_lengths
+        self.total_field_lengths = other.total_field_lengths
+        self._by_employment_type = other._by_employment_type
+        self._by_remote_type = other._by_remote_type
+        self._by_disability = other._by_disability
+        self.vocabulary.replace(other.vocabulary)
+
+    def _record(self, job_id: int, document: Optional[Dict]):
+        """Note a write for the rebuild in progress, if any (call under self._lock)"""
+        if self._changes is not None:
+            self._changes.append((job_id, document))
+
+    def load_vocabulary(self, db: Session, batch_size: int = 1000):
+        """
+        Fill the trigram vocabulary from the database without building the index, so
+        the SQL search path keeps its typo tolerance. Runs once; build() also loads it.
+        """
+        if self.vocabulary_loaded:
+            return
+        with self._lock:
+            if self.vocabulary_loaded:
+                return
+            terms: Set[str] = set()
+            last_id = 0
+            while True:
+                rows = db.query(models.Job.id, models.Job.title, models.Job.description)\
+                    .filter(models.Job.id > last_id)\
+                    .order_by(models.Job.id)\
+                    .limit(batch_size)\
+                    .all()
+                if not rows:
+                    break
+                for _, title, description in rows:
+                    terms.update(tokenize(title), tokenize(description))
+                last_id = rows[-1][0]
+            for column in (models.JobRequirement.requirement, models.Company.name):
+                for (text,) in db.query(column).all():
+                    terms.update(tokenize(text))
+            # Same reference counts the index keeps: one per term with postings
+            self.vocabulary.add_terms(term for term in terms if term not in self.postings)
+            self._add_name_terms(db)
+            self.vocabulary_loaded = True
+        print(f"✅ Job search vocabulary loaded ({len(self.vocabulary)} terms)")
+
+    def _add_name_terms(self, db: Session):
+        # Skill and disability names can be searched for (and corrected to) as well
+        for model in (models.Skill, models.Disability):
+            for (name,) in db.query(model.name).all():
+                self.vocabulary.add_terms(tokenize(name))
+
+    def index_job(self, job: models.Job):
+        """Add or replace a single job (call after the write is committed)"""
+        document = job_to_document(job)
+        with self._lock:
+            self._remove(document["id"])
+            self._add(document)
+            self._record(document["id"], document)
+
+    def reindex_jobs(self, db: Session, *criteria):
+        """
+        Re-read the indexed jobs matching criteria, e.g. after a company or disability
+        rename is committed (their names are part of the job documents and tokens)
+        """
+        if not self.ready:
+            return
+        jobs = indexed_job_query(db).filter(*criteria).all()
+        with self._lock:
+            for job in jobs:
+                document = job_to_document(job)
+                self._remove(job.id)
+                self._add(document)
+                self._record(job.id, document)
+
+    def remove_job(self, job_id: int):
+        with self._lock:
+            self._remove(job_id)
+            self._record(job_id, None)
+
+    def get(self, job_id: int) -> Optional[Dict]:
+        return self.documents.get(job_id)
+
+    def terms_containing(self, fragment: str) -> List[str]:
+        """Vocabulary terms containing fragment (the index equivalent of LIKE '%fragment%')"""
+        return self.vocabulary.containing(fragment)
+
+    def document_frequency(self, term: str) -> int:
+        return len(self.postings.get(term, ()))
+
+    def average_field_length(self, field: str) -> float:
+        if not self.documents:
+            return 0.0
+        return self.total_field_lengths[field] / len(self.documents)
+
+    def filter_ids(
+        self,
+        disability_ids: Optional[List[int]] = None,
+        skill_names: Optional[List[str]] = None,
+        employment_type: Optional[str] = None,
+        remote_type: Optional[str] = None,
+        candidates: Optional[Iterable[int]] = None,
+    ) -> Set[int]:
+        """Apply the search filters to candidates (or to every indexed job)"""
+        with self._lock:
+            ids = set(candidates) if candidates is not None else set(self.documents)
+            if disability_ids:
+                supported = set()
+                for disability_id in disability_ids:
+                    supported |= self._by_disability.get(disability_id, set())
+                ids &= supported
+            if employment_type:
+                ids &= self._by_employment_type.get(employment_type, set())
+            if remote_type:
+                ids &= self._by_remote_type.get(remote_type, set())
+            if skill_names:
+                ids = {
+                    job_id for job_id in ids
+                    if any(name in self.documents[job_id]["requirements_text"] for name in skill_names)
+                }
+            return ids
+
+    def first_ids(self, ids: Iterable[int], count: int) -> List[int]:
+        """Lowest job ids first, matching the primary-key order the SQL path returned"""
+        return heapq.nsmallest(count, ids)
+
+    def _add(self, document: Dict):
+        job_id = document["id"]
+        terms = set()
+        lengths = {}
+        for field, tokens in document_field_tokens(document).items():
+            lengths[field] = len(tokens)
+            self.total_field_lengths[field] += len(tokens)
+            for token in tokens:
+                if token not in self.postings:
+                    self.vocabulary.add(token)
+                fields = self.postings.setdefault(token, {}).setdefault(job_id, {})
+                fields[field] = fields.get(field, 0) + 1
+                terms.add(token)
+        self._doc_terms[job_id] = terms
+        self.field_lengths[job_id] = lengths
+
+        # Scoring only needs the description prefix, so don't keep whole texts in memory
+        stored = dict(document)
+        stored["description"] = document["description"][:DESCRIPTION_SCORE_CHARS]
+        stored["requirements_text"] = " ".join(document["requirements"]).lower()
+        self.documents[job_id] = stored
+
+        if document["employment_type"]:
+            self._by_employment_type.setdefault(document["employment_type"], set()).add(job_id)
+        if document["remote_type"]:
+            self._by_remote_type.setdefault(document["remote_type"], set()).add(job_id)
+        for disability_id in document["disability_ids"]:
+            self._by_disability.setdefault(disability_id, set()).add(job_id)
+
+    def _remove(self, job_id: int):
+        document = self.documents.pop(job_id, None)
+        if document is None:
+            return
+        for token in self._doc_terms.pop(job_id, ()):
+            self._drop_posting(token, job_id)
+        for field, length in self.field_lengths.pop(job_id, {}).items():
+            self.total_field_lengths[field] -= length
+
+        for index, key in (
+            (self._by_employment_type, document["employment_type"]),
+            (self._by_remote_type, document["remote_type"]),
+        ):
+            if key and key in index:
+                index[key].discard(job_id)
+        for disability_id in document["disability_ids"]:
+            if disability_id in self._by_disability:
+                self._by_disability[disability_id].discard(job_id)
+
+    def _drop_posting(self, token: str, job_id: int):
+        postings = self.postings.get(token)
+        if postings is None:
+            return
+        postings.pop(job_id, None)
+        if not postings:
+            del self.postings[token]
+            self.vocabulary.remove(token)
+
+
+# Process-wide index, built on startup, kept current by the job write routes and
+# rebuilt every SEARCH_INDEX_TTL_SECONDS for other workers' writes
+job_index = JobSearchIndex(fuzzy_index, settings.SEARCH_INDEX_TTL_SECONDS)
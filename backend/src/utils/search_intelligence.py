@@ -1,30 +1,34 @@
 """
 Intelligent search utilities for better job matching
 """
-from typing import List, Dict, Optional
+from typing import List, Dict, Optional, Iterable, Tuple
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, func
+from sqlalchemy.ext.asyncio import AsyncSession
+from starlette.concurrency import run_in_threadpool
+from sqlalchemy import or_, and_, func, select
+from sqlalchemy.dialects.mysql import match as mysql_match
+from sqlalchemy.exc import OperationalError, ProgrammingError
+from backend.src.config import settings
 from backend.src.db import models
+from backend.src.db.job_queries import job_listing_query
+from backend.src.utils.search_index import (
+    FIELD_WEIGHTS, job_index, job_to_document, document_field_tokens, tokenize
+)
+from backend.src.utils.fuzzy_index import fuzzy_index
+from backend.src.utils.job_documents import job_document_cache, build_job_document, document_to_listing
+from backend.src.utils.ranking import ranking_engine
+from backend.src.utils.synonyms import synonym_table
 from datetime import datetime
+import heapq
 import re
 
 
-# Skill synonyms and related terms for intelligent matching
-SKILL_SYNONYMS = {
-    "python": ["python", "py", "django", "flask", "pandas", "numpy"],
-    "javascript": ["javascript", "js", "node", "react", "vue", "angular", "typescript"],
-    "java": ["java", "spring", "hibernate", "jsp"],
-    "developer": ["developer", "programmer", "coder", "engineer", "software engineer", "dev"],
-    "designer": ["designer", "ui", "ux", "graphic designer", "web designer"],
-    "writer": ["writer", "content writer", "copywriter", "blogger", "author"],
-    "manager": ["manager", "supervisor", "lead", "director"],
-    "analyst": ["analyst", "data analyst", "business analyst", "financial analyst"],
-    "assistant": ["assistant", "admin", "administrative", "secretary"],
-    "customer": ["customer service", "support", "help desk", "client service"],
-    "remote": ["remote", "work from home", "wfh", "telecommute", "distributed"],
-    "full-time": ["full-time", "fulltime", "ft", "permanent"],
-    "part-time": ["part-time", "parttime", "pt", "casual"],
-}
+# Share of the relevance score that comes from matching the query text
+TEXT_MATCH_WEIGHT = sum(FIELD_WEIGHTS.values())
+
+# Chat reranking: weight of the retrieval similarity (0..1) next to the keyword
+# (1-2 points) and disability match (10 per match) signals
+SEMANTIC_WEIGHT = 5.0
 
 
 def extract_keywords(query: str) -> List[str]:
@@ -51,25 +55,23 @@ def extract_keywords(query: str) -> List[str]:
 
 
 def get_synonyms(word: str) -> List[str]:
-    """Get synonyms and related terms for a word"""
-    word_lower = word.lower()
-    synonyms = [word_lower]  # Include the word itself
-    
-    # Check skill synonyms
-    for key, values in SKILL_SYNONYMS.items():
-        if word_lower in values or word_lower == key:
-            synonyms.extend(values)
-    
-    return list(set(synonyms))  # Remove duplicates
+    """Get synonyms and related terms for a word (precompiled lookup, see synonyms.py)"""
+    return list(synonym_table.expand(word))
 
 
 def calculate_word_match_score(text: str, keywords: List[str]) -> float:
-    """Calculate how well text matches keywords (0.0 to 1.0) - very flexible matching"""
+    """
+    Calculate how well text matches keywords (0.0 to 1.0) - very flexible matching
+    Standalone text scorer; job relevance now goes through the ranking engine (ranking.py)
+    """
     if not text or not keywords:
         return 0.0
     
     text_lower = text.lower()
     total_score = 0.0
+    # All synonym-table terms present in the text, found in one pass
+    text_terms = synonym_table.find_terms(text_lower)
+    text_words = set(tokenize(text_lower))
     
     for keyword in keywords:
         keyword_lower = keyword.lower()
@@ -80,40 +82,14 @@ def calculate_word_match_score(text: str, keywords: List[str]) -> float:
             continue
         
         # Check synonyms
-        synonyms = get_synonyms(keyword_lower)
-        found_synonym = False
-        for synonym in synonyms:
-            if synonym in text_lower:
-                total_score += 0.8  # High credit for synonym match
-                found_synonym = True
-                break
-        
-        if found_synonym:
+        if any(synonym in text_terms for synonym in synonym_table.expand(keyword_lower)):
+            total_score += 0.8  # High credit for synonym match
             continue
         
-        # Very flexible partial matching - match any part of keyword
-        if len(keyword_lower) >= 2:
-            # Check if any word in text contains part of keyword
-            for word in text_lower.split():
-                # Match if keyword starts with word or word starts with keyword
-                if len(keyword_lower) >= 3 and len(word) >= 3:
-                    # Check first 3 characters match
-                    if keyword_lower[:3] in word or word[:3] in keyword_lower:
-                        total_score += 0.5
-                        break
-                    # Check if any 3+ char substring matches
-                    if len(keyword_lower) >= 3:
-                        for i in range(len(keyword_lower) - 2):
-                            substr = keyword_lower[i:i+3]
-                            if substr in word:
-                                total_score += 0.4
-                                break
-                        if total_score > 0:
-                            break
-                # Very short keywords (2 chars) - exact match only
-                elif len(keyword_lower) == 2 and keyword_lower in word:
-                    total_score += 0.3
-                    break
+        # Typo-tolerant match: one trigram-index probe per keyword, not a scan of the text
+        if len(keyword_lower) >= 3:
+            if any(term in text_words for term, _ in fuzzy_index.correct(keyword_lower)):
+                total_score += 0.5
     
     # Normalize by number of keywords - more flexible scoring
     if len(keywords) > 0:
@@ -129,7 +105,20 @@ def calculate_relevance_score(job: models.Job, query: str, user_profile: Optiona
     Returns score between 0.0 and 1.0
     More flexible and intelligent than exact word matching
     """
-    score = 0.0
+    return score_job_document(job_to_document(job), query, user_profile)
+
+
+def score_job_document(
+    job: Dict,
+    query: str,
+    user_profile: Optional[Dict] = None,
+    text_score: Optional[float] = None,
+) -> float:
+    """
+    Relevance score for a flattened job document (see search_index.job_to_document)
+    Lets indexed jobs be scored without loading ORM objects. Pass text_score when the
+    ranking engine already scored the job in a batch.
+    """
     query_lower = query.lower() if query else ""
     
     if not query_lower:
@@ -138,66 +127,93 @@ def calculate_relevance_score(job: models.Job, query: str, user_profile: Optiona
         if user_profile:
             # Boost if job matches user profile
             user_skills = [s.lower() for s in user_profile.get("skills", [])]
-            job_requirements_text = " ".join([req.requirement.lower() for req in job.requirements])
+            job_requirements_text = " ".join(job["requirements"]).lower()
             if any(skill in job_requirements_text for skill in user_skills):
                 base_score += 0.2
             
             user_disabilities = [d.lower() for d in user_profile.get("disabilities", [])]
-            job_disabilities = [d.name.lower() for d in job.disabilities_supported]
+            job_disabilities = [d.lower() for d in job["disability_support"]]
             if any(dis in job_disabilities for dis in user_disabilities):
                 base_score += 0.3
         
         return min(base_score, 1.0)
     
-    # Extract keywords from query
-    keywords = extract_keywords(query_lower)
-    
-    # Title match (highest weight - 40%)
-    title_score = calculate_word_match_score(job.title, keywords)
-    score += title_score * 0.4
-    
-    # Description match (30%)
-    desc_score = calculate_word_match_score(job.description[:500], keywords)  # First 500 chars
-    score += desc_score * 0.3
-    
-    # Requirements match (20%)
-    req_text = " ".join([req.requirement for req in job.requirements])
-    req_score = calculate_word_match_score(req_text, keywords)
-    score += req_score * 0.2
+    if text_score is None:
+        # Partial matches are looked up in the job's own vocabulary
+        field_tokens = document_field_tokens(job)
+        vocabulary = set().union(*field_tokens.values())
+        expanded = [expand_keyword(kw, vocabulary) for kw in extract_keywords(query_lower)]
+        text_score = ranking_engine.score_fields(field_tokens, expanded)
     
-    # Company name match (5%)
-    if job.company:
-        company_score = calculate_word_match_score(job.company.name, keywords)
-        score += company_score * 0.05
-    
-    # User profile matching (bonus points)
-    if user_profile:
-        # Match user skills with job requirements
-        user_skills = [s.lower() for s in user_profile.get("skills", [])]
-        job_requirements_text = " ".join([req.requirement.lower() for req in job.requirements])
-        
-        skill_matches = sum(1 for skill in user_skills if skill in job_requirements_text)
-        if skill_matches > 0:
-            score += min(skill_matches * 0.1, 0.15)  # Max 15% bonus
-        
-        # Match user disabilities with job support
-        user_disabilities = [d.lower() for d in user_profile.get("disabilities", [])]
-        job_disabilities = [d.name.lower() for d in job.disabilities_supported]
-        if any(dis in job_disabilities for dis in user_disabilities):
-            score += 0.15  # 15% bonus for disability match
-        
-        # Match preferred job type
-        if user_profile.get("preferred_job_type"):
-            pref_type = user_profile["preferred_job_type"].lower()
-            if pref_type == job.employment_type.lower():
-                score += 0.1  # 10% bonus
-            if pref_type == job.remote_type.lower():
-                score += 0.1  # 10% bonus
+    # Title/description/requirements/company matches (95% between them)
+    score = text_score * TEXT_MATCH_WEIGHT
+    score += profile_bonus(job, user_profile)
     
     # Normalize score to 0-1 range
     return min(score, 1.0)
 
 
+def profile_bonus(job: Dict, user_profile: Optional[Dict]) -> float:
+    """Bonus points for matching the user's skills, disabilities and preferred job type"""
+    if not user_profile:
+        return 0.0
+    
+    bonus = 0.0
+    # Match user skills with job requirements
+    user_skills = [s.lower() for s in user_profile.get("skills", [])]
+    job_requirements_text = " ".join(job["requirements"]).lower()
+    
+    skill_matches = sum(1 for skill in user_skills if skill in job_requirements_text)
+    if skill_matches > 0:
+        bonus += min(skill_matches * 0.1, 0.15)  # Max 15% bonus
+    
+    # Match user disabilities with job support
+    user_disabilities = [d.lower() for d in user_profile.get("disabilities", [])]
+    job_disabilities = [d.lower() for d in job["disability_support"]]
+    if any(dis in job_disabilities for dis in user_disabilities):
+        bonus += 0.15  # 15% bonus for disability match
+    
+    # Match preferred job type
+    if user_profile.get("preferred_job_type"):
+        pref_type = user_profile["preferred_job_type"].lower()
+        if pref_type == (job["employment_type"] or "").lower():
+            bonus += 0.1  # 10% bonus
+        if pref_type == (job["remote_type"] or "").lower():
+            bonus += 0.1  # 10% bonus
+    
+    return bonus
+
+
+def expand_keyword(keyword: str, vocabulary: Optional[Iterable[str]] = None) -> Dict[str, float]:
+    """
+    Map a query keyword to index terms with match weights: exact 1.0, synonym 0.8,
+    partial (substring) or typo correction 0.5. Partial matches come from vocabulary,
+    or the job index; misspelled keywords are corrected against the trigram index.
+    """
+    keyword_lower = keyword.lower()
+    if vocabulary is None:
+        partial = job_index.terms_containing(keyword_lower)
+    else:
+        partial = [term for term in vocabulary if keyword_lower in term]
+    terms = {term: 0.5 for term in partial}
+    if keyword_lower not in fuzzy_index and len(keyword_lower) >= 3:
+        for term, _ in fuzzy_index.correct(keyword_lower):
+            terms[term] = 0.5
+    for token in synonym_table.expand_tokens(keyword_lower):
+        terms[token] = 0.8
+    terms[keyword_lower] = 1.0
+    return terms
+
+
+def _format_search_result(document: Dict, score: float) -> Dict:
+    """Shape a job document (see utils/job_documents.py) for search responses"""
+    result = document_to_listing(document)
+    has_location = document["location_city"] is not None or document["location_country"] is not None
+    result["location"] = f"{document['location_city']}, {document['location_country']}" if has_location else None
+    result["relevance_score"] = round(score, 2)
+    return result
+
+
 def intelligent_job_search(
     db: Session,
     query: Optional[str] = None,
@@ -207,13 +223,178 @@ def intelligent_job_search(
     remote_type: Optional[str] = None,
     user_profile: Optional[Dict] = None,
     limit: int = 20,
+    backend: Optional[str] = None,
 ) -> List[Dict]:
     """
     Perform intelligent job search with relevance scoring
     Only returns results if at least one filter or query is provided
+    Runs on the search backend named by backend (default: SEARCH_BACKEND setting)
     """
-    # Check if any filter or query is provided
-    has_query = query and query.strip()
+    return get_search_backend(backend).search(
+        db, query, disability_ids, skill_ids, employment_type, remote_type, user_profile, limit
+    )
+
+
+class SearchBackend:
+    """Base class for job search backends (candidate retrieval + relevance scoring)"""
+    name = "base"
+
+    def search(
+        self,
+        db: Session,
+        query: Optional[str],
+        disability_ids: Optional[List[int]],
+        skill_ids: Optional[List[int]],
+        employment_type: Optional[str],
+        remote_type: Optional[str],
+        user_profile: Optional[Dict],
+        limit: int,
+    ) -> List[Dict]:
+        raise NotImplementedError
+
+
+class PythonSearchBackend(SearchBackend):
+    """
+    Python scorer: the in-memory job index when it is built, otherwise SQL LIKE
+    candidates scored in Python
+    """
+    name = "python"
+
+    def search(self, db, query, disability_ids, skill_ids, employment_type, remote_type, user_profile, limit):
+        job_index.refresh_if_stale()
+        if job_index.ready:
+            return _index_job_search(
+                db, query, disability_ids, skill_ids, employment_type, remote_type, user_profile, limit
+            )
+        return _sql_job_search(
+            db, query, disability_ids, skill_ids, employment_type, remote_type, user_profile, limit
+        )
+
+
+class MySQLFullTextSearchBackend(SearchBackend):
+    """
+    MySQL FULLTEXT search over jobs(title, description) and job_requirements(requirement).
+
+    Requires the indexes from scripts/migrations/migrate_fulltext_indexes.py. MySQL
+    relevance is normalized per result set and combined with the usual profile
+    bonuses. Filter-only searches, and any search while the FULLTEXT indexes are
+    missing, go to the Python backend.
+    """
+    name = "mysql_fulltext"
+
+    # Share of the text score per source (title+description vs requirements)
+    JOB_TEXT_WEIGHT = FIELD_WEIGHTS["title"] + FIELD_WEIGHTS["description"]
+    REQUIREMENT_WEIGHT = FIELD_WEIGHTS["requirements"]
+
+    def __init__(self, boolean_mode: bool = False, fallback: Optional[SearchBackend] = None):
+        self.boolean_mode = boolean_mode
+        self.fallback = fallback or PythonSearchBackend()
+
+    def _against(self, query: str) -> str:
+        if not self.boolean_mode:
+            return query
+        # Any keyword may match (no "+"); trailing * keeps "dev" matching "developer"
+        return " ".join(f"{kw}*" for kw in extract_keywords(query))
+
+    def _match(self, *columns, against: str):
+        clause = mysql_match(*columns, against=against)
+        return clause.in_boolean_mode() if self.boolean_mode else clause.in_natural_language_mode()
+
+    def _apply_filters(self, job_query, db, disability_ids, skill_ids, employment_type, remote_type):
+        if disability_ids:
+            job_query = job_query.filter(models.Job.id.in_(
+                select(models.job_disability_support.c.job_id).where(
+                    models.job_disability_support.c.disability_id.in_(disability_ids)
+                )
+            ))
+        if skill_ids:
+            skill_names = [name.lower() for (name,) in
+                           db.query(models.Skill.name).filter(models.Skill.id.in_(skill_ids)).all()]
+            if skill_names:
+                job_query = job_query.filter(models.Job.id.in_(
+                    select(models.JobRequirement.job_id).where(or_(
+                        *[func.lower(models.JobRequirement.requirement).like(f"%{name}%") for name in skill_names]
+                    ))
+                ))
+        if employment_type:
+            job_query = job_query.filter(models.Job.employment_type == employment_type)
+        if remote_type:
+            job_query = job_query.filter(models.Job.remote_type == remote_type)
+        return job_query
+
+    def search(self, db, query, disability_ids, skill_ids, employment_type, remote_type, user_profile, limit):
+        has_query, _ = _has_search_input(query, disability_ids, skill_ids, employment_type, remote_type)
+        against = self._against(query.strip()) if has_query else ""
+        if not against:
+            return self.fallback.search(
+                db, query, disability_ids, skill_ids, employment_type, remote_type, user_profile, limit
+            )
+        
+        fetch_limit = limit * 5
+        job_match = self._match(models.Job.title, models.Job.description, against=against)
+        requirement_match = self._match(models.JobRequirement.requirement, against=against)
+        try:
+            # Two index-driven lookups rather than one OR across a join, which MySQL
+            # can't serve from the FULLTEXT indexes
+            job_rows = self._apply_filters(
+                db.query(models.Job.id, job_match.label("score")).filter(job_match),
+                db, disability_ids, skill_ids, employment_type, remote_type,
+            ).order_by(job_match.desc()).limit(fetch_limit).all()
+            requirement_rows = self._apply_filters(
+                db.query(models.JobRequirement.job_id, func.max(requirement_match).label("score"))
+                .join(models.Job, models.Job.id == models.JobRequirement.job_id)
+                .filter(requirement_match),
+                db, disability_ids, skill_ids, employment_type, remote_type,
+            ).group_by(models.JobRequirement.job_id)\
+                .order_by(func.max(requirement_match).desc())\
+                .limit(fetch_limit)\
+                .all()
+        except (OperationalError, ProgrammingError) as e:
+            # Most likely the FULLTEXT indexes haven't been created yet
+            db.rollback()
+            print(f"Full-text search unavailable, using {self.fallback.name} backend: {e}")
+            return self.fallback.search(
+                db, query, disability_ids, skill_ids, employment_type, remote_type, user_profile, limit
+            )
+        
+        text_scores: Dict[int, float] = {}
+        for rows, weight in ((job_rows, self.JOB_TEXT_WEIGHT), (requirement_rows, self.REQUIREMENT_WEIGHT)):
+            top = max((float(score) for _, score in rows), default=0.0) or 1.0
+            for job_id, score in rows:
+                text_scores[job_id] = text_scores.get(job_id, 0.0) + weight * float(score) / top
+        normalizer = self.JOB_TEXT_WEIGHT + self.REQUIREMENT_WEIGHT
+        candidate_ids = heapq.nlargest(fetch_limit, text_scores, key=text_scores.get)
+        
+        jobs_with_scores = []
+        for document in job_document_cache.load(db, candidate_ids):
+            text_score = text_scores[document["id"]] / normalizer
+            score = score_job_document(document, query, user_profile, text_score)
+            jobs_with_scores.append((document, score))
+        jobs_with_scores.sort(key=lambda x: x[1], reverse=True)
+        return [_format_search_result(document, score) for document, score in jobs_with_scores[:limit]]
+
+
+SEARCH_BACKENDS = {
+    "python": lambda: PythonSearchBackend(),
+    "mysql_fulltext": lambda: MySQLFullTextSearchBackend(
+        boolean_mode=settings.SEARCH_FULLTEXT_MODE.lower() == "boolean"
+    ),
+}
+_search_backends: Dict[str, SearchBackend] = {}
+
+
+def get_search_backend(name: Optional[str] = None) -> SearchBackend:
+    """The search backend called name (default: SEARCH_BACKEND), created once per process"""
+    name = (name or settings.SEARCH_BACKEND).lower()
+    if name not in SEARCH_BACKENDS:
+        name = "python"
+    if name not in _search_backends:
+        _search_backends[name] = SEARCH_BACKENDS[name]()
+    return _search_backends[name]
+
+
+def _has_search_input(query, disability_ids, skill_ids, employment_type, remote_type):
+    has_query = bool(query and query.strip())
     # Only count filters if they have actual values (not "All" / empty)
     has_filters = bool(
         (disability_ids and len(disability_ids) > 0) or 
@@ -221,50 +402,169 @@ def intelligent_job_search(
         (employment_type and employment_type.strip()) or 
         (remote_type and remote_type.strip())
     )
+    return has_query, has_filters
+
+
+async def async_job_search(
+    db: AsyncSession,
+    query: Optional[str] = None,
+    disability_ids: Optional[List[int]] = None,
+    skill_ids: Optional[List[int]] = None,
+    employment_type: Optional[str] = None,
+    remote_type: Optional[str] = None,
+    user_profile: Optional[Dict] = None,
+    limit: int = 20,
+    backend: Optional[str] = None,
+) -> List[Dict]:
+    """
+    intelligent_job_search for async routes. Against the job index, the ranking (index
+    lookups, BM25F, fuzzy expansion) runs in the threadpool and only the skill lookup
+    and result hydration run on the session; other backends query the database
+    throughout and run on the session as a whole.
+    """
+    search_backend = get_search_backend(backend)
+    if isinstance(search_backend, PythonSearchBackend):
+        job_index.refresh_if_stale()
+    if not (isinstance(search_backend, PythonSearchBackend) and job_index.ready):
+        return await db.run_sync(
+            search_backend.search, query, disability_ids, skill_ids, employment_type, remote_type, user_profile, limit
+        )
+    skill_names = await db.run_sync(load_skill_names, skill_ids) if skill_ids else None
+    ranked = await run_in_threadpool(
+        rank_indexed_jobs, query, disability_ids, skill_ids, skill_names, employment_type, remote_type,
+        user_profile, limit,
+    )
+    return await db.run_sync(load_search_results, ranked)
+
+
+def load_skill_names(db: Session, skill_ids: Optional[List[int]]) -> Optional[List[str]]:
+    """Lowercase names of skill_ids; unknown ids are skipped, so the list may be empty"""
+    if not skill_ids:
+        return None
+    skills = db.query(models.Skill.name).filter(models.Skill.id.in_(skill_ids)).all()
+    return [name.lower() for (name,) in skills]
+
+
+def load_search_results(db: Session, ranked: List[Tuple[int, float]]) -> List[Dict]:
+    """Search results for ranked (job_id, score) pairs, from the full cached job documents"""
+    # Index documents hold truncated descriptions; responses use the full cached documents
+    scores = dict(ranked)
+    return [
+        _format_search_result(document, scores[document["id"]])
+        for document in job_document_cache.load(db, scores)
+    ]
+
+
+def _index_job_search(
+    db: Session,
+    query: Optional[str],
+    disability_ids: Optional[List[int]],
+    skill_ids: Optional[List[int]],
+    employment_type: Optional[str],
+    remote_type: Optional[str],
+    user_profile: Optional[Dict],
+    limit: int,
+) -> List[Dict]:
+    """Candidate retrieval and scoring against job_index; MySQL only hydrates the top-k"""
+    ranked = rank_indexed_jobs(
+        query, disability_ids, skill_ids, load_skill_names(db, skill_ids), employment_type, remote_type,
+        user_profile, limit,
+    )
+    return load_search_results(db, ranked)
+
+
+def rank_indexed_jobs(
+    query: Optional[str],
+    disability_ids: Optional[List[int]],
+    skill_ids: Optional[List[int]],
+    skill_names: Optional[List[str]],
+    employment_type: Optional[str],
+    remote_type: Optional[str],
+    user_profile: Optional[Dict],
+    limit: int,
+) -> List[Tuple[int, float]]:
+    """Top (job_id, score) pairs from job_index alone (no database access)"""
+    has_query, has_filters = _has_search_input(query, disability_ids, skill_ids, employment_type, remote_type)
+    
+    if not has_query and not has_filters:
+        # Same candidate window as the SQL path: the first limit*2 jobs
+        candidate_ids = job_index.first_ids(job_index.filter_ids(), limit * 2)
+        jobs_with_scores = []
+        for job_id in candidate_ids:
+            document = job_index.get(job_id)
+            if document:
+                jobs_with_scores.append((document, score_job_document(document, "", user_profile)))
+        jobs_with_scores.sort(key=lambda x: (x[1], x[0]["posted_at"] or datetime.min), reverse=True)
+    else:
+        # Unknown skill ids leave skill_names empty, which doesn't filter (same as SQL)
+        if has_query:
+            keywords = extract_keywords(query.strip()) or [query.strip().lower()]
+            matches = ranking_engine.score([expand_keyword(kw) for kw in keywords])
+            candidate_ids = job_index.filter_ids(
+                disability_ids, skill_names, employment_type, remote_type, candidates=matches
+            )
+            # Add profile bonuses only for the strongest text matches
+            candidate_ids = heapq.nlargest(limit * 5, candidate_ids, key=lambda job_id: matches[job_id])
+        else:
+            candidate_ids = job_index.first_ids(
+                job_index.filter_ids(disability_ids, skill_names, employment_type, remote_type),
+                limit * 10,
+            )
+        
+        min_score = 0.05 if has_query else 0.0
+        jobs_with_scores = []
+        for job_id in candidate_ids:
+            document = job_index.get(job_id)
+            if not document:
+                continue
+            text_score = matches[job_id] if has_query else None
+            score = score_job_document(document, query or "", user_profile, text_score)
+            if score >= min_score:
+                jobs_with_scores.append((document, score))
+        jobs_with_scores.sort(key=lambda x: x[1], reverse=True)
+    
+    return [(document["id"], score) for document, score in jobs_with_scores[:limit]]
+
+
+def _sql_job_search(
+    db: Session,
+    query: Optional[str],
+    disability_ids: Optional[List[int]],
+    skill_ids: Optional[List[int]],
+    employment_type: Optional[str],
+    remote_type: Optional[str],
+    user_profile: Optional[Dict],
+    limit: int,
+) -> List[Dict]:
+    """Original SQL LIKE search, used until the job index has been built"""
+    # Check if any filter or query is provided
+    has_query, has_filters = _has_search_input(query, disability_ids, skill_ids, employment_type, remote_type)
     
     # If no query and no filters, return ALL jobs (when "All" is selected)
     if not has_query and not has_filters:
         # Return all jobs when no filters selected
-        job_query = db.query(models.Job)
+        job_query = job_listing_query(db)
         jobs = job_query.limit(limit * 2).all()
         
         # Score all jobs (they'll all get similar scores)
         jobs_with_scores = []
         for job in jobs:
-            score = calculate_relevance_score(job, "", user_profile)
-            jobs_with_scores.append((job, score))
+            document = build_job_document(job)
+            score = score_job_document(document, "", user_profile)
+            jobs_with_scores.append((document, score))
         
         # Sort by score (or posted_at if scores similar)
-        jobs_with_scores.sort(key=lambda x: (x[1], x[0].posted_at or datetime.min), reverse=True)
+        jobs_with_scores.sort(key=lambda x: (x[1], x[0]["posted_at"] or datetime.min), reverse=True)
         top_jobs = jobs_with_scores[:limit]
         
-        # Format results
-        results = []
-        for job, score in top_jobs:
-            requirements = [req.requirement for req in job.requirements]
-            disability_support = [d.name for d in job.disabilities_supported]
-            
-            results.append({
-                "id": job.id,
-                "title": job.title,
-                "description": job.description,
-                "company_name": job.company.name if job.company else None,
-                "company_id": job.company_id,
-                "location_city": job.location.city if job.location else None,
-                "location_country": job.location.country if job.location else None,
-                "location": f"{job.location.city}, {job.location.country}" if job.location else None,
-                "employment_type": job.employment_type,
-                "remote_type": job.remote_type,
-                "required_skills": requirements,
-                "disability_support": disability_support,
-                "posted_at": job.posted_at.isoformat() if job.posted_at else None,
-                "relevance_score": round(score, 2),
-            })
-        
-        return results
+        return [_format_search_result(document, score) for document, score in top_jobs]
     
-    # Start with base query
-    job_query = db.query(models.Job)
+    # Typo correction in expand_keyword needs the vocabulary even without the index
+    if has_query:
+        job_index.load_vocabulary(db)
+    
+    # Start with base query (relationships eager-loaded for scoring and formatting)
+    job_query = job_listing_query(db)
     
     # Apply filters
     if disability_ids:
@@ -335,11 +635,12 @@ def intelligent_job_search(
     # Calculate relevance scores for all jobs
     jobs_with_scores = []
     for job in jobs:
-        score = calculate_relevance_score(job, query or "", user_profile)
+        document = build_job_document(job)
+        score = score_job_document(document, query or "", user_profile)
         # Very flexible - accept jobs with any match (lower threshold)
         min_score = 0.05 if has_query else 0.0  # Lower threshold for more results
         if score >= min_score:
-            jobs_with_scores.append((job, score))
+            jobs_with_scores.append((document, score))
     
     # Sort by relevance score (descending) - most relevant first
     jobs_with_scores.sort(key=lambda x: x[1], reverse=True)
@@ -347,36 +648,20 @@ def intelligent_job_search(
     # Take top N jobs (most relevant appear first)
     top_jobs = jobs_with_scores[:limit]
     
-    # Format results
-    results = []
-    for job, score in top_jobs:
-        requirements = [req.requirement for req in job.requirements]
-        disability_support = [d.name for d in job.disabilities_supported]
-        
-        results.append({
-            "id": job.id,
-            "title": job.title,
-            "description": job.description,
-            "company_name": job.company.name if job.company else None,
-            "company_id": job.company_id,
-            "location_city": job.location.city if job.location else None,
-            "location_country": job.location.country if job.location else None,
-            "location": f"{job.location.city}, {job.location.country}" if job.location else None,
-            "employment_type": job.employment_type,
-            "remote_type": job.remote_type,
-            "required_skills": requirements,
-            "disability_support": disability_support,
-            "posted_at": job.posted_at.isoformat() if job.posted_at else None,
-            "relevance_score": round(score, 2),  # Include relevance score
-        })
-    
-    return results
-
-
-def filter_jobs_for_chat(jobs: List[Dict], user_message: str, user_profile: Optional[Dict] = None) -> List[Dict]:
+    return [_format_search_result(document, score) for document, score in top_jobs]
+
+
+def filter_jobs_for_chat(
+    jobs: List[Dict],
+    user_message: str,
+    user_profile: Optional[Dict] = None,
+    similarities: Optional[Dict[int, float]] = None,
+) -> List[Dict]:
     """
     Intelligently filter jobs for chatbot context
     Prioritize jobs matching user's disabilities and exclude already applied jobs
+    similarities ({job_id: embedding similarity}) comes from vector retrieval; those
+    jobs are already relevant, so they are reranked rather than filtered out
     """
     if not jobs:
         return []
@@ -416,6 +701,8 @@ def filter_jobs_for_chat(jobs: List[Dict], user_message: str, user_profile: Opti
             continue
         
         relevance = 0
+        if similarities is not None:
+            relevance += SEMANTIC_WEIGHT * max(similarities.get(job.get("id"), 0.0), 0.0)
         
         # HIGHEST PRIORITY: Disability match
         if user_profile:
@@ -429,26 +716,26 @@ def filter_jobs_for_chat(jobs: List[Dict], user_message: str, user_profile: Opti
                     relevance += 10 * matches  # Very high weight for disability match
         
         # Check title match
-        title_lower = job.get("title", "").lower()
+        title_lower = job.get("title_lower") or job.get("title", "").lower()
         if any(kw in title_lower for kw in keywords):
             relevance += 2
         if any(jk in title_lower for jk in job_keywords if jk in message_lower):
             relevance += 1
         
         # Check description match
-        desc_lower = job.get("description", "").lower()
+        desc_lower = job.get("description_lower") or job.get("description", "").lower()
         if any(kw in desc_lower for kw in keywords):
             relevance += 1
         
         # Check user profile match (skills)
         if user_profile:
             user_skills = [s.lower() for s in user_profile.get("skills", [])]
-            job_skills = [s.lower() for s in job.get("required_skills", [])]
+            job_skills = [s.lower() for s in job.get("required_skills") or job.get("requirements", [])]
             if any(us in " ".join(job_skills).lower() for us in user_skills):
                 relevance += 2
         
-        # Only include jobs with some relevance
-        if relevance > 0:
+        # Only include jobs with some relevance (retrieved jobs always qualify)
+        if relevance > 0 or similarities is not None:
             relevant_jobs.append((job, relevance))
     
     # Sort by relevance (disability matches first) and take top 5
@@ -4,11 +4,8 @@ Security utilities for input validation, sanitization, and rate limiting
 import re
 from typing import Optional
 from fastapi import HTTPException
-from datetime import datetime, timedelta
-from collections import defaultdict
 
-# Rate limiting storage (in production, use Redis)
-rate_limit_store = defaultdict(list)
+from backend.src.utils.rate_limit import rate_limiter
 
 # Allowed characters for different input types
 ALLOWED_EMAIL_PATTERN = re.compile(r'^[a-zA-Z0-9._%+-]+@[a-zA-Z0-9.-]+\.[a-zA-Z]{2,}$')
@@ -71,25 +68,10 @@ def validate_search_query(query: str) -> bool:
 
 def check_rate_limit(identifier: str, max_requests: int = 10, window_seconds: int = 60) -> bool:
     """
-    Simple rate limiting (in production, use Redis)
+    Rate limiting with fixed-size state per identifier (see utils/rate_limit.py)
     Returns True if request is allowed, False if rate limited
     """
-    now = datetime.now()
-    window_start = now - timedelta(seconds=window_seconds)
-    
-    # Clean old entries
-    rate_limit_store[identifier] = [
-        req_time for req_time in rate_limit_store[identifier]
-        if req_time > window_start
-    ]
-    
-    # Check limit
-    if len(rate_limit_store[identifier]) >= max_requests:
-        return False
-    
-    # Add current request
-    rate_limit_store[identifier].append(now)
-    return True
+    return rate_limiter.allow(identifier, max_requests, window_seconds)
 
 
 def validate_integer_id(id_value: Optional[int], min_value: int = 1, max_value: int = 2147483647) -> bool:
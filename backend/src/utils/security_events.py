@@ -0,0 +1,157 @@
+"""
+Batched security event writer
+Threat detections are queued in memory and written to security_logs by a background
+thread, SECURITY_LOG_BATCH_SIZE rows per INSERT or whatever is queued after
+SECURITY_LOG_FLUSH_MS, so an attack burst never turns requests into blocking DB writes.
+
+Under overload: once the queue is more than SECURITY_LOG_SAMPLE_ABOVE full, only one
+event in SECURITY_LOG_SAMPLE_EVERY is kept (its details say so); when it is full, new
+events are dropped. Queue depth, written, sampled-out and dropped events are in /metrics.
+"""
+import time
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from sqlalchemy import insert
+
+from backend.src.config import settings
+from backend.src.db import models
+from backend.src.db.database import SessionLocal
+from backend.src.utils.metrics import metrics
+
+security_log_queue_depth = metrics.gauge("security_log_queue_depth", "Security events waiting to be written")
+security_log_written = metrics.counter("security_log_events_written_total", "Security events written to security_logs")
+security_log_sampled_out = metrics.counter(
+    "security_log_events_sampled_out_total", "Security events skipped by load sampling"
+)
+security_log_dropped = metrics.counter(
+    "security_log_events_dropped_total", "Security events lost to a full queue or a failed write"
+)
+security_log_flush_seconds = metrics.histogram("security_log_flush_seconds", "Time to write one batch of security events")
+
+
+class SecurityEventWriter:
+    """Bounded queue of SecurityLog rows, flushed in batches by a daemon thread"""
+
+    def __init__(self, batch_size: int, flush_interval: float, max_queue: int,
+                 sample_above: float, sample_every: int, session_factory=SessionLocal):
+        self.batch_size = max(batch_size, 1)
+        self.flush_interval = flush_interval
+        self.max_queue = max_queue
+        self.sample_threshold = int(max_queue * sample_above)
+        self.sample_every = max(sample_every, 1)
+        self.session_factory = session_factory
+        self._queue: deque = deque()
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+        self._closed = False
+        self._sample_count = 0
+
+    def __len__(self):
+        return len(self._queue)
+
+    def log(
+        self,
+        ip_address: str,
+        action: str,
+        severity: str = 'info',
+        threat_type: Optional[str] = None,
+        details: Optional[str] = None,
+        user_id: Optional[int] = None,
+        detected_by: str = 'system',
+        blocked: bool = False,
+    ) -> bool:
+        """Queue a security event (same fields as log_security_event); False if it was not kept"""
+        with self._condition:
+            depth = len(self._queue)
+            if depth >= self.max_queue:
+                security_log_dropped.inc()
+                return False
+            if depth >= self.sample_threshold and self.sample_every > 1:
+                self._sample_count += 1
+                if self._sample_count % self.sample_every:
+                    security_log_sampled_out.inc()
+                    return False
+                details = f"{details or ''} (1 in {self.sample_every} events kept under load)".strip()
+            self._queue.append({
+                'user_id': user_id,
+                'ip_address': ip_address,
+                'action': action,
+                'severity': severity,
+                'threat_type': threat_type,
+                'details': details,
+                'detected_by': detected_by,
+                'blocked': blocked,
+                'created_at': datetime.utcnow(),
+            })
+            security_log_queue_depth.set(depth + 1)
+            if self._thread is None and not self._closed:
+                self._thread = threading.Thread(target=self._run, name="security-log-writer", daemon=True)
+                self._thread.start()
+            elif depth == 0 or depth + 1 >= self.batch_size:
+                # Starts the flush timer, or ends the wait early for a full batch
+                self._condition.notify()
+        return True
+
+    def _take_batch(self) -> List[Dict]:
+        batch = [self._queue.popleft() for _ in range(min(len(self._queue), self.batch_size))]
+        security_log_queue_depth.set(len(self._queue))
+        return batch
+
+    def _run(self):
+        while True:
+            with self._condition:
+                self._condition.wait_for(lambda: self._queue or self._closed)
+                if self._closed:
+                    return
+                # Collect a full batch or wait out the flush interval
+                self._condition.wait_for(
+                    lambda: len(self._queue) >= self.batch_size or self._closed, timeout=self.flush_interval
+                )
+                batch = self._take_batch()
+            if batch:
+                self._write(batch)
+
+    def _write(self, batch: List[Dict]):
+        started = time.perf_counter()
+        db = self.session_factory()
+        try:
+            db.execute(insert(models.SecurityLog), batch)
+            db.commit()
+            security_log_written.inc(len(batch))
+        except Exception as e:
+            db.rollback()
+            security_log_dropped.inc(len(batch))
+            print(f"Warning: Could not write {len(batch)} security events: {e}")
+        finally:
+            db.close()
+            security_log_flush_seconds.observe(time.perf_counter() - started)
+
+    def flush(self):
+        """Write everything queued now, on the calling thread"""
+        while True:
+            with self._condition:
+                batch = self._take_batch()
+            if not batch:
+                return
+            self._write(batch)
+
+    def close(self, timeout: float = 5.0):
+        """Stop the writer thread and write what is still queued (call on shutdown)"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+        self.flush()
+
+
+security_events = SecurityEventWriter(
+    settings.SECURITY_LOG_BATCH_SIZE,
+    settings.SECURITY_LOG_FLUSH_MS / 1000,
+    settings.SECURITY_LOG_QUEUE_MAX,
+    settings.SECURITY_LOG_SAMPLE_ABOVE,
+    settings.SECURITY_LOG_SAMPLE_EVERY,
+)
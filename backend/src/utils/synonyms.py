@@ -0,0 +1,147 @@
+"""
+Precompiled skill synonym expansion
+Compiles SKILL_SYNONYMS (plus an optional ops-managed JSON file) into a reverse map
+and a single regex matcher, and hot-reloads the file when it changes
+"""
+import os
+import re
+import json
+import time
+import threading
+from typing import Dict, List, Optional, Tuple, Set
+
+from backend.src.config import settings
+from backend.src.utils.search_index import tokenize
+
+
+# Skill synonyms and related terms for intelligent matching
+SKILL_SYNONYMS = {
+    "python": ["python", "py", "django", "flask", "pandas", "numpy"],
+    "javascript": ["javascript", "js", "node", "react", "vue", "angular", "typescript"],
+    "java": ["java", "spring", "hibernate", "jsp"],
+    "developer": ["developer", "programmer", "coder", "engineer", "software engineer", "dev"],
+    "designer": ["designer", "ui", "ux", "graphic designer", "web designer"],
+    "writer": ["writer", "content writer", "copywriter", "blogger", "author"],
+    "manager": ["manager", "supervisor", "lead", "director"],
+    "analyst": ["analyst", "data analyst", "business analyst", "financial analyst"],
+    "assistant": ["assistant", "admin", "administrative", "secretary"],
+    "customer": ["customer service", "support", "help desk", "client service"],
+    "remote": ["remote", "work from home", "wfh", "telecommute", "distributed"],
+    "full-time": ["full-time", "fulltime", "ft", "permanent"],
+    "part-time": ["part-time", "parttime", "pt", "casual"],
+}
+
+
+class CompiledSynonyms:
+    """
+    Immutable compiled form of a synonym table.
+
+    expansions maps every known term (keys and values) to the sorted tuple of terms
+    it expands to; matcher finds every known term in a text in one regex pass.
+    """
+
+    def __init__(self, groups: Dict[str, List[str]]):
+        reverse: Dict[str, Set[str]] = {}
+        for key, values in groups.items():
+            key = key.lower()
+            members = {v.lower() for v in values}
+            # A term expands to itself plus every group it belongs to or is the key of
+            for term in members | {key}:
+                reverse.setdefault(term, {term}).update(members)
+        self.groups = groups
+        self.expansions: Dict[str, Tuple[str, ...]] = {
+            term: tuple(sorted(expansion)) for term, expansion in reverse.items()
+        }
+        # Multi-word synonyms split into index tokens, for inverted-index lookups
+        self.token_expansions: Dict[str, Tuple[str, ...]] = {
+            term: tuple(sorted({token for t in expansion for token in tokenize(t)}))
+            for term, expansion in self.expansions.items()
+        }
+        # Longest terms first so "software engineer" wins over "engineer"
+        alternation = "|".join(re.escape(t) for t in sorted(self.expansions, key=len, reverse=True))
+        self.matcher = re.compile(rf"(?<![\w-])(?:{alternation})(?![\w-])") if alternation else None
+
+    def expand(self, word: str) -> Tuple[str, ...]:
+        word = word.lower()
+        return self.expansions.get(word, (word,))
+
+    def expand_tokens(self, word: str) -> Tuple[str, ...]:
+        word = word.lower()
+        return self.token_expansions.get(word, tuple(tokenize(word)))
+
+    def find_terms(self, text: str) -> Set[str]:
+        """Every synonym-table term that occurs in text (as whole words)"""
+        if not text or self.matcher is None:
+            return set()
+        return set(self.matcher.findall(text.lower()))
+
+
+class SynonymTable:
+    """
+    Process-wide synonym table.
+
+    Built-in SKILL_SYNONYMS are merged with the JSON file at SYNONYMS_FILE
+    ({"term": ["synonym", ...]}; file entries replace built-in keys). The file's
+    mtime is checked at most every SYNONYMS_RELOAD_SECONDS and the table is
+    recompiled when it changes, so lookups stay dict-speed.
+    """
+
+    def __init__(self, path: Optional[str] = None, check_interval: float = 5.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._lock = threading.Lock()
+        self._mtime: Optional[float] = None
+        self._last_check = 0.0
+        self.compiled = CompiledSynonyms(self._load_groups())
+
+    def _load_groups(self) -> Dict[str, List[str]]:
+        groups = dict(SKILL_SYNONYMS)
+        if not self.path or not os.path.exists(self.path):
+            self._mtime = None
+            return groups
+        try:
+            self._mtime = os.path.getmtime(self.path)
+            with open(self.path, encoding="utf-8") as f:
+                data = json.load(f)
+            for key, values in data.items():
+                if isinstance(values, list):
+                    groups[str(key).lower()] = [str(v) for v in values]
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not load synonyms file {self.path}: {e}")
+        return groups
+
+    def reload(self):
+        """Recompile from SKILL_SYNONYMS and the synonyms file"""
+        with self._lock:
+            self.compiled = CompiledSynonyms(self._load_groups())
+
+    def _maybe_reload(self):
+        if not self.path:
+            return
+        now = time.monotonic()
+        if now - self._last_check < self.check_interval:
+            return
+        self._last_check = now
+        try:
+            mtime = os.path.getmtime(self.path)
+        except OSError:
+            mtime = None
+        if mtime != self._mtime:
+            self.reload()
+
+    def expand(self, word: str) -> Tuple[str, ...]:
+        """The word plus all of its synonyms (O(1) lookup)"""
+        self._maybe_reload()
+        return self.compiled.expand(word)
+
+    def expand_tokens(self, word: str) -> Tuple[str, ...]:
+        """Index tokens of the word's synonyms ("help desk" -> "help", "desk")"""
+        self._maybe_reload()
+        return self.compiled.expand_tokens(word)
+
+    def find_terms(self, text: str) -> Set[str]:
+        self._maybe_reload()
+        return self.compiled.find_terms(text)
+
+
+synonym_table = SynonymTable(settings.SYNONYMS_FILE, settings.SYNONYMS_RELOAD_SECONDS)